@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from api.utils.settings import settings
 from api.utils.email_utils import email_utils
 import logging
@@ -17,6 +18,28 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    beat_schedule={
+        "rebuild-project-forecasts": {
+            "task": "api.utils.celery_app.rebuild_project_forecasts_task",
+            "schedule": crontab(hour=1, minute=0),
+        },
+        "rebuild-project-neighbors": {
+            "task": "api.utils.celery_app.rebuild_project_neighbors_task",
+            "schedule": crontab(hour=2, minute=0),
+        },
+        "rebuild-project-index": {
+            "task": "api.utils.celery_app.rebuild_project_index_task",
+            "schedule": crontab(hour=2, minute=30),
+        },
+        "precompute-insight-snapshots": {
+            "task": "api.utils.celery_app.precompute_insight_snapshots_task",
+            "schedule": crontab(hour=3, minute=0),
+        },
+        "reconcile-donor-counters": {
+            "task": "api.utils.celery_app.reconcile_donor_counters_task",
+            "schedule": crontab(hour=4, minute=0),
+        },
+    },
 )
 
 @celery_app.task(bind=True, max_retries=3)
@@ -89,4 +112,103 @@ def send_password_reset_email_task(self, email: str, otp_code: str, user_name: s
         return {"status": "success", "email": email}
     except Exception as exc:
         logger.error(f"Failed to send password reset email to {email}: {str(exc)}")
-        raise self.retry(countdown=30, exc=exc)
\ No newline at end of file
+        raise self.retry(countdown=30, exc=exc)
+
+
+@celery_app.task
+def rebuild_project_forecasts_task():
+    """Nightly refit of every project's completion forecast"""
+    from api.db.database import get_db
+    from api.v1.services.forecast import rebuild_project_forecasts
+
+    db = next(get_db())
+    try:
+        projects = rebuild_project_forecasts(db)
+        return {"status": "success", "projects": projects}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def rebuild_project_neighbors_task():
+    """Nightly rebuild of the co-donation neighbour table"""
+    from api.db.database import get_db
+    from api.v1.services.co_donation import rebuild_project_neighbors
+
+    db = next(get_db())
+    try:
+        rows = rebuild_project_neighbors(db)
+        return {"status": "success", "rows": rows}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def rebuild_project_index_task(only_missing: bool = False):
+    """Nightly rebuild of the recommendation index; on startup or first use only if none is saved"""
+    from api.db.database import get_db
+    from api.v1.services.recommender import project_index_saved, rebuild_project_index
+
+    db = next(get_db())
+    try:
+        if only_missing and project_index_saved(db):
+            return {"status": "skipped"}
+        index = rebuild_project_index(db)
+        return {"status": "success", "projects": len(index)}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def update_project_index_task(project_ids: list):
+    """Add created or (un)verified projects to the saved recommendation index"""
+    from api.db.database import get_db
+    from api.v1.services.recommender import update_projects_in_index
+
+    db = next(get_db())
+    try:
+        return {"status": "success", "projects": update_projects_in_index(db, project_ids)}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def rebuild_donor_totals_task(only_if_incomplete: bool = False):
+    """Backfill or repair of donor_totals, which insight snapshots and percentiles rely on"""
+    from api.db.database import get_db
+    from api.v1.services.donor_totals import donor_totals_complete, rebuild_donor_totals
+
+    db = next(get_db())
+    try:
+        if only_if_incomplete and donor_totals_complete(db):
+            return {"status": "skipped"}
+        donors = rebuild_donor_totals(db)
+        return {"status": "success", "donors": donors}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def precompute_insight_snapshots_task():
+    """Nightly rebuild of every donor's insight snapshot"""
+    from api.db.database import get_db
+    from api.v1.services.insight_batch import precompute_insight_snapshots
+
+    db = next(get_db())
+    try:
+        return precompute_insight_snapshots(db)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def reconcile_donor_counters_task():
+    """Nightly rebuild of the HyperLogLog distinct donor counters"""
+    from api.db.database import get_db
+    from api.v1.services.donor_counters import reconcile_donor_counters
+
+    db = next(get_db())
+    try:
+        return reconcile_donor_counters(db)
+    finally:
+        db.close()
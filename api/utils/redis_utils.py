@@ -1,10 +1,20 @@
 import redis
+import redis.asyncio as aioredis
 import json
 from api.utils.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# delete the key only if it still holds our token, so a lock that expired
+# and was taken by another caller is not released by the previous holder
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 class RedisClient:
     def __init__(self):
         try:
@@ -84,4 +94,139 @@ class RedisClient:
         
         return stored_otp == otp_code
 
-redis_client = RedisClient()
\ No newline at end of file
+    async def get_json(self, key: str):
+        """Retrieve a JSON value from Redis"""
+        if not self.redis_client:
+            return None
+
+        try:
+            value = self.redis_client.get(key)
+            return json.loads(value) if value else None
+        except Exception as e:
+            logger.error(f"Failed to get {key}: {str(e)}")
+            return None
+
+    async def get_many_json(self, keys: list) -> list:
+        """Retrieve several JSON values in one round trip; missing keys map to None"""
+        if not self.redis_client or not keys:
+            return [None] * len(keys)
+
+        try:
+            values = self.redis_client.mget(keys)
+            return [json.loads(value) if value else None for value in values]
+        except Exception as e:
+            logger.error(f"Failed to get {len(keys)} keys: {str(e)}")
+            return [None] * len(keys)
+
+    async def set_json(self, key: str, value, expires_in: int) -> bool:
+        """Store a JSON-serialisable value in Redis with expiration"""
+        if not self.redis_client:
+            return False
+
+        try:
+            self.redis_client.setex(key, expires_in, json.dumps(value, default=str))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to set {key}: {str(e)}")
+            return False
+
+    async def acquire_lock(self, key: str, token: str, expires_in: int) -> bool:
+        """Take a short-lived lock; granted when Redis is unavailable, as there is nothing to coordinate"""
+        if not self.redis_client:
+            return True
+
+        try:
+            return bool(self.redis_client.set(key, token, nx=True, ex=expires_in))
+        except Exception as e:
+            logger.error(f"Failed to acquire lock {key}: {str(e)}")
+            return True
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock only if it is still held with `token`"""
+        if not self.redis_client:
+            return False
+
+        try:
+            return bool(self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, key, token))
+        except Exception as e:
+            logger.error(f"Failed to release lock {key}: {str(e)}")
+            return False
+
+    async def add_to_hyperloglogs(self, entries: list, value: str) -> bool:
+        """Add a value to several HyperLogLogs in one round trip; entries are (key, expires_in or None)"""
+        if not self.redis_client:
+            return False
+
+        try:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for key, expires_in in entries:
+                pipeline.pfadd(key, value)
+                if expires_in:
+                    pipeline.expire(key, expires_in)
+            pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add to {len(entries)} HyperLogLogs: {str(e)}")
+            return False
+
+    async def count_hyperloglog(self, *keys: str):
+        """Approximate distinct count of one HyperLogLog, or of the union of several; None on failure"""
+        if not self.redis_client:
+            return None
+
+        try:
+            return self.redis_client.pfcount(*keys)
+        except Exception as e:
+            logger.error(f"Failed to count {keys}: {str(e)}")
+            return None
+
+    async def replace_hyperloglog(self, key: str, values: list, expires_in: int = None, batch_size: int = 10000) -> bool:
+        """Rebuild a HyperLogLog from `values` under a scratch key and swap it in atomically"""
+        if not self.redis_client:
+            return False
+
+        scratch = f"{key}:rebuild"
+        try:
+            self.redis_client.delete(scratch)
+            for start in range(0, len(values), batch_size):
+                self.redis_client.pfadd(scratch, *values[start:start + batch_size])
+            if not values:
+                self.redis_client.delete(key)
+                return True
+            pipeline = self.redis_client.pipeline()
+            pipeline.rename(scratch, key)
+            if expires_in:
+                pipeline.expire(key, expires_in)
+            pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to rebuild {key}: {str(e)}")
+            return False
+
+    async def publish(self, channel: str, message) -> bool:
+        """Publish a JSON-serialisable message to a pub/sub channel"""
+        if not self.redis_client:
+            return False
+
+        try:
+            self.redis_client.publish(channel, json.dumps(message, default=str))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to publish to {channel}: {str(e)}")
+            return False
+
+redis_client = RedisClient()
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Create an asyncio Redis client, used for long-lived pub/sub subscriptions"""
+    if settings.REDIS_URL:
+        return aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    return aioredis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD,
+        decode_responses=True,
+        socket_connect_timeout=5
+    )
\ No newline at end of file
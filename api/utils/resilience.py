@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the upstream's circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream dependency is unhealthy.
+
+    closed:    calls go through; `failure_threshold` consecutive failures open the circuit.
+    open:      calls are rejected with CircuitOpenError until `reset_timeout` has passed.
+    half_open: up to `half_open_max_calls` probe calls go through; a success closes
+               the circuit, a failure opens it again.
+
+    Exceptions listed in `ignored_exceptions` are treated as successful calls,
+    which keeps business errors (e.g. insufficient balance) from tripping it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        ignored_exceptions: Tuple[Type[BaseException], ...] = (),
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.ignored_exceptions = ignored_exceptions
+        self._clock = clock
+
+        self._state = "closed"
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.metrics = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "rejections": 0,
+            "opened": 0
+        }
+
+    @property
+    def state(self) -> str:
+        if self._state == "open" and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = "half_open"
+            self._half_open_calls = 0
+        return self._state
+
+    def before_call(self):
+        """
+        Reserve a call slot, raising CircuitOpenError if the call must be rejected.
+        """
+        state = self.state
+        if state == "open" or (state == "half_open" and self._half_open_calls >= self.half_open_max_calls):
+            self.metrics["rejections"] += 1
+            retry_after = max(self.reset_timeout - (self._clock() - self._opened_at), 0.0)
+            raise CircuitOpenError(self.name, retry_after)
+        if state == "half_open":
+            self._half_open_calls += 1
+        self.metrics["calls"] += 1
+
+    def record_success(self):
+        self.metrics["successes"] += 1
+        self._consecutive_failures = 0
+        if self._state != "closed":
+            logger.info(f"Circuit {self.name} closed")
+        self._state = "closed"
+
+    def record_failure(self):
+        self.metrics["failures"] += 1
+        self._consecutive_failures += 1
+        if self._state == "half_open" or self._consecutive_failures >= self.failure_threshold:
+            if self._state != "open":
+                logger.warning(f"Circuit {self.name} opened after {self._consecutive_failures} consecutive failures")
+                self.metrics["opened"] += 1
+            self._state = "open"
+            self._opened_at = self._clock()
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await func(*args, **kwargs) through the breaker.
+        """
+        self.before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except self.ignored_exceptions:
+            self.record_success()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            **self.metrics
+        }
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent call latencies, in seconds.
+    """
+
+    def __init__(self, window: int = 500):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(int(len(ordered) * percentile / 100), len(ordered) - 1)
+        return ordered[index]
+
+
+async def hedged_call(request: Callable[[], Awaitable[Any]], hedge_after: Optional[float]) -> Any:
+    """
+    Run request(), starting a second identical request if the first has not
+    finished after `hedge_after` seconds, and return whichever succeeds first.
+
+    Only use this for idempotent reads. With `hedge_after` set to None this is
+    a plain await.
+    """
+    if hedge_after is None:
+        return await request()
+
+    tasks = [asyncio.ensure_future(request())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            tasks.append(asyncio.ensure_future(request()))
+
+        error = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
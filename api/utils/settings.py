@@ -42,6 +42,49 @@ class Settings(BaseSettings):
     HEDERA_OPERATOR_ID: str
     HEDERA_OPERATOR_KEY: str
     PRIVATE_KEY_ENCRYPTION_KEY: str
+    # overrides the public testnet/mainnet mirror node
+    HEDERA_MIRROR_NODE_URL: Optional[str] = None
+
+    # "hedera" or "fake" (in-memory ledger and mirror node for local load testing)
+    LEDGER_BACKEND: str = "hedera"
+    FAKE_LEDGER_SEED: int = 0
+    FAKE_LEDGER_SUBMIT_LATENCY_MS: float = 5.0
+    FAKE_LEDGER_CONSENSUS_LATENCY_MS: float = 100.0
+    FAKE_LEDGER_MIRROR_DELAY_MS: float = 0.0
+    FAKE_LEDGER_FAILURE_RATE: float = 0.0
+    FAKE_LEDGER_INITIAL_BALANCE: Optional[float] = 10000.0
+
+    HEDERA_CONFIRM_BATCH_SIZE: int = 50
+    HEDERA_CONFIRM_INTERVAL: float = 0.5
+    HEDERA_CONFIRM_TIMEOUT: float = 60.0
+
+    HEDERA_BREAKER_FAILURE_THRESHOLD: int = 5
+    HEDERA_BREAKER_RESET_TIMEOUT: float = 30.0
+    HEDERA_BREAKER_HALF_OPEN_CALLS: int = 1
+    # set to 0 to disable hedged mirror node reads
+    HEDERA_MIRROR_HEDGE_PERCENTILE: float = 95.0
+    HEDERA_MIRROR_HEDGE_MIN_SAMPLES: int = 20
+
+    TRACE_BATCH_MAX_SIZE: int = 500
+    TRACE_BATCH_CONCURRENCY: int = 10
+    TRACE_CACHE_TTL: int = 86400
+
+    EVENTS_KEEPALIVE_SECONDS: int = 15
+    EVENTS_SUBSCRIBER_QUEUE_SIZE: int = 100
+
+    # "inline" or "process" (CPU-bound insight computations in a worker pool)
+    ANALYTICS_EXECUTION_MODE: str = "inline"
+    ANALYTICS_POOL_SIZE: int = 2
+    ANALYTICS_POOL_TIMEOUT: float = 10.0
+    # nightly insight snapshot batch: worker processes (0 = inline) and rows per chunk
+    INSIGHT_BATCH_WORKERS: int = 4
+    INSIGHT_BATCH_CHUNK_ROWS: int = 200000
+
+    PLATFORM_STATS_CACHE_TTL: int = 30
+    # rank buckets over donor_totals, cached per process
+    DONOR_RANK_CACHE_TTL: int = 60
+    # per-project analytics totals; 0 disables the cache
+    PROJECT_ANALYTICS_CACHE_TTL: int = 3600
 
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
@@ -0,0 +1,47 @@
+import re
+from typing import NamedTuple
+
+
+# Accepted spellings of a Hedera transaction ID:
+#   SDK form:          0.0.1234@1700000000.123456789
+#   Mirror node form:  0.0.1234-1700000000-123456789
+#   Legacy stored form 0.0.1234-1700000000.123456789 (SDK form with '@' replaced)
+# The SDK prints nanos without zero padding, so the fractional part is always
+# read as an integer number of nanoseconds, never as a decimal fraction.
+_TRANSACTION_ID_PATTERN = re.compile(
+    r"^(?P<payer>\d+\.\d+\.\d+)[@-](?P<seconds>\d+)[.-](?P<nanos>\d{1,9})$"
+)
+
+
+class ParsedTransactionId(NamedTuple):
+    payer_account: str
+    valid_start_seconds: int
+    valid_start_nanos: int
+
+    @property
+    def mirror_id(self) -> str:
+        """Transaction ID in the format expected by the mirror node REST API."""
+        return f"{self.payer_account}-{self.valid_start_seconds}-{self.valid_start_nanos:09d}"
+
+    @property
+    def sdk_id(self) -> str:
+        """Transaction ID in the format accepted by TransactionId.from_string."""
+        return f"{self.payer_account}@{self.valid_start_seconds}.{self.valid_start_nanos}"
+
+
+def parse_transaction_id(value: str) -> ParsedTransactionId:
+    """
+    Parse any accepted transaction ID spelling into its canonical parts.
+
+    Raises:
+        ValueError: If the value is not a recognisable transaction ID.
+    """
+    match = _TRANSACTION_ID_PATTERN.match(value.strip()) if value else None
+    if not match:
+        raise ValueError(f"Invalid transaction ID: {value}")
+
+    return ParsedTransactionId(
+        payer_account=match.group("payer"),
+        valid_start_seconds=int(match.group("seconds")),
+        valid_start_nanos=int(match.group("nanos"))
+    )
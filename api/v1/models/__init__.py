@@ -2,4 +2,10 @@ from api.v1.models.user import User
 from api.v1.models.project import Project
 from api.v1.models.donation import Donation
 from api.v1.models.organization import Organization
+from api.v1.models.donor_total import DonorTotal
+from api.v1.models.user_insight_snapshot import UserInsightSnapshot
+from api.v1.models.project_neighbor import ProjectNeighbor
+from api.v1.models.donation_rollup import DonationDailyRollup
+from api.v1.models.anomaly import Anomaly
+from api.v1.models.recommender_index import RecommenderIndex
 from api.v1.models.base_class import BaseModel
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Float, String, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+
+from api.v1.models.base_class import BaseModel
+
+
+class Anomaly(BaseModel):
+    __tablename__ = "anomalies"
+
+    # one of api.v1.services.anomaly.ANOMALY_KINDS
+    kind = Column(String(50), nullable=False, index=True)
+    donation_id = Column(UUID(as_uuid=True), ForeignKey("donations.id", ondelete="CASCADE"), nullable=False)
+    donor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    # the statistic that crossed its threshold, e.g. a z-score or a count
+    score = Column(Float, nullable=False)
+    details = Column(JSONB, nullable=False, default=dict)
+
+    # relationships
+    donation = relationship("Donation")
+
+    __table_args__ = (
+        UniqueConstraint("donation_id", "kind", name="uq_anomalies_donation_kind"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, String, ForeignKey, Enum
+from sqlalchemy import Column, Float, String, ForeignKey, Enum, BigInteger, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -20,8 +20,24 @@ class Donation(BaseModel):
 
     amount = Column(Float, nullable=False)
     tx_hash = Column(String(255), unique=True, nullable=True)
+    # canonical parts of tx_hash, see api.utils.transaction_id
+    tx_payer_account = Column(String(64), nullable=True)
+    tx_valid_start_seconds = Column(BigInteger, nullable=True)
+    tx_valid_start_nanos = Column(Integer, nullable=True)
     status = Column(Enum(DonationStatus), default=DonationStatus.pending, nullable=False)
 
     # relationships
     donor = relationship("User", back_populates="donations")
     project = relationship("Project", back_populates="donations")
+
+    __table_args__ = (
+        Index(
+            "ix_donations_transaction_id",
+            "tx_valid_start_seconds",
+            "tx_valid_start_nanos",
+            "tx_payer_account",
+            unique=True
+        ),
+        Index("ix_donations_donor_created_at", "donor_id", "created_at"),
+        Index("ix_donations_project_created_at", "project_id", "created_at"),
+    )
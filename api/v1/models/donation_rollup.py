@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Date, Float, Integer, String, UniqueConstraint
+
+from api.v1.models.base_class import BaseModel
+
+
+class DonationDailyRollup(BaseModel):
+    __tablename__ = "donation_daily_rollups"
+
+    # scope is "platform", "project" or "category"; scope_key is the project
+    # id, category name or, for platform, the shard (see rollups.platform_shard)
+    scope = Column(String(20), nullable=False)
+    scope_key = Column(String(255), nullable=False, default="")
+    day = Column(Date, nullable=False)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    donation_count = Column(Integer, nullable=False, default=0)
+    # distinct donors on this day within the scope
+    donor_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("scope", "scope_key", "day", name="uq_donation_daily_rollups_scope_day"),
+    )
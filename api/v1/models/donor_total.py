@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Float, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from api.v1.models.base_class import BaseModel
+
+
+class DonorTotal(BaseModel):
+    __tablename__ = "donor_totals"
+
+    # one row per donor with at least one completed donation
+    donor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    total_amount = Column(Float, nullable=False, default=0.0, index=True)
+    donation_count = Column(Integer, nullable=False, default=0)
+
+    # relationships
+    donor = relationship("User")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, Float, ForeignKey, Integer, LargeBinary
+from sqlalchemy import Column, String, Text, Boolean, Float, ForeignKey, Integer, LargeBinary, Index, Date, DateTime, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -19,9 +19,20 @@ class Project(BaseModel):
     wallet_address = Column(String(255), nullable=False)
     image = Column(LargeBinary, nullable=True) 
     image_mime_type = Column(String(50), nullable=True)
+    # log of the time-decayed donation score, see api.v1.services.trending
+    trending_log_score = Column(Float, nullable=True)
+    # fitted by api.v1.services.forecast from the daily rollups
+    forecast_completion_date = Column(Date, nullable=True)
+    forecast_probability = Column(Float, nullable=True)
+    forecast_updated_at = Column(DateTime(timezone=True), nullable=True)
 
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # relationships
     creator = relationship("User", back_populates="projects")
-    donations = relationship("Donation", back_populates="project", cascade="all, delete-orphan")
\ No newline at end of file
+    donations = relationship("Donation", back_populates="project", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_projects_trending", "trending_log_score", postgresql_where=text("verified")),
+        Index("ix_projects_closing_soon", "forecast_completion_date", postgresql_where=text("verified")),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Float, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from api.v1.models.base_class import BaseModel
+
+
+class ProjectNeighbor(BaseModel):
+    __tablename__ = "project_neighbors"
+
+    # top-k projects most often co-donated with project_id, rebuilt nightly
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    neighbor_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+    co_donors = Column(Integer, nullable=False)
+    rank = Column(Integer, nullable=False)
+
+    # relationships
+    neighbor = relationship("Project", foreign_keys=[neighbor_id])
+
+    __table_args__ = (
+        Index("ix_project_neighbors_project_rank", "project_id", "rank"),
+    )
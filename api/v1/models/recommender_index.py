@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from api.v1.models.base_class import BaseModel
+
+
+class RecommenderIndex(BaseModel):
+    __tablename__ = "recommender_indexes"
+
+    # one row per index, shared by every worker; see api.v1.services.recommender
+    name = Column(String(50), nullable=False, unique=True)
+    # bumped on every save, so workers know when to reload
+    version = Column(Integer, nullable=False, default=0)
+    data = Column(LargeBinary, nullable=False)
+    built_at = Column(DateTime(timezone=True), nullable=False)
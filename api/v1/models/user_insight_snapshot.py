@@ -0,0 +1,24 @@
+from sqlalchemy import Column, BigInteger, DateTime, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+
+from api.v1.models.base_class import BaseModel
+
+
+class UserInsightSnapshot(BaseModel):
+    __tablename__ = "user_insight_snapshots"
+
+    donor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    # running InsightAggregates and the insight sections last computed from them
+    aggregates = Column(JSONB, nullable=False)
+    insights = Column(JSONB, nullable=False)
+    donation_count = Column(Integer, nullable=False, default=0)
+    # UTC epoch nanoseconds after which the sections must be recomputed
+    valid_until = Column(BigInteger, nullable=False)
+    # (created_at, id) of the newest donation in the aggregates; only donations
+    # past it are folded in, so none is counted twice
+    last_donation_at = Column(DateTime(timezone=True), nullable=True)
+    last_donation_id = Column(UUID(as_uuid=True), nullable=True)
+
+    # relationships
+    donor = relationship("User")
@@ -5,6 +5,7 @@ from api.v1.routes.project import router as project_router
 from api.v1.routes.donation import router as donation_router
 from api.v1.routes.trace import router as trace_router
 from api.v1.routes.analytics import analytics
+from api.v1.routes.events import router as events_router
 
 
 api_version_one = APIRouter(prefix="/api/v1")
@@ -14,3 +15,4 @@ api_version_one.include_router(donation_router)
 api_version_one.include_router(trace_router)
 api_version_one.include_router(p2p)
 api_version_one.include_router(analytics)
+api_version_one.include_router(events_router)
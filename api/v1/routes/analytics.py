@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, distinct
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import UUID
 
@@ -12,17 +12,34 @@ from api.v1.models.user import User
 from api.v1.models.donation import Donation, DonationStatus
 from api.v1.models.project import Project
 from api.v1.schemas.analytics import (
+    UserInsights,
     UserInsightsResponse,
     GlobalStats,
     PlatformAnalytics,
     ProjectAnalytics,
-    CategoryAnalytics
+    CategoryAnalytics,
+    TimeseriesResponse
 )
+from api.v1.services.donor_counters import count_distinct_donors
+from api.v1.services.platform_stats import get_platform_stats
+from api.v1.services.project_analytics import build_project_analytics
+from api.v1.services.rollups import fill_distinct_donors, get_timeseries
 
 analytics = APIRouter(prefix="/analytics", tags=["analytics"])
 
-@analytics.get("/user/insights", response_model=UserInsightsResponse)
+def _global_stats(stats: dict) -> GlobalStats:
+    return GlobalStats(
+        total_donations=stats["total_donations"],
+        total_amount_raised=round(stats["total_amount"], 2),
+        total_projects=stats["total_projects"],
+        total_donors=stats["total_donors"],
+        average_donation=stats["average_donation"],
+        total_donors_error=stats.get("total_donors_error")
+    )
+
+@analytics.get("/user/insights", response_model=UserInsightsResponse, response_model_exclude_unset=True)
 async def get_user_insights(
+    fields: Optional[str] = Query(None, description="Comma separated insight sections to return, e.g. donation_summary,recommended_projects"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -38,17 +55,23 @@ async def get_user_insights(
     - Personalized project recommendations
     - User percentile ranking among all donors
     - Complete donation summary
+    
+    Pass `fields` to compute and return only some of these sections.
     """
+    requested = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
     try:
         analytics = DonationAnalytics(db)
-        insights_data = await analytics.get_user_insights(current_user.id)
+        insights_data = await analytics.get_user_insights(current_user.id, requested)
         
         return UserInsightsResponse(
             user_id=str(current_user.id),
             user_email=current_user.email,
-            insights=insights_data
+            # message is always part of the full response, as before
+            insights=UserInsights(**{"message": None, **insights_data}) if requested is None else insights_data
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
@@ -65,24 +88,7 @@ async def get_global_analytics(db: Session = Depends(get_db)):
     - Average donation amount
     """
     try:
-        total_donations = db.query(Donation).filter(Donation.status == DonationStatus.completed).count()
-        total_amount = db.query(func.sum(Donation.amount)).filter(Donation.status == DonationStatus.completed).scalar() or 0
-        
-        total_projects = db.query(Project).filter(Project.verified == True).count()
-        
-        total_donors = db.query(func.count(distinct(Donation.donor_id))).filter(
-            Donation.status == DonationStatus.completed
-        ).scalar() or 0
-        
-        average_donation = round(total_amount / total_donations, 2) if total_donations > 0 else 0
-        
-        return GlobalStats(
-            total_donations=total_donations,
-            total_amount_raised=round(total_amount, 2),
-            total_projects=total_projects,
-            total_donors=total_donors,
-            average_donation=average_donation
-        )
+        return _global_stats(await get_platform_stats(db))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating global stats: {str(e)}")
@@ -98,13 +104,8 @@ async def get_platform_analytics(db: Session = Depends(get_db)):
     - Recent platform activity
     """
     try:        
-        total_donations = db.query(Donation).filter(Donation.status == DonationStatus.completed).count()
-        total_amount = db.query(func.sum(Donation.amount)).filter(Donation.status == DonationStatus.completed).scalar() or 0
-        total_projects = db.query(Project).filter(Project.verified == True).count()
-        
-        total_donors = db.query(func.count(distinct(Donation.donor_id))).filter(
-            Donation.status == DonationStatus.completed
-        ).scalar() or 0
+        stats = await get_platform_stats(db)
+        total_amount = stats["total_amount"]
         
         category_stats = db.query(
             Project.category,
@@ -130,29 +131,16 @@ async def get_platform_analytics(db: Session = Depends(get_db)):
             ))
         
         top_categories.sort(key=lambda x: x.total_raised, reverse=True)
-        
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        recent_donations = db.query(Donation).filter(
-            Donation.status == DonationStatus.completed,
-            Donation.created_at >= seven_days_ago
-        ).count()
-        
-        recent_projects = db.query(Project).filter(
-            Project.created_at >= seven_days_ago
-        ).count()
+        top_categories = top_categories[:10]  # Top 10 categories
+        for category in top_categories:
+            category.donor_count, category.donor_count_error = await count_distinct_donors(db, "category", category.category)
         
         return PlatformAnalytics(
-            global_stats=GlobalStats(
-                total_donations=total_donations,
-                total_amount_raised=round(total_amount, 2),
-                total_projects=total_projects,
-                total_donors=total_donors,
-                average_donation=round(total_amount / total_donations, 2) if total_donations > 0 else 0
-            ),
-            top_categories=top_categories[:10],  # Top 10 categories
+            global_stats=_global_stats(stats),
+            top_categories=top_categories,
             recent_activity={
-                "recent_donations": recent_donations,
-                "recent_projects": recent_projects,
+                "recent_donations": stats["recent_donations"],
+                "recent_projects": stats["recent_projects"],
                 "time_period": "last_7_days"
             }
         )
@@ -174,40 +162,15 @@ async def get_project_analytics(
     - Recent donation activity
     """
     try:        
-        project = db.query(Project).filter(Project.id == project_id).first()
+        # only the columns used, not the stored image
+        project = db.query(Project.id, Project.title, Project.target_amount).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        donations = db.query(Donation).filter(
-            Donation.project_id == project_id,
-            Donation.status == DonationStatus.completed
-        ).all()
-        
-        total_raised = sum(donation.amount for donation in donations)
-        donation_count = len(donations)
-        donor_count = len(set(donation.donor_id for donation in donations))
-        average_donation = total_raised / donation_count if donation_count > 0 else 0
-        completion_percentage = (total_raised / project.target_amount * 100) if project.target_amount > 0 else 0
-        
-        recent_donations = []
-        for donation in donations[-10:]:  # Last 10 donations
-            recent_donations.append({
-                "amount": donation.amount,
-                "date": donation.created_at.isoformat(),
-                "donor_id": str(donation.donor_id)
-            })
-        
-        return ProjectAnalytics(
-            project_id=str(project_id),
-            project_title=project.title,
-            total_raised=round(total_raised, 2),
-            donation_count=donation_count,
-            average_donation=round(average_donation, 2),
-            completion_percentage=round(completion_percentage, 2),
-            donor_count=donor_count,
-            recent_donations=recent_donations
-        )
+        return ProjectAnalytics(**await build_project_analytics(db, project))
         
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating project analytics: {str(e)}")
 
@@ -239,12 +202,15 @@ async def get_top_categories(
         for category, total_raised, donation_count, project_count in category_stats:
             percentage = (total_raised / total_platform * 100) if total_platform > 0 else 0
             avg_donation = total_raised / donation_count if donation_count > 0 else 0
+            donor_count, donor_count_error = await count_distinct_donors(db, "category", category)
             
             categories.append({
                 "category": category,
                 "total_raised": round(total_raised, 2),
                 "donation_count": donation_count,
                 "project_count": project_count,
+                "donor_count": donor_count,
+                "donor_count_error": donor_count_error,
                 "average_donation": round(avg_donation, 2),
                 "percentage_of_total": round(percentage, 2),
                 "rank": len(categories) + 1
@@ -259,6 +225,44 @@ async def get_top_categories(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating category analytics: {str(e)}")
 
+@analytics.get("/timeseries", response_model=TimeseriesResponse)
+async def get_donation_timeseries(
+    bucket: str = Query("day", description="Bucket size: day, week or month"),
+    scope: str = Query("platform", description="platform, project or category"),
+    key: Optional[str] = Query(None, description="Project id or category name for the project and category scopes"),
+    start: Optional[date] = Query(None, description="First day (UTC), defaults to a year before end"),
+    end: Optional[date] = Query(None, description="Last day (UTC), defaults to today"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get donation totals over time from the daily rollups.
+
+    Returns one point per bucket between start and end, including empty buckets.
+    """
+    try:
+        if scope != "platform" and not key:
+            raise ValueError(f"key is required for the {scope} scope")
+        if scope == "project":
+            key = str(UUID(key))
+        end = end or datetime.now(timezone.utc).date()
+        start = start or end - timedelta(days=365)
+
+        points = get_timeseries(db, scope, key or "", bucket, start, end)
+        await fill_distinct_donors(points, scope, bucket, end)
+        return {
+            "scope": scope,
+            "key": key,
+            "bucket": bucket,
+            "start": start,
+            "end": end,
+            "points": points
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating timeseries: {str(e)}")
+
 @analytics.get("/user/compare")
 async def compare_user_with_average(
     db: Session = Depends(get_db),
@@ -269,13 +273,12 @@ async def compare_user_with_average(
     """
     try:        
         analytics = DonationAnalytics(db)
-        user_insights = await analytics.get_user_insights(current_user.id)
+        user_insights = await analytics.get_user_insights(current_user.id, fields=["donation_summary"])
         
-        total_donations = db.query(Donation).filter(Donation.status == DonationStatus.completed).count()
-        total_amount = db.query(func.sum(Donation.amount)).filter(Donation.status == DonationStatus.completed).scalar() or 0
-        total_donors = db.query(func.count(distinct(Donation.donor_id))).filter(
-            Donation.status == DonationStatus.completed
-        ).scalar() or 0
+        stats = await get_platform_stats(db)
+        total_donations = stats["total_donations"]
+        total_amount = stats["total_amount"]
+        total_donors = stats["total_donors"]
         
         platform_avg_donation = total_amount / total_donations if total_donations > 0 else 0
         platform_avg_total = total_amount / total_donors if total_donors > 0 else 0
@@ -167,7 +167,12 @@ async def get_user_profile(current_user: User = Depends(get_current_user)):
     """
     Get current user profile with wallet balance.
     """
-    balance = await get_wallet_balance(current_user.wallet_address)
+    try:
+        balance = await get_wallet_balance(current_user.wallet_address)
+    except Exception as e:
+        # profile stays available when the ledger is not; report an unknown balance
+        logger.warning(f"Balance unavailable for {current_user.wallet_address}: {str(e)}")
+        balance = None
     
     return {
         "id": current_user.id,
@@ -2,11 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from api.db.database import get_db
 from api.v1.services.hedera import donate_hbar, verify_transaction, update_raised_amount, donate_hbar_from_user, get_wallet_balance
-from api.v1.services.donation import create_donation, get_user_completed_donations
+from api.v1.services.donation import create_donation, get_user_completed_donations, find_donation_by_transaction_id, on_donation_completed
 from api.v1.schemas.donation import DonationCreate, DonationResponse, UserDonationResponse
 from api.v1.models.project import Project
 from api.v1.services.auth import get_current_user
-from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.donation import DonationStatus
 from typing import List
 import logging
 
@@ -30,7 +30,10 @@ async def make_donation(donation: DonationCreate, db: Session = Depends(get_db),
         raise HTTPException(status_code=400, detail="User wallet not configured")
     
     # Check user balance
-    user_balance = await get_wallet_balance(current_user.wallet_address)
+    try:
+        user_balance = await get_wallet_balance(current_user.wallet_address)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Unable to check wallet balance: {str(e)}")
     if user_balance < donation.amount:
         raise HTTPException(status_code=400, detail="Insufficient balance")
     
@@ -47,13 +50,14 @@ async def make_donation(donation: DonationCreate, db: Session = Depends(get_db),
         # Create donation record
         new_donation = await create_donation(db, donation, tx_hash, current_user.id, status="completed")
         await update_raised_amount(db, donation.project_id, donation.amount)
+        await on_donation_completed(db, new_donation, project)
         
         logger.info(f"Donation completed: {donation.amount} HBAR from user {current_user.id} to project {project.id}")
         return new_donation
         
     except Exception as e:
         if tx_hash:
-            existing_donation = db.query(Donation).filter(Donation.tx_hash == tx_hash).first()
+            existing_donation = find_donation_by_transaction_id(db, tx_hash)
             if not existing_donation:
                 new_donation = await create_donation(db, donation, tx_hash, current_user.id, status="failed")
         raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,74 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from uuid import UUID
+from api.db.database import get_db
+from api.utils.settings import settings
+from api.v1.models.project import Project
+from api.v1.services.events import donation_event_hub, project_channel, PLATFORM_CHANNEL
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _event_stream(request: Request, channel: str, snapshot: dict = None):
+    async with donation_event_hub.subscribe(channel) as queue:
+        if snapshot:
+            yield _format_sse("snapshot", snapshot)
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _format_sse("donation", event)
+
+
+@router.get("/donations")
+async def stream_platform_donations(request: Request):
+    """
+    Server-sent events feed of every completed donation on the platform.
+    """
+    return StreamingResponse(
+        _event_stream(request, PLATFORM_CHANNEL),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.get("/projects/{project_id}")
+async def stream_project_progress(project_id: UUID, request: Request, db: Session = Depends(get_db)):
+    """
+    Server-sent events feed of donations and funding progress for one project.
+
+    Sends a `snapshot` event with the current progress on connect, then a
+    `donation` event for each completed donation.
+    """
+    project = db.query(
+        Project.id,
+        Project.amount_raised,
+        Project.target_amount,
+        Project.backers_count
+    ).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    snapshot = {
+        "project_id": str(project.id),
+        "amount_raised": project.amount_raised,
+        "target_amount": project.target_amount,
+        "backers_count": project.backers_count,
+        "completion_percentage": round((project.amount_raised / project.target_amount) * 100, 2) if project.target_amount else 0
+    }
+    return StreamingResponse(
+        _event_stream(request, project_channel(project_id), snapshot),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response, Query
 from sqlalchemy.orm import Session
 from api.db.database import get_db
 from api.v1.services.hedera import create_project_wallet
-from api.v1.services.project import create_project, get_verified_projects, get_project_by_id, verify_project, get_project_transparency, upload_project_image, get_project_image
-from api.v1.schemas.project import ProjectCreate, ProjectResponse
+from api.v1.services.project import create_project, get_verified_projects, get_project_by_id, verify_project, get_project_transparency, upload_project_image, get_project_image, project_to_response
+from api.v1.schemas.project import ProjectCreate, ProjectResponse, TrendingProjectResponse
 from api.v1.services.auth import get_current_user
+from api.v1.services.forecast import get_closing_soon_projects
+from api.v1.services.trending import get_trending_projects
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -79,6 +81,40 @@ async def get_verified_projects_endpoint(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# registered before /{project_id}, which would otherwise match these paths
+@router.get("/trending", response_model=List[TrendingProjectResponse])
+async def get_trending_projects_endpoint(
+    limit: int = Query(10, ge=1, le=50),
+    category: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get verified projects with the most recent donation activity.
+
+    Projects are ranked by donation volume and new donors, decayed with a 72 hour half-life.
+    """
+    try:
+        return [
+            TrendingProjectResponse(**project_to_response(project).model_dump(), trending_score=round(score, 4))
+            for project, score in get_trending_projects(db, limit, category)
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/closing-soon", response_model=List[ProjectResponse])
+async def get_closing_soon_projects_endpoint(
+    within_days: int = Query(30, ge=1, le=365),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Get verified projects forecast to reach their target soonest.
+    """
+    try:
+        return [project_to_response(project) for project in get_closing_soon_projects(db, within_days, limit)]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project_endpoint(project_id: UUID, db: Session = Depends(get_db)):
     """
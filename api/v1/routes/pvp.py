@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from api.db.database import get_db
 from api.v1.services.hedera import donate_hbar_from_user, get_wallet_balance, transfer_hbar_p2p
 from api.v1.services.auth import get_current_user
+from api.utils.resilience import CircuitOpenError
 from api.v1.models.user import User
 from api.v1.schemas.pvp import P2PTransferRequest, P2PTransferResponse
 from uuid import UUID
@@ -32,7 +33,10 @@ async def transfer_hbar(
     if transfer.amount > 10000:  
         raise HTTPException(status_code=400, detail="Amount too large. Maximum transfer is 10,000 HBAR")
     
-    user_balance = await get_wallet_balance(current_user.wallet_address)
+    try:
+        user_balance = await get_wallet_balance(current_user.wallet_address)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Unable to check wallet balance: {str(e)}")
     if user_balance < transfer.amount:
         raise HTTPException(
             status_code=400, 
@@ -81,6 +85,8 @@ async def get_user_balance(
             "balance_tinybars": int(balance * 100_000_000)
         }
         
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Failed to get balance: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to get balance: {str(e)}")
 
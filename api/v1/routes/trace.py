@@ -1,7 +1,12 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from api.db.database import get_db
-from api.v1.services.hedera import trace_transaction
+from api.utils.settings import settings
+from api.v1.schemas.trace import TraceBatchRequest
+from api.v1.services.hedera import trace_transaction, trace_transactions_batch
 
 router = APIRouter(prefix="/trace", tags=["trace"])
 
@@ -13,4 +18,29 @@ async def trace_donation(tx_hash: str, db: Session = Depends(get_db)):
     try:
         return await trace_transaction(tx_hash, db)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/batch")
+async def trace_donations_batch(request: TraceBatchRequest, db: Session = Depends(get_db)):
+    """
+    Trace many donations at once.
+
+    Streams one JSON object per line (NDJSON) as each transaction is resolved,
+    so results arrive in completion order rather than request order. Linked
+    donations are read before streaming starts, while the session is open.
+    """
+    if not request.transaction_ids:
+        raise HTTPException(status_code=400, detail="transaction_ids must not be empty")
+    if len(request.transaction_ids) > settings.TRACE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many transaction IDs. Maximum batch size is {settings.TRACE_BATCH_MAX_SIZE}"
+        )
+
+    results = trace_transactions_batch(request.transaction_ids, db)
+
+    async def stream_results():
+        async for result in results:
+            yield json.dumps(jsonable_encoder(result)) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import date, datetime
 
 class CategoryDistribution(BaseModel):
     category: str
@@ -61,14 +61,16 @@ class DonationSummary(BaseModel):
     last_donation: Optional[str]
 
 class UserInsights(BaseModel):
-    category_distribution: Dict[str, float]
-    most_supported_category: MostSupportedCategory
-    donation_frequency_trend: FrequencyTrend
-    user_impact_score: ImpactScore
-    monthly_trends: List[MonthlyTrend]
-    recommended_projects: List[RecommendedProject]
-    user_percentile: UserPercentile
-    donation_summary: DonationSummary
+    # sections left out with the fields= query parameter stay unset and are
+    # excluded from the response
+    category_distribution: Optional[Dict[str, float]] = None
+    most_supported_category: Optional[MostSupportedCategory] = None
+    donation_frequency_trend: Optional[FrequencyTrend] = None
+    user_impact_score: Optional[ImpactScore] = None
+    monthly_trends: Optional[List[MonthlyTrend]] = None
+    recommended_projects: Optional[List[RecommendedProject]] = None
+    user_percentile: Optional[UserPercentile] = None
+    donation_summary: Optional[DonationSummary] = None
     message: Optional[str] = None
 
 class UserInsightsResponse(BaseModel):
@@ -82,6 +84,8 @@ class GlobalStats(BaseModel):
     total_projects: int
     total_donors: int
     average_donation: float
+    # relative standard error of an approximate total_donors; None when exact
+    total_donors_error: Optional[float] = None
 
 class CategoryAnalytics(BaseModel):
     category: str
@@ -90,6 +94,9 @@ class CategoryAnalytics(BaseModel):
     donation_count: int
     average_donation: float
     percentage_of_total: float
+    donor_count: Optional[int] = None
+    # relative standard error of an approximate donor_count; None when exact
+    donor_count_error: Optional[float] = None
 
 class PlatformAnalytics(BaseModel):
     global_stats: GlobalStats
@@ -104,4 +111,22 @@ class ProjectAnalytics(BaseModel):
     average_donation: float
     completion_percentage: float
     donor_count: int
-    recent_donations: List[Dict[str, Any]]
\ No newline at end of file
+    donor_count_error: Optional[float] = None
+    recent_donations: List[Dict[str, Any]]
+
+class TimeseriesPoint(BaseModel):
+    bucket_start: date
+    total_amount: float
+    donation_count: int
+    donor_days: int
+    distinct_donors: Optional[int] = None
+    # relative standard error of an approximate distinct_donors; None when exact
+    distinct_donors_error: Optional[float] = None
+
+class TimeseriesResponse(BaseModel):
+    scope: str
+    key: Optional[str] = None
+    bucket: str
+    start: date
+    end: date
+    points: List[TimeseriesPoint]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 class ProjectCreate(BaseModel):
@@ -27,10 +27,16 @@ class ProjectResponse(BaseModel):
     created_by: UUID
     created_at: datetime
     updated_at: datetime
+    # estimated date the target is reached, and the probability it is within 90 days
+    forecast_completion_date: Optional[date] = None
+    forecast_probability: Optional[float] = None
 
     class Config:
         from_attributes = True
 
+class TrendingProjectResponse(ProjectResponse):
+    trending_score: float
+
 # New schema for the database model (internal use)
 class ProjectDB(BaseModel):
     id: UUID
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class TraceBatchRequest(BaseModel):
+    transaction_ids: List[str]
@@ -0,0 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+import threading
+from api.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _warm_worker():
+    # import the numeric stack once per worker instead of on the first request
+    import numpy
+    import pandas
+    import api.v1.services.insights_engine
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.ANALYTICS_POOL_SIZE, initializer=_warm_worker)
+            # start every worker now so the first requests do not pay for it
+            for _ in range(settings.ANALYTICS_POOL_SIZE):
+                _pool.submit(int)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def run_analytics(func: Callable[..., Any], *args) -> Any:
+    """
+    Run a pure analytics computation according to ANALYTICS_EXECUTION_MODE.
+
+    "inline" calls it directly. "process" runs it in the worker pool so the
+    event loop stays responsive; `func` and its arguments must be picklable.
+
+    Raises:
+        TimeoutError: If the pool does not answer within ANALYTICS_POOL_TIMEOUT.
+    """
+    if settings.ANALYTICS_EXECUTION_MODE != "process":
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(get_pool(), func, *args), settings.ANALYTICS_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        # the worker keeps running; the caller just stops waiting for it
+        logger.warning(f"Analytics computation {func.__name__} timed out after {settings.ANALYTICS_POOL_TIMEOUT}s")
+        raise TimeoutError(f"{func.__name__} timed out")
+    except BrokenProcessPool:
+        logger.error("Analytics process pool broke; starting a new one")
+        shutdown_pool()
+        raise
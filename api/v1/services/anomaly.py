@@ -0,0 +1,281 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+import uuid
+import numpy as np
+import pandas as pd
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from api.utils.redis_utils import redis_client
+from api.v1.models.anomaly import Anomaly
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+ANOMALY_KINDS = ("rapid_small_donations", "large_transfer", "donor_fan_out")
+
+# Both the streaming detector and the backfill look only at a donor's last
+# DONOR_HISTORY and a project's last PROJECT_HISTORY donations, so the state
+# kept per donor and project has a fixed size and both modes flag the same
+# donations.
+DONOR_HISTORY = 16
+PROJECT_HISTORY = 32
+
+# rapid_small_donations: RAPID_COUNT donations of at most SMALL_AMOUNT HBAR
+# by one donor within RAPID_WINDOW seconds
+SMALL_AMOUNT = 1.0
+RAPID_COUNT = 5
+RAPID_WINDOW = 600
+# donor_fan_out: one donor giving to FAN_OUT_PROJECTS projects within FAN_OUT_WINDOW seconds
+FAN_OUT_PROJECTS = 8
+FAN_OUT_WINDOW = 3600
+# large_transfer: log1p(amount) Z_THRESHOLD standard deviations above the
+# donor's or the project's recent donations
+Z_THRESHOLD = 4.0
+MIN_STD = 0.5
+DONOR_MIN_HISTORY = 5
+PROJECT_MIN_HISTORY = 10
+
+STATE_TTL = 30 * 86400
+# rows per INSERT, well below the 65535 bind parameter limit
+INSERT_BATCH = 1000
+
+
+def _z_score(value: float, history: np.ndarray, min_history: int) -> Optional[float]:
+    if len(history) < min_history:
+        return None
+    mean = history.sum() / len(history)
+    std = np.sqrt(((history - mean) ** 2).sum() / len(history))
+    return float((value - mean) / max(std, MIN_STD))
+
+
+def score_donation(
+    donor_times: Sequence[float],
+    donor_amounts: Sequence[float],
+    donor_projects: Sequence[Any],
+    project_amounts: Sequence[float],
+    time: float,
+    amount: float,
+    project: Any
+) -> List[Tuple[str, float, Dict[str, Any]]]:
+    """
+    Flags raised by one donation given the donor's and the project's
+    previous donations (oldest first, at most DONOR_HISTORY and
+    PROJECT_HISTORY of them). `time` is in epoch seconds.
+    """
+    flags = []
+    times = np.asarray(donor_times, dtype=np.float64)
+    amounts = np.asarray(donor_amounts, dtype=np.float64)
+    age = time - times
+
+    if amount <= SMALL_AMOUNT:
+        small = 1 + int(((age <= RAPID_WINDOW) & (amounts <= SMALL_AMOUNT)).sum())
+        if small >= RAPID_COUNT:
+            flags.append(("rapid_small_donations", float(small), {"small_donations": small, "window_seconds": RAPID_WINDOW}))
+
+    projects = {project} | {donor_projects[i] for i in np.flatnonzero(age <= FAN_OUT_WINDOW)}
+    if len(projects) >= FAN_OUT_PROJECTS:
+        flags.append(("donor_fan_out", float(len(projects)), {"projects": len(projects), "window_seconds": FAN_OUT_WINDOW}))
+
+    value = np.log1p(amount)
+    donor_z = _z_score(value, np.log1p(amounts), DONOR_MIN_HISTORY)
+    project_z = _z_score(value, np.log1p(np.asarray(project_amounts, dtype=np.float64)), PROJECT_MIN_HISTORY)
+    z = max(z for z in (donor_z, project_z, -np.inf) if z is not None)
+    if z >= Z_THRESHOLD:
+        flags.append(("large_transfer", z, {"donor_z": donor_z, "project_z": project_z}))
+    return flags
+
+
+def _lagged(values: np.ndarray, groups: np.ndarray, lags: int, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rows start..end of a (rows x lags) matrix holding, for each row of
+    group-sorted arrays, the values 1..lags rows earlier in the same group,
+    and the mask of entries that exist.
+    """
+    rows = np.arange(start, end)[:, None]
+    earlier = rows - np.arange(lags, 0, -1)[None, :]
+    valid = earlier >= 0
+    earlier = np.where(valid, earlier, 0)
+    valid &= groups[earlier] == groups[rows]
+    return values[earlier], valid
+
+
+def _masked_z(values: np.ndarray, history: np.ndarray, valid: np.ndarray, min_history: int) -> np.ndarray:
+    count = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(valid, history, 0.0).sum(axis=1) / count
+        std = np.sqrt(np.where(valid, (history - mean[:, None]) ** 2, 0.0).sum(axis=1) / count)
+        z = (values - mean) / np.maximum(std, MIN_STD)
+    return np.where(count >= min_history, z, np.nan)
+
+
+def score_donations(
+    donor_codes: np.ndarray,
+    project_codes: np.ndarray,
+    times: np.ndarray,
+    amounts: np.ndarray,
+    chunk_rows: int = 100_000
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized score_donation for donations given in chronological order.
+
+    Returns per donation the small-donation count, distinct projects and
+    donor and project z-scores (NaN below the minimum history), from which
+    flagged_donations picks the flags.
+    """
+    n = len(times)
+    small_counts = np.zeros(n, dtype=np.int64)
+    fan_out = np.zeros(n, dtype=np.int64)
+    donor_z = np.full(n, np.nan)
+    project_z = np.full(n, np.nan)
+    logs = np.log1p(amounts)
+
+    by_donor = np.argsort(donor_codes, kind='stable')
+    donors, d_times, d_amounts, d_projects, d_logs = (
+        donor_codes[by_donor], times[by_donor], amounts[by_donor], project_codes[by_donor], logs[by_donor]
+    )
+    for start in range(0, n, chunk_rows):
+        end = min(start + chunk_rows, n)
+        rows = by_donor[start:end]
+        h_times, valid = _lagged(d_times, donors, DONOR_HISTORY, start, end)
+        age = d_times[start:end, None] - h_times
+
+        h_amounts, _ = _lagged(d_amounts, donors, DONOR_HISTORY, start, end)
+        recent_small = (valid & (age <= RAPID_WINDOW) & (h_amounts <= SMALL_AMOUNT)).sum(axis=1)
+        small_counts[rows] = np.where(d_amounts[start:end] <= SMALL_AMOUNT, recent_small + 1, 0)
+
+        h_projects, _ = _lagged(d_projects, donors, DONOR_HISTORY, start, end)
+        window = np.where(valid & (age <= FAN_OUT_WINDOW), h_projects, -1)
+        window = np.sort(np.hstack([window, d_projects[start:end, None]]), axis=1)
+        fan_out[rows] = (window[:, :1] >= 0).sum(axis=1) + ((window[:, 1:] != window[:, :-1]) & (window[:, 1:] >= 0)).sum(axis=1)
+
+        h_logs, _ = _lagged(d_logs, donors, DONOR_HISTORY, start, end)
+        donor_z[rows] = _masked_z(d_logs[start:end], h_logs, valid, DONOR_MIN_HISTORY)
+
+    by_project = np.argsort(project_codes, kind='stable')
+    projects, p_logs = project_codes[by_project], logs[by_project]
+    for start in range(0, n, chunk_rows):
+        end = min(start + chunk_rows, n)
+        h_logs, valid = _lagged(p_logs, projects, PROJECT_HISTORY, start, end)
+        project_z[by_project[start:end]] = _masked_z(p_logs[start:end], h_logs, valid, PROJECT_MIN_HISTORY)
+
+    return {"small_counts": small_counts, "fan_out": fan_out, "donor_z": donor_z, "project_z": project_z}
+
+
+def flagged_donations(scores: Dict[str, np.ndarray]) -> List[Tuple[int, str, float, Dict[str, Any]]]:
+    """(donation index, kind, score, details) for every flag in score_donations output."""
+    flags = []
+    for i in np.flatnonzero(scores["small_counts"] >= RAPID_COUNT):
+        small = int(scores["small_counts"][i])
+        flags.append((int(i), "rapid_small_donations", float(small), {"small_donations": small, "window_seconds": RAPID_WINDOW}))
+    for i in np.flatnonzero(scores["fan_out"] >= FAN_OUT_PROJECTS):
+        projects = int(scores["fan_out"][i])
+        flags.append((int(i), "donor_fan_out", float(projects), {"projects": projects, "window_seconds": FAN_OUT_WINDOW}))
+
+    z = np.fmax(scores["donor_z"], scores["project_z"])
+    for i in np.flatnonzero(z >= Z_THRESHOLD):
+        donor_z, project_z = scores["donor_z"][i], scores["project_z"][i]
+        flags.append((int(i), "large_transfer", float(z[i]), {
+            "donor_z": None if np.isnan(donor_z) else float(donor_z),
+            "project_z": None if np.isnan(project_z) else float(project_z)
+        }))
+    return flags
+
+
+def store_anomalies(db: Session, rows: List[Dict[str, Any]]):
+    """Insert anomaly rows, skipping (donation, kind) pairs already flagged; commits."""
+    now = datetime.now(timezone.utc)
+    for start in range(0, len(rows), INSERT_BATCH):
+        db.execute(insert(Anomaly).values([
+            {"id": uuid.uuid4(), "created_at": now, "updated_at": now, **row}
+            for row in rows[start:start + INSERT_BATCH]
+        ]).on_conflict_do_nothing(constraint="uq_anomalies_donation_kind"))
+    db.commit()
+
+
+def _donor_key(donor_id: Any) -> str:
+    return f"anomaly:donor:{donor_id}"
+
+
+def _project_key(project_id: Any) -> str:
+    return f"anomaly:project:{project_id}"
+
+
+async def detect_donation_anomalies(db: Session, donation: Donation, project: Project) -> List[Tuple[str, float, Dict[str, Any]]]:
+    """
+    Score a committed, completed donation against its donor's and project's
+    recent donations kept in Redis, update them and store any flags.
+
+    Concurrent donations by one donor can drop each other's history entry;
+    the backfill scores the full history if that matters.
+    """
+    donor_key, project_key = _donor_key(donation.donor_id), _project_key(project.id)
+    donor_state, project_state = await redis_client.get_many_json([donor_key, project_key])
+    donor_state = donor_state or {"times": [], "amounts": [], "projects": []}
+    project_state = project_state or {"amounts": []}
+
+    time = donation.created_at.timestamp()
+    flags = score_donation(
+        donor_state["times"], donor_state["amounts"], donor_state["projects"], project_state["amounts"],
+        time, donation.amount, str(project.id)
+    )
+
+    donor_state = {
+        "times": (donor_state["times"] + [time])[-DONOR_HISTORY:],
+        "amounts": (donor_state["amounts"] + [donation.amount])[-DONOR_HISTORY:],
+        "projects": (donor_state["projects"] + [str(project.id)])[-DONOR_HISTORY:]
+    }
+    project_state = {"amounts": (project_state["amounts"] + [donation.amount])[-PROJECT_HISTORY:]}
+    await redis_client.set_json(donor_key, donor_state, STATE_TTL)
+    await redis_client.set_json(project_key, project_state, STATE_TTL)
+
+    if flags:
+        store_anomalies(db, [
+            {
+                "kind": kind,
+                "donation_id": donation.id,
+                "donor_id": donation.donor_id,
+                "project_id": project.id,
+                "score": score,
+                "details": details
+            }
+            for kind, score, details in flags
+        ])
+        logger.warning(f"Donation {donation.id} flagged as {', '.join(kind for kind, _, _ in flags)}")
+    return flags
+
+
+def backfill_anomalies(db: Session) -> Dict[str, int]:
+    """
+    Score every completed donation in one vectorized pass and store the
+    flags. Safe to rerun; returns the number of flags per kind.
+    """
+    rows = db.query(Donation.id, Donation.donor_id, Donation.project_id, Donation.amount, Donation.created_at).filter(
+        Donation.status == DonationStatus.completed
+    ).order_by(Donation.created_at, Donation.id).all()
+    counts = {kind: 0 for kind in ANOMALY_KINDS}
+    if not rows:
+        return counts
+
+    donation_ids, donor_ids, project_ids, amounts, created_at = zip(*rows)
+    donor_codes, _ = pd.factorize(pd.Series(donor_ids, dtype=object))
+    project_codes, _ = pd.factorize(pd.Series(project_ids, dtype=object))
+    times = pd.to_datetime(pd.Series(created_at), utc=True).to_numpy(dtype='datetime64[ns]').view(np.int64) / 1e9
+
+    flags = flagged_donations(score_donations(donor_codes, project_codes, times, np.asarray(amounts, dtype=np.float64)))
+    store_anomalies(db, [
+        {
+            "kind": kind,
+            "donation_id": donation_ids[i],
+            "donor_id": donor_ids[i],
+            "project_id": project_ids[i],
+            "score": score,
+            "details": details
+        }
+        for i, kind, score, details in flags
+    ])
+    for _, kind, _, _ in flags:
+        counts[kind] += 1
+    logger.info(f"Backfilled anomalies over {len(rows)} donations: {counts}")
+    return counts
@@ -0,0 +1,133 @@
+from typing import Any, Dict, List, Sequence, Tuple
+from uuid import UUID
+import logging
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+from api.v1.models.project_neighbor import ProjectNeighbor
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORS_PER_PROJECT = 20
+# pairs backed by fewer shared donors are mostly noise
+MIN_CO_DONORS = 2
+# recommendations aggregate over at most this many of a donor's projects
+MAX_BACKED_PROJECTS = 200
+
+
+def co_donation_neighbors(
+    donors: np.ndarray,
+    projects: np.ndarray,
+    n_projects: int,
+    k: int = NEIGHBORS_PER_PROJECT,
+    min_co_donors: int = MIN_CO_DONORS,
+    block_size: int = 4096
+) -> Dict[str, np.ndarray]:
+    """
+    Top-k item-item neighbours from (donor, project) code pairs.
+
+    Projects are compared by the cosine similarity of their binary donor
+    columns, i.e. shared donors / sqrt(donors_a * donors_b). The co-donation
+    matrix is computed `block_size` projects at a time to bound memory.
+    Returns parallel arrays project, neighbor, score, co_donors and rank.
+    """
+    donors = np.asarray(donors, dtype=np.int64)
+    projects = np.asarray(projects, dtype=np.int64)
+    n_donors = int(donors.max()) + 1 if len(donors) else 0
+
+    backers = sp.csr_matrix((np.ones(len(donors), dtype=np.float32), (donors, projects)), shape=(n_donors, n_projects))
+    backers.sum_duplicates()
+    backers.data[:] = 1
+    backed_by = backers.T.tocsr()
+    donor_counts = np.diff(backed_by.indptr).astype(np.float64)
+
+    parts = []
+    for start in range(0, n_projects, block_size):
+        block = (backed_by[start:start + block_size] @ backers).tocoo()
+        rows = block.row + start
+        keep = (block.data >= min_co_donors) & (block.col != rows)
+        rows, cols, shared = rows[keep], block.col[keep], block.data[keep]
+        scores = shared / np.sqrt(donor_counts[rows] * donor_counts[cols])
+
+        # best first within each project, ties broken by neighbour code
+        order = np.lexsort((cols, -scores, rows))
+        rows, cols, shared, scores = rows[order], cols[order], shared[order], scores[order]
+        first = np.searchsorted(rows, rows, side='left')
+        rank = np.arange(len(rows)) - first
+        top = rank < k
+        parts.append((rows[top], cols[top], scores[top], shared[top].astype(np.int64), rank[top] + 1))
+
+    if not parts:
+        empty = np.array([], dtype=np.int64)
+        return {"project": empty, "neighbor": empty, "score": np.array([]), "co_donors": empty, "rank": empty}
+    return dict(zip(("project", "neighbor", "score", "co_donors", "rank"), (np.concatenate(p) for p in zip(*parts))))
+
+
+def rebuild_project_neighbors(db: Session, k: int = NEIGHBORS_PER_PROJECT, chunk_size: int = 10_000) -> int:
+    """
+    Replace the project_neighbors table from completed donations.
+
+    Runs in one transaction, so readers keep the previous neighbours until
+    it commits. Returns the number of rows written.
+    """
+    pairs = db.query(Donation.donor_id, Donation.project_id).filter(
+        Donation.status == DonationStatus.completed
+    ).distinct().yield_per(50_000)
+
+    donor_ids, project_ids = [], []
+    for donor_id, project_id in pairs:
+        donor_ids.append(donor_id)
+        project_ids.append(project_id)
+
+    donor_codes, _ = pd.factorize(pd.Series(donor_ids, dtype=object))
+    project_codes, projects = pd.factorize(pd.Series(project_ids, dtype=object))
+    neighbors = co_donation_neighbors(donor_codes, project_codes, len(projects), k)
+
+    db.query(ProjectNeighbor).delete(synchronize_session=False)
+    total = len(neighbors["project"])
+    for start in range(0, total, chunk_size):
+        end = start + chunk_size
+        db.execute(insert(ProjectNeighbor), [
+            {
+                "project_id": projects[project],
+                "neighbor_id": projects[neighbor],
+                "score": float(score),
+                "co_donors": int(co_donors),
+                "rank": int(rank)
+            }
+            for project, neighbor, score, co_donors, rank in zip(
+                neighbors["project"][start:end],
+                neighbors["neighbor"][start:end],
+                neighbors["score"][start:end],
+                neighbors["co_donors"][start:end],
+                neighbors["rank"][start:end]
+            )
+        ])
+    db.commit()
+    logger.info(f"Rebuilt {total} project neighbours for {len(projects)} projects")
+    return total
+
+
+def get_co_donation_recommendations(db: Session, backed_project_ids: Sequence[Any], limit: int = 5) -> List[Tuple[UUID, float]]:
+    """
+    Verified projects most co-donated with the ones a donor backed, scored
+    by the sum of their neighbour scores and excluding projects already backed.
+    """
+    backed = [UUID(str(project_id)) for project_id in backed_project_ids]
+    if not backed:
+        return []
+
+    score = func.sum(ProjectNeighbor.score)
+    rows = db.query(ProjectNeighbor.neighbor_id, score.label("score")).join(
+        Project, Project.id == ProjectNeighbor.neighbor_id
+    ).filter(
+        ProjectNeighbor.project_id.in_(backed[-MAX_BACKED_PROJECTS:]),
+        ~ProjectNeighbor.neighbor_id.in_(backed),
+        Project.verified == True
+    ).group_by(ProjectNeighbor.neighbor_id).order_by(score.desc(), ProjectNeighbor.neighbor_id).limit(limit).all()
+
+    return [(row.neighbor_id, row.score) for row in rows]
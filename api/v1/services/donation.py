@@ -1,9 +1,22 @@
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
 from api.v1.schemas.donation import DonationCreate, UserDonationResponse
+from api.utils.transaction_id import ParsedTransactionId, parse_transaction_id
+from api.v1.services.events import publish_donation_event
+from api.v1.services.donor_totals import record_completed_donation
+from api.v1.services.insight_snapshots import apply_donation_to_snapshot
+from api.v1.services.anomaly import detect_donation_anomalies
+from api.v1.services.donor_counters import record_donor
+from api.v1.services.rollups import record_donation_in_rollups
+from api.v1.services.trending import record_trending_donation
 from datetime import datetime, timezone
 from uuid import UUID
+import logging
+
+logger = logging.getLogger(__name__)
 
 async def create_donation(db: Session, donation: DonationCreate, tx_hash: Optional[str], user_id: UUID, status: str = "completed") -> Donation:
     new_donation = Donation(
@@ -15,11 +28,96 @@ async def create_donation(db: Session, donation: DonationCreate, tx_hash: Option
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc)
     )
+    if tx_hash:
+        parsed = parse_transaction_id(tx_hash)
+        new_donation.tx_hash = parsed.mirror_id
+        new_donation.tx_payer_account = parsed.payer_account
+        new_donation.tx_valid_start_seconds = parsed.valid_start_seconds
+        new_donation.tx_valid_start_nanos = parsed.valid_start_nanos
+    if new_donation.status == DonationStatus.completed:
+        # before the donation is added, so its own row does not count its donor as seen
+        category = db.query(Project.category).filter(Project.id == donation.project_id).scalar()
+        record_donation_in_rollups(db, user_id, donation.project_id, category, donation.amount, new_donation.created_at)
+        record_trending_donation(db, donation.project_id, user_id, donation.amount, new_donation.created_at)
     db.add(new_donation)
+    if new_donation.status == DonationStatus.completed:
+        record_completed_donation(db, user_id, donation.amount)
     db.commit()
     db.refresh(new_donation)
     return new_donation
 
+async def on_donation_completed(db: Session, donation: Donation, project: Project):
+    """
+    Run side effects for a committed, completed donation.
+
+    The transfer has already settled on-chain at this point, so a failing
+    side effect is logged and never fails the donation itself.
+    """
+    try:
+        await publish_donation_event(donation, project)
+    except Exception as e:
+        logger.error(f"Failed to publish donation event for {donation.id}: {str(e)}")
+
+    # logs its own failures; reconciliation restores a missed donor
+    await record_donor(donation.donor_id, project.id, project.category, donation.created_at)
+
+    try:
+        await apply_donation_to_snapshot(db, donation, project, datetime.now())
+    except Exception as e:
+        # the next read rebuilds the snapshot when its count falls behind
+        db.rollback()
+        logger.error(f"Failed to update insight snapshot for {donation.donor_id}: {str(e)}")
+
+    try:
+        await detect_donation_anomalies(db, donation, project)
+    except Exception as e:
+        # backfill_anomalies scores anything missed here
+        db.rollback()
+        logger.error(f"Failed to score donation {donation.id} for anomalies: {str(e)}")
+
+
+def find_donation_by_transaction_id(db: Session, tx_hash: str) -> Optional[Donation]:
+    """
+    Look up a donation by any accepted spelling of its transaction ID.
+
+    Raises:
+        ValueError: If tx_hash is not a valid transaction ID.
+    """
+    parsed = parse_transaction_id(tx_hash)
+    return db.query(Donation).filter(
+        Donation.tx_valid_start_seconds == parsed.valid_start_seconds,
+        Donation.tx_valid_start_nanos == parsed.valid_start_nanos,
+        Donation.tx_payer_account == parsed.payer_account
+    ).first()
+
+def find_donations_by_transaction_ids(db: Session, transaction_ids: Iterable[ParsedTransactionId]) -> Dict[ParsedTransactionId, Donation]:
+    """
+    Look up donations for many parsed transaction IDs in a single query.
+    """
+    keys = [
+        (parsed.valid_start_seconds, parsed.valid_start_nanos, parsed.payer_account)
+        for parsed in transaction_ids
+    ]
+    if not keys:
+        return {}
+
+    donations = db.query(Donation).filter(
+        tuple_(
+            Donation.tx_valid_start_seconds,
+            Donation.tx_valid_start_nanos,
+            Donation.tx_payer_account
+        ).in_(keys)
+    ).all()
+
+    return {
+        ParsedTransactionId(
+            donation.tx_payer_account,
+            donation.tx_valid_start_seconds,
+            donation.tx_valid_start_nanos
+        ): donation
+        for donation in donations
+    }
+
 async def get_user_completed_donations(db: Session, user_id: UUID) -> List[UserDonationResponse]:
     """
     Get all completed donations made by a user with project details
@@ -0,0 +1,166 @@
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import groupby
+from typing import Any, Iterable, Optional, Tuple
+import asyncio
+import logging
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session
+from api.utils.redis_utils import redis_client
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("platform", "project", "category", "day")
+# Redis HyperLogLogs have a standard error of 0.81%: about 68% of counts are
+# within 0.81% of the exact value and about 95% within 1.62%
+HLL_STANDARD_ERROR = 0.0081
+# counters are only trusted while reconciliation keeps running
+RECONCILED_KEY = "donors:reconciled_at"
+RECONCILED_TTL = 2 * 86400
+DAY_RETENTION_DAYS = 400
+
+
+def counter_key(scope: str, key: Any = None) -> str:
+    if scope == "platform":
+        return "donors:platform"
+    if scope == "day":
+        return f"donors:day:{key.isoformat()}"
+    return f"donors:{scope}:{key}"
+
+
+def _day_ttl(day: date) -> int:
+    expires = datetime.combine(day + timedelta(days=DAY_RETENTION_DAYS), time.min, tzinfo=timezone.utc)
+    return max(int((expires - datetime.now(timezone.utc)).total_seconds()), 1)
+
+
+async def record_donor(donor_id: Any, project_id: Any, category: str, created_at: datetime) -> bool:
+    """Add a completed donation's donor to the platform, project, category and UTC day counters."""
+    day = created_at.astimezone(timezone.utc).date()
+    return await redis_client.add_to_hyperloglogs([
+        (counter_key("platform"), None),
+        (counter_key("project", project_id), None),
+        (counter_key("category", category), None),
+        (counter_key("day", day), _day_ttl(day))
+    ], str(donor_id))
+
+
+async def approximate_distinct_donors(scope: str, key: Any = None) -> Optional[int]:
+    """
+    Distinct donors from the HyperLogLog counters in O(1), within
+    HLL_STANDARD_ERROR. None when Redis is unavailable or the counters
+    have not been reconciled recently, in which case they may be incomplete.
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"scope must be one of {', '.join(SCOPES)}")
+    if await redis_client.get_json(RECONCILED_KEY) is None:
+        return None
+    return await redis_client.count_hyperloglog(counter_key(scope, key))
+
+
+async def approximate_distinct_donors_between(first_day: date, last_day: date) -> Optional[int]:
+    """
+    Distinct donors on the platform between two UTC days (inclusive), from
+    the union of the day counters. None as for approximate_distinct_donors,
+    and when the range starts before the day counters are kept.
+    """
+    if first_day <= datetime.now(timezone.utc).date() - timedelta(days=DAY_RETENTION_DAYS):
+        return None
+    if await redis_client.get_json(RECONCILED_KEY) is None:
+        return None
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    return await redis_client.count_hyperloglog(*[counter_key("day", day) for day in days])
+
+
+def exact_distinct_donors(db: Session, scope: str, key: Any = None) -> int:
+    """count(distinct donor_id) of completed donations in a scope."""
+    query = db.query(func.count(distinct(Donation.donor_id))).select_from(Donation).filter(
+        Donation.status == DonationStatus.completed
+    )
+    if scope == "project":
+        query = query.filter(Donation.project_id == key)
+    elif scope == "category":
+        query = query.join(Project, Project.id == Donation.project_id).filter(Project.category == key)
+    elif scope == "day":
+        start = datetime.combine(key, time.min, tzinfo=timezone.utc)
+        query = query.filter(Donation.created_at >= start, Donation.created_at < start + timedelta(days=1))
+    return query.scalar() or 0
+
+
+async def count_distinct_donors(db: Session, scope: str, key: Any = None) -> Tuple[int, Optional[float]]:
+    """
+    Distinct donors in a scope and the relative standard error of the count:
+    HLL_STANDARD_ERROR from the counters, or None from the exact SQL fallback.
+    """
+    approximate = await approximate_distinct_donors(scope, key)
+    if approximate is not None:
+        return approximate, HLL_STANDARD_ERROR
+    return exact_distinct_donors(db, scope, key), None
+
+
+async def _replace_grouped(rows: Iterable[Tuple[Any, Any]], scope: str, ttl=None) -> int:
+    groups = 0
+    for key, members in groupby(rows, key=lambda row: row[0]):
+        await redis_client.replace_hyperloglog(
+            counter_key(scope, key), [str(donor_id) for _, donor_id in members], ttl(key) if ttl else None
+        )
+        groups += 1
+    return groups
+
+
+async def _reconcile(db: Session, started_at: datetime) -> dict:
+    completed = Donation.status == DonationStatus.completed
+    day = func.date(func.timezone("UTC", Donation.created_at))
+    first_day = started_at.date() - timedelta(days=DAY_RETENTION_DAYS)
+
+    platform = [str(donor_id) for donor_id, in db.query(distinct(Donation.donor_id)).filter(completed).yield_per(50_000)]
+    await redis_client.replace_hyperloglog(counter_key("platform"), platform)
+
+    projects = db.query(Donation.project_id, Donation.donor_id).filter(completed).distinct().order_by(
+        Donation.project_id
+    ).yield_per(50_000)
+    categories = db.query(Project.category, Donation.donor_id).join(
+        Project, Project.id == Donation.project_id
+    ).filter(completed).distinct().order_by(Project.category).yield_per(50_000)
+    days = db.query(day, Donation.donor_id).filter(
+        completed, Donation.created_at >= datetime.combine(first_day, time.min, tzinfo=timezone.utc)
+    ).distinct().order_by(day).yield_per(50_000)
+
+    return {
+        "donors": len(platform),
+        "projects": await _replace_grouped(projects, "project"),
+        "categories": await _replace_grouped(categories, "category"),
+        "days": await _replace_grouped(days, "day", _day_ttl)
+    }
+
+
+async def _replay_since(db: Session, since: datetime) -> int:
+    # adds are idempotent, so donations counted live during the rebuild are
+    # simply added again to the swapped-in counters
+    rows = db.query(Donation.donor_id, Donation.project_id, Project.category, Donation.created_at).join(
+        Project, Project.id == Donation.project_id
+    ).filter(Donation.status == DonationStatus.completed, Donation.created_at >= since).all()
+    for donor_id, project_id, category, created_at in rows:
+        await record_donor(donor_id, project_id, category, created_at)
+    return len(rows)
+
+
+def reconcile_donor_counters(db: Session) -> dict:
+    """
+    Rebuild every HyperLogLog counter from completed donations, then
+    replay donations made while it ran. Marks the counters as trusted
+    for RECONCILED_TTL seconds; returns how many counters were rebuilt.
+    """
+    async def reconcile():
+        started_at = datetime.now(timezone.utc)
+        counts = await _reconcile(db, started_at)
+        counts["replayed"] = await _replay_since(db, started_at - timedelta(minutes=1))
+        await redis_client.set_json(RECONCILED_KEY, started_at.isoformat(), RECONCILED_TTL)
+        return counts
+
+    counts = asyncio.run(reconcile())
+    logger.info(
+        f"Reconciled donor counters: {counts['donors']} donors, {counts['projects']} projects, "
+        f"{counts['categories']} categories, {counts['days']} days"
+    )
+    return counts
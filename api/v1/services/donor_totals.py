@@ -0,0 +1,148 @@
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from api.utils.settings import settings
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.donor_total import DonorTotal
+
+# donors per rank bucket; a rank lookup counts at most one bucket live
+RANK_BUCKET_SIZE = 1000
+
+# (expires_at, buckets) of this process, see get_rank_buckets
+_rank_buckets: Optional[tuple] = None
+
+
+def record_completed_donation(db: Session, donor_id: UUID, amount: float):
+    """
+    Add a completed donation to its donor's running total.
+
+    Issues an upsert in the caller's transaction without committing, so the
+    total is committed atomically with the donation row.
+    """
+    now = datetime.now(timezone.utc)
+    statement = insert(DonorTotal).values(
+        id=uuid.uuid4(),
+        donor_id=donor_id,
+        total_amount=amount,
+        donation_count=1,
+        created_at=now,
+        updated_at=now
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[DonorTotal.donor_id],
+        set_={
+            "total_amount": DonorTotal.total_amount + statement.excluded.total_amount,
+            "donation_count": DonorTotal.donation_count + 1,
+            "updated_at": now
+        }
+    ))
+
+
+def compute_rank_buckets(db: Session) -> Dict[str, Any]:
+    """
+    The number of donors, and the total of every RANK_BUCKET_SIZE-th donor
+    from the top with the number of donors at or above that total.
+    """
+    order = DonorTotal.total_amount.desc()
+    ranked = select(
+        DonorTotal.total_amount,
+        func.row_number().over(order_by=order).label("position"),
+        func.count().over(order_by=order).label("at_or_above"),
+        func.count().over().label("total_donors")
+    ).subquery()
+    rows = db.execute(
+        select(ranked.c.total_amount, ranked.c.at_or_above, ranked.c.total_donors).where(
+            (ranked.c.position - 1) % RANK_BUCKET_SIZE == 0
+        ).order_by(ranked.c.position)
+    ).all()
+
+    return {
+        "total_donors": rows[0].total_donors if rows else 0,
+        "boundaries": [(row.total_amount, row.at_or_above) for row in rows]
+    }
+
+
+def get_rank_buckets(db: Session) -> Dict[str, Any]:
+    """compute_rank_buckets, cached in this process for DONOR_RANK_CACHE_TTL seconds."""
+    global _rank_buckets
+    now = time.monotonic()
+    if _rank_buckets is None or _rank_buckets[0] <= now:
+        _rank_buckets = (now + settings.DONOR_RANK_CACHE_TTL, compute_rank_buckets(db))
+    return _rank_buckets[1]
+
+
+def get_donor_rank(db: Session, donor_id: UUID) -> Dict[str, Any]:
+    """
+    Rank a donor by total amount donated.
+
+    Donors with equal totals share a rank (1 + number of donors with a
+    strictly higher total). Donors above the nearest cached bucket boundary
+    over the donor's total come from get_rank_buckets, so only the donors
+    between that boundary and the donor are counted, on the index on
+    total_amount. Rank and total_donors may therefore lag by up to
+    DONOR_RANK_CACHE_TTL seconds. Returns rank None for donors without
+    completed donations.
+    """
+    buckets = get_rank_buckets(db)
+    mine = db.execute(select(DonorTotal.total_amount).where(DonorTotal.donor_id == donor_id)).scalar()
+    if mine is None:
+        return {"total_amount": None, "rank": None, "total_donors": buckets["total_donors"]}
+
+    boundary, above_boundary = None, 0
+    for total_amount, at_or_above in buckets["boundaries"]:
+        if total_amount <= mine:
+            break
+        boundary, above_boundary = total_amount, at_or_above
+
+    between = select(func.count()).select_from(DonorTotal).where(DonorTotal.total_amount > mine)
+    if boundary is not None:
+        between = between.where(DonorTotal.total_amount < boundary)
+    rank = above_boundary + db.execute(between).scalar() + 1
+
+    return {
+        "total_amount": mine,
+        "rank": rank,
+        # donors who joined since the buckets were cached
+        "total_donors": max(buckets["total_donors"], rank)
+    }
+
+
+def rebuild_donor_totals(db: Session) -> int:
+    """
+    Recompute every donor total from the donations table.
+
+    Used to backfill the table and to repair drift; returns the number of donors.
+    """
+    db.query(DonorTotal).delete(synchronize_session=False)
+    db.execute(
+        insert(DonorTotal).from_select(
+            ["id", "donor_id", "total_amount", "donation_count", "created_at", "updated_at"],
+            select(
+                func.gen_random_uuid(),
+                Donation.donor_id,
+                func.sum(Donation.amount),
+                func.count(Donation.id),
+                func.now(),
+                func.now()
+            ).where(
+                Donation.status == DonationStatus.completed
+            ).group_by(Donation.donor_id)
+        )
+    )
+    db.commit()
+    return db.query(DonorTotal).count()
+
+
+def donor_totals_complete(db: Session) -> bool:
+    """
+    Whether donor_totals counts every completed donation, i.e. it has been
+    backfilled and has not drifted.
+    """
+    counted = select(func.coalesce(func.sum(DonorTotal.donation_count), 0)).scalar_subquery()
+    completed = select(func.count(Donation.id)).where(Donation.status == DonationStatus.completed).scalar_subquery()
+    return db.execute(select(counted == completed)).scalar()
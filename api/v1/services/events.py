@@ -0,0 +1,95 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+from uuid import UUID
+
+from api.utils.redis_utils import redis_client, get_async_redis
+from api.utils.settings import settings
+from api.v1.models.donation import Donation
+from api.v1.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_CHANNEL = "donations:platform"
+
+
+def project_channel(project_id: UUID) -> str:
+    return f"donations:project:{project_id}"
+
+
+async def publish_donation_event(donation: Donation, project: Project):
+    """
+    Publish a completed donation to the platform feed and the project's channel.
+    """
+    event = {
+        "donation_id": str(donation.id),
+        "project_id": str(project.id),
+        "project_title": project.title,
+        "category": project.category,
+        "amount": donation.amount,
+        "amount_raised": project.amount_raised,
+        "target_amount": project.target_amount,
+        "completion_percentage": round((project.amount_raised / project.target_amount) * 100, 2) if project.target_amount else 0,
+        "created_at": donation.created_at.isoformat()
+    }
+    await redis_client.publish(PLATFORM_CHANNEL, event)
+    await redis_client.publish(project_channel(project.id), event)
+
+
+class DonationEventHub:
+    """
+    Fan donation events out from one Redis subscription to many local listeners.
+
+    Each worker process holds a single pattern subscription on `donations:*`
+    regardless of how many clients are streaming. Every listener gets its own
+    bounded queue; when a slow client falls behind, its oldest events are
+    dropped rather than blocking delivery to everyone else.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._listeners.setdefault(channel, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        try:
+            yield queue
+        finally:
+            listeners = self._listeners.get(channel)
+            if listeners is not None:
+                listeners.discard(queue)
+                if not listeners:
+                    del self._listeners[channel]
+
+    def _dispatch(self, channel: str, event: dict):
+        for queue in self._listeners.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _run(self):
+        while self._listeners:
+            client = get_async_redis()
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe("donations:*")
+                while self._listeners:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "pmessage":
+                        self._dispatch(message["channel"], json.loads(message["data"]))
+            except Exception as e:
+                logger.error(f"Donation event subscription failed: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+donation_event_hub = DonationEventHub(queue_size=settings.EVENTS_SUBSCRIBER_QUEUE_SIZE)
@@ -0,0 +1,229 @@
+import asyncio
+import base64
+import random
+import time
+from typing import Dict, List, Optional, Union
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from hiero_sdk_python import PrivateKey
+from hiero_sdk_python.crypto.public_key import PublicKey
+from api.utils.settings import settings
+from api.utils.transaction_id import parse_transaction_id
+from api.v1.services.ledger import LedgerBackend, LedgerReceipt, SUCCESS
+
+INSUFFICIENT_ACCOUNT_BALANCE = 28
+INVALID_ACCOUNT_ID = 15
+STATUS_NAMES = {
+    SUCCESS: "SUCCESS",
+    INSUFFICIENT_ACCOUNT_BALANCE: "INSUFFICIENT_ACCOUNT_BALANCE",
+    INVALID_ACCOUNT_ID: "INVALID_ACCOUNT_ID"
+}
+
+TINYBARS_PER_HBAR = 100_000_000
+
+
+class FakeLedger(LedgerBackend):
+    """
+    Deterministic in-memory ledger for local development and load testing.
+
+    Accounts, balances and transfers live in dictionaries; no signatures are
+    checked. Every call can be slowed down and made to fail:
+
+    - submit_latency: seconds a submit or balance query takes
+    - consensus_latency: seconds after submission before a receipt is available
+    - mirror_delay: extra seconds before the fake mirror node indexes a transaction
+    - failure_rate: probability that a submit or balance query raises
+      ConnectionError, drawn from a RNG seeded with `seed`
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        submit_latency: float = 0.0,
+        consensus_latency: float = 0.0,
+        mirror_delay: float = 0.0,
+        failure_rate: float = 0.0,
+        initial_balance_hbar: Optional[float] = None,
+        operator_id: str = "0.0.2",
+        operator_balance_hbar: float = 1_000_000_000
+    ):
+        self.submit_latency = submit_latency
+        self.consensus_latency = consensus_latency
+        self.mirror_delay = mirror_delay
+        self.failure_rate = failure_rate
+        self.initial_balance_hbar = initial_balance_hbar
+        self._random = random.Random(seed)
+        self._next_account = 1001
+        self._last_valid_start = 0
+        self.balances: Dict[str, int] = {operator_id: int(operator_balance_hbar * TINYBARS_PER_HBAR)}
+        self.operator_id = operator_id
+        # keyed by mirror node transaction ID
+        self.records: Dict[str, dict] = {}
+        self._mirror_app: Optional[FastAPI] = None
+
+    @property
+    def mirror_app(self) -> FastAPI:
+        """Fake mirror node REST API serving this ledger's state."""
+        if self._mirror_app is None:
+            self._mirror_app = create_fake_mirror_app(self)
+        return self._mirror_app
+
+    async def _simulate_call(self):
+        if self.submit_latency:
+            await asyncio.sleep(self.submit_latency)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise ConnectionError("Injected fake ledger failure")
+
+    def _next_transaction_id(self, payer: str) -> str:
+        # valid start must be unique per payer; keep it strictly increasing
+        valid_start = max(time.time_ns(), self._last_valid_start + 1)
+        self._last_valid_start = valid_start
+        seconds, nanos = divmod(valid_start, 1_000_000_000)
+        return f"{payer}@{seconds}.{nanos}"
+
+    def _record(self, transaction_id: str, status: int, transfers: List[dict], memo: Optional[str], account_id: Optional[str] = None):
+        now = time.time()
+        consensus_at = now + self.consensus_latency
+        seconds, nanos = divmod(int(consensus_at * 1_000_000_000), 1_000_000_000)
+        mirror_id = parse_transaction_id(transaction_id).mirror_id
+        self.records[mirror_id] = {
+            "transaction_id": transaction_id,
+            "status": status,
+            "account_id": account_id,
+            "consensus_at": consensus_at,
+            "indexed_at": consensus_at + self.mirror_delay,
+            "mirror": {
+                "transaction_id": mirror_id,
+                "consensus_timestamp": f"{seconds}.{nanos:09d}",
+                "result": STATUS_NAMES[status],
+                "name": "CRYPTOTRANSFER" if transfers else "CRYPTOCREATEACCOUNT",
+                "memo_base64": base64.b64encode((memo or "").encode()).decode(),
+                "transfers": transfers
+            }
+        }
+
+    async def create_account(self, public_key: PublicKey, initial_balance_hbar: float, memo: str) -> str:
+        await self._simulate_call()
+        account_id = f"0.0.{self._next_account}"
+        self._next_account += 1
+
+        balance_hbar = self.initial_balance_hbar if self.initial_balance_hbar is not None else initial_balance_hbar
+        self.balances[account_id] = int(balance_hbar * TINYBARS_PER_HBAR)
+
+        transaction_id = self._next_transaction_id(self.operator_id)
+        self._record(transaction_id, SUCCESS, [], memo, account_id=account_id)
+        return account_id
+
+    async def get_balance(self, account_id: str) -> float:
+        await self._simulate_call()
+        if account_id not in self.balances:
+            raise ValueError(f"Account {account_id} not found")
+        return self.balances[account_id] / TINYBARS_PER_HBAR
+
+    async def submit_transfer(
+        self,
+        sender_id: str,
+        recipient_id: str,
+        amount_tinybars: int,
+        sender_key: PrivateKey,
+        memo: Optional[str] = None
+    ) -> str:
+        await self._simulate_call()
+        transaction_id = self._next_transaction_id(sender_id)
+
+        if sender_id not in self.balances or recipient_id not in self.balances:
+            self._record(transaction_id, INVALID_ACCOUNT_ID, [], memo)
+        elif self.balances[sender_id] < amount_tinybars:
+            self._record(transaction_id, INSUFFICIENT_ACCOUNT_BALANCE, [], memo)
+        else:
+            self.balances[sender_id] -= amount_tinybars
+            self.balances[recipient_id] += amount_tinybars
+            self._record(transaction_id, SUCCESS, [
+                {"account": sender_id, "amount": -amount_tinybars, "is_approval": False},
+                {"account": recipient_id, "amount": amount_tinybars, "is_approval": False}
+            ], memo)
+        return transaction_id
+
+    async def get_receipts(self, transaction_ids: List[str]) -> Dict[str, Union[LedgerReceipt, Exception]]:
+        results = {}
+        for transaction_id in transaction_ids:
+            record = self.records.get(parse_transaction_id(transaction_id).mirror_id)
+            if record is None:
+                results[transaction_id] = ValueError(f"Receipt not found for {transaction_id}")
+                continue
+            if record["consensus_at"] > time.time():
+                continue
+            results[transaction_id] = LedgerReceipt(
+                transaction_id=transaction_id,
+                status=record["status"],
+                account_id=record["account_id"]
+            )
+        return results
+
+    def get_mirror_transaction(self, transaction_id: str) -> Optional[dict]:
+        """Mirror node view of a transaction, or None until it is indexed."""
+        record = self.records.get(parse_transaction_id(transaction_id).mirror_id)
+        if record is None or record["indexed_at"] > time.time():
+            return None
+        return record["mirror"]
+
+
+def _not_found() -> JSONResponse:
+    return JSONResponse(status_code=404, content={"_status": {"messages": [{"message": "Not found"}]}})
+
+
+def create_fake_mirror_app(ledger: FakeLedger) -> FastAPI:
+    """
+    Minimal stand-in for the mirror node REST API, backed by a FakeLedger.
+
+    Serves the subset of /api/v1/transactions/{id} and /api/v1/accounts/{id}
+    that the platform reads.
+    """
+    app = FastAPI(title="Fake Hedera mirror node")
+
+    @app.get("/api/v1/transactions/{transaction_id}")
+    async def get_transaction(transaction_id: str):
+        try:
+            transaction = ledger.get_mirror_transaction(transaction_id)
+        except ValueError:
+            return JSONResponse(status_code=400, content={"_status": {"messages": [{"message": "Invalid transaction id"}]}})
+        if transaction is None:
+            return _not_found()
+        return {"transactions": [transaction]}
+
+    @app.get("/api/v1/accounts/{account_id}")
+    async def get_account(account_id: str):
+        if account_id not in ledger.balances:
+            return _not_found()
+        return {
+            "account": account_id,
+            "balance": {
+                "balance": ledger.balances[account_id],
+                "timestamp": f"{time.time():.9f}",
+                "tokens": []
+            },
+            "deleted": False
+        }
+
+    return app
+
+
+_fake_ledger: Optional[FakeLedger] = None
+
+
+def get_fake_ledger() -> FakeLedger:
+    """
+    Process-wide FakeLedger configured from the FAKE_LEDGER_* settings.
+    """
+    global _fake_ledger
+    if _fake_ledger is None:
+        _fake_ledger = FakeLedger(
+            seed=settings.FAKE_LEDGER_SEED,
+            submit_latency=settings.FAKE_LEDGER_SUBMIT_LATENCY_MS / 1000,
+            consensus_latency=settings.FAKE_LEDGER_CONSENSUS_LATENCY_MS / 1000,
+            mirror_delay=settings.FAKE_LEDGER_MIRROR_DELAY_MS / 1000,
+            failure_rate=settings.FAKE_LEDGER_FAILURE_RATE,
+            initial_balance_hbar=settings.FAKE_LEDGER_INITIAL_BALANCE,
+            operator_id=settings.HEDERA_OPERATOR_ID
+        )
+    return _fake_ledger
@@ -0,0 +1,143 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+import logging
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from api.v1.models.donation_rollup import DonationDailyRollup
+from api.v1.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+# daily donation totals of the last FIT_WINDOW_DAYS days are the sample
+FIT_WINDOW_DAYS = 90
+# probabilities are of reaching the target within this many days
+HORIZON_DAYS = 90
+# completion dates further out than this are not stored
+MAX_FORECAST_DAYS = 5 * 365
+WRITE_BATCH = 10_000
+
+_update_forecasts = text("""
+    UPDATE projects
+    SET forecast_completion_date = forecast.completion_date,
+        forecast_probability = forecast.probability,
+        forecast_updated_at = :updated_at
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:dates AS date[]), CAST(:probabilities AS float8[]))
+        AS forecast(id, completion_date, probability)
+    WHERE projects.id = forecast.id
+""")
+
+
+def fit_forecasts(
+    totals: np.ndarray,
+    squares: np.ndarray,
+    active_days: np.ndarray,
+    remaining: np.ndarray,
+    horizon_days: int = HORIZON_DAYS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Days until each project reaches its target and the probability that
+    it does within `horizon_days`, for all projects at once.
+
+    `totals` and `squares` are the sums of each project's daily amounts and
+    of their squares, `active_days` the days it was observed (days without
+    donations count as zero) and `remaining` what it still needs. Daily amounts
+    are treated as independent with the sample mean and variance, so the
+    horizon total is approximately normal. Days are inf when the project
+    raised nothing, and 0 once it is funded.
+    """
+    active_days = np.maximum(active_days, 1).astype(np.float64)
+    mean = totals / active_days
+    # sample variance; a single observed day says nothing about spread, so
+    # assume a standard deviation equal to the mean
+    spread = np.maximum(squares / active_days - mean * mean, 0.0)
+    variance = np.where(active_days > 1, spread * active_days / np.maximum(active_days - 1, 1), mean * mean)
+
+    funded = remaining <= 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days = np.where(funded, 0.0, np.where(mean > 0, remaining / mean, np.inf))
+        expected = horizon_days * mean
+        deviation = np.sqrt(horizon_days * variance)
+        probability = np.where(
+            deviation > 0,
+            ndtr((expected - remaining) / deviation),
+            (expected >= remaining).astype(np.float64)
+        )
+    probability = np.where(funded, 1.0, probability)
+    return days, probability
+
+
+def rebuild_project_forecasts(db: Session, today: Optional[date] = None) -> int:
+    """
+    Fit and store the completion forecast of every project from the
+    project daily rollups. Returns the number of projects updated.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    window_start = today - timedelta(days=FIT_WINDOW_DAYS - 1)
+
+    projects = db.query(Project.id, Project.target_amount, Project.amount_raised, Project.created_at).all()
+    if not projects:
+        return 0
+    project_ids, targets, raised, created_at = zip(*projects)
+    keys = pd.Index([str(project_id) for project_id in project_ids])
+
+    # one row per project with donations in the window
+    sums = db.query(
+        DonationDailyRollup.scope_key,
+        func.sum(DonationDailyRollup.total_amount),
+        func.sum(DonationDailyRollup.total_amount * DonationDailyRollup.total_amount)
+    ).filter(
+        DonationDailyRollup.scope == "project",
+        DonationDailyRollup.day >= window_start,
+        DonationDailyRollup.day <= today
+    ).group_by(DonationDailyRollup.scope_key).all()
+    totals = np.zeros(len(keys))
+    squares = np.zeros(len(keys))
+    if sums:
+        scope_keys, window_totals, window_squares = zip(*sums)
+        codes = keys.get_indexer(list(scope_keys))
+        known = codes >= 0
+        totals[codes[known]] = np.asarray(window_totals, dtype=np.float64)[known]
+        squares[codes[known]] = np.asarray(window_squares, dtype=np.float64)[known]
+
+    created_days = pd.to_datetime(pd.Series(created_at), utc=True).dt.tz_convert(None).dt.normalize()
+    active_days = np.clip((pd.Timestamp(today) - created_days).dt.days.to_numpy() + 1, 1, FIT_WINDOW_DAYS)
+    remaining = np.asarray(targets, dtype=np.float64) - np.asarray([amount or 0.0 for amount in raised], dtype=np.float64)
+
+    days, probability = fit_forecasts(totals, squares, active_days, remaining)
+
+    reachable = np.isfinite(days) & (days <= MAX_FORECAST_DAYS)
+    completion_dates = [
+        today + timedelta(days=int(np.ceil(day))) if ok else None
+        for day, ok in zip(days, reachable)
+    ]
+    updated_at = datetime.now(timezone.utc)
+    for start in range(0, len(keys), WRITE_BATCH):
+        end = start + WRITE_BATCH
+        db.execute(_update_forecasts, {
+            "ids": list(keys[start:end]),
+            "dates": completion_dates[start:end],
+            "probabilities": [round(float(p), 4) for p in probability[start:end]],
+            "updated_at": updated_at
+        })
+    db.commit()
+    logger.info(f"Forecast completion for {len(keys)} projects, {int(reachable.sum())} with a date")
+    return len(keys)
+
+
+def get_closing_soon_projects(db: Session, within_days: int = 30, limit: int = 10, today: Optional[date] = None) -> List[Any]:
+    """
+    Verified, not yet funded projects forecast to reach their target within
+    `within_days`, soonest first, read from ix_projects_closing_soon.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    return db.query(Project).filter(
+        Project.verified == True,
+        Project.forecast_completion_date.isnot(None),
+        Project.forecast_completion_date <= today + timedelta(days=within_days),
+        Project.amount_raised < Project.target_amount
+    ).order_by(
+        Project.forecast_completion_date, Project.forecast_probability.desc()
+    ).limit(limit).all()
@@ -1,7 +1,14 @@
 import asyncio
-from typing import Optional
-from hiero_sdk_python import Client, AccountId, PrivateKey, Hbar, AccountCreateTransaction, AccountInfoQuery, Network, TransferTransaction, TransactionGetReceiptQuery, CryptoGetAccountBalanceQuery
+import httpx
+from typing import AsyncIterator, Dict, List, Optional, Set
+from hiero_sdk_python import PrivateKey
+from hiero_sdk_python.exceptions import PrecheckError, ReceiptStatusError
+from hiero_sdk_python.response_code import ResponseCode
 from api.utils.settings import settings
+from api.utils.redis_utils import redis_client
+from api.utils.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, hedged_call
+from api.utils.transaction_id import parse_transaction_id
+from api.v1.services.ledger import get_ledger, LedgerReceipt, SUCCESS
 from api.v1.models.project import Project
 from api.v1.models.donation import Donation
 from sqlalchemy.orm import Session
@@ -18,78 +25,62 @@ import base64
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-async def get_hedera_client() -> Client:
+# Precheck and receipt status errors are answers from a healthy network
+# (bad signature, insufficient balance, ...) and must not trip the breaker.
+consensus_breaker = CircuitBreaker(
+    "hedera-consensus",
+    failure_threshold=settings.HEDERA_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.HEDERA_BREAKER_RESET_TIMEOUT,
+    half_open_max_calls=settings.HEDERA_BREAKER_HALF_OPEN_CALLS,
+    ignored_exceptions=(PrecheckError, ReceiptStatusError)
+)
+mirror_breaker = CircuitBreaker(
+    "hedera-mirror-node",
+    failure_threshold=settings.HEDERA_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.HEDERA_BREAKER_RESET_TIMEOUT,
+    half_open_max_calls=settings.HEDERA_BREAKER_HALF_OPEN_CALLS
+)
+mirror_latency = LatencyTracker()
+
+
+class MirrorNodeError(Exception):
+    """Raised when the mirror node answers with a server error."""
+
+
+def get_upstream_health() -> dict:
     """
-    Get configured Hedera client for testnet or mainnet.
+    Circuit breaker state and mirror node latency, for monitoring.
     """
-    try:
-        network = settings.HEDERA_NETWORK.lower()
-        client = Client(Network(network='testnet' if network == 'testnet' else 'mainnet'))
-        
-        account_id = AccountId.from_string(settings.HEDERA_OPERATOR_ID)
-        operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
-        
-        # Debug the actual key type
-        pub_key = operator_key.public_key()
-        logger.debug(f"Setting operator with ID: {account_id}")
-        logger.debug(f"Operator key type: {type(pub_key)}")
-        logger.debug(f"Operator public key: {pub_key}")
-        
-        client.set_operator(account_id, operator_key)
-        return client
-        
-    except ValueError as e:
-        logger.error(f"Invalid Hedera configuration: {str(e)}")
-        raise ValueError(f"Invalid Hedera configuration: {str(e)}")
-    except Exception as e:
-        logger.error(f"Unexpected error in get_hedera_client: {type(e).__name__}: {str(e)}")
-        raise ValueError(f"Failed to initialize Hedera client: {type(e).__name__}: {str(e)}")
-    
+    return {
+        "consensus": consensus_breaker.snapshot(),
+        "mirror_node": {
+            **mirror_breaker.snapshot(),
+            "latency_p50": mirror_latency.percentile(50),
+            "latency_p95": mirror_latency.percentile(95),
+            "latency_p99": mirror_latency.percentile(99)
+        }
+    }
 
 async def create_user_wallet() -> tuple[str, str]:
     """
     Create a new Hedera account for a user and return (wallet_address, encrypted_private_key)
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
-
-    def sync_create_account():
-        try:
-            new_key = PrivateKey.generate("ecdsa")
-            private_key_string = new_key.to_string()  
-            
-            logger.debug(f"Generating new ECDSA account for user with public key: {new_key.public_key()}")
-
-            operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
-
-            transaction = (
-                AccountCreateTransaction()
-                .set_key(new_key.public_key())
-                .set_initial_balance(Hbar(1))
-                .set_account_memo("User donation wallet")
-                .freeze_with(client)
-                .sign(operator_key)
-            )
-
-            receipt = transaction.execute(client)
-            logger.debug(f"User wallet transaction submitted: {receipt.transaction_id}")
+    try:
+        new_key = PrivateKey.generate("ecdsa")
+        private_key_string = new_key.to_string()
 
-            if receipt.status != 22:
-                raise ValueError(f"User wallet creation failed with status: {receipt.status}")
+        logger.debug(f"Generating new ECDSA account for user with public key: {new_key.public_key()}")
 
-            if receipt.account_id is None:
-                raise ValueError("Account ID not found in receipt")
+        account_id = await consensus_breaker.call(
+            get_ledger().create_account, new_key.public_key(), 1, "User donation wallet"
+        )
+        logger.info(f"Successfully created user Hedera account: {account_id}")
 
-            account_id = str(receipt.account_id)
-            logger.info(f"Successfully created user Hedera account: {account_id}")
-            
-            return account_id, private_key_string
+        return account_id, private_key_string
 
-        except Exception as e:
-            logger.error(f"Failed to create user Hedera account: {type(e).__name__}: {str(e)}")
-            raise
-
-    return await loop.run_in_executor(None, sync_create_account)
+    except Exception as e:
+        logger.error(f"Failed to create user Hedera account: {type(e).__name__}: {str(e)}")
+        raise
 
 def encrypt_private_key(private_key: str, encryption_key: str) -> str:
     """
@@ -111,363 +102,447 @@ def decrypt_private_key(encrypted_key: str, encryption_key: str) -> str:
 async def get_wallet_balance(wallet_address: str) -> float:
     """
     Get the HBAR balance of a wallet using the correct pattern from docs.
+
+    Raises:
+        CircuitOpenError: If the consensus nodes are currently considered unavailable.
+        Exception: If the balance query fails. A failure is never reported as a
+            zero balance.
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    try:
+        balance = await consensus_breaker.call(get_ledger().get_balance, wallet_address)
+        logger.debug(f"Balance for {wallet_address}: {balance} HBAR")
+        return balance
+    except Exception as e:
+        logger.error(f"Failed to get balance for {wallet_address}: {str(e)}")
+        raise
 
-    def sync_get_balance():
+async def create_project_wallet(db: Session, project: Optional[Project] = None) -> str:
+    """
+    Create a new Hedera account for a project wallet.
+    """
+    try:
+        new_key = PrivateKey.generate("ecdsa")
+        logger.debug(f"Generating new ECDSA account with public key: {new_key.public_key()}")
+
+        account_id = await consensus_breaker.call(
+            get_ledger().create_account, new_key.public_key(), 1, "Project donation wallet"
+        )
+        logger.info(f"Successfully created Hedera account: {account_id}")
+
+        if project:
+            project.wallet_address = account_id
+            db.commit()
+        return account_id
+    except Exception as e:
+        logger.error(f"Failed to create Hedera wallet: {type(e).__name__}: {str(e)}")
+        raise ValueError(f"Failed to create Hedera wallet: {type(e).__name__}: {str(e)}")
+
+
+class ReceiptConfirmer:
+    """
+    Resolve pending transaction receipts in batches, without waiting on consensus.
+
+    Callers register a submitted transaction ID and await its receipt. A single
+    background task polls up to `batch_size` pending transactions every
+    `interval` seconds. A poll only returns receipts that are already
+    available; the other transactions stay pending for a later round, behind
+    the ones not polled yet. Nothing is held for the consensus latency, and a
+    slow transaction never delays the ones behind it.
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._polling: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._polls: Set[asyncio.Task] = set()
+
+    async def confirm(self, transaction_id: str, timeout: float):
+        """
+        Wait for the receipt of a submitted transaction.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(transaction_id, []).append(future)
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+        return await asyncio.wait_for(future, timeout)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            # Give concurrent submissions a chance to join the batch and
+            # consensus a chance to finish before the first receipt query.
+            await asyncio.sleep(self.interval)
+
+            keys = [key for key in self._pending if key not in self._polling][:self.batch_size]
+            if not keys:
+                continue
+            logger.debug(f"Polling receipts of {len(keys)} transactions")
+            self._polling.update(keys)
+            task = loop.create_task(self._poll(keys))
+            self._polls.add(task)
+            task.add_done_callback(self._polls.discard)
+
+    async def _poll(self, keys: List[str]):
         try:
-            account_id = AccountId.from_string(wallet_address)
-            balance_query = CryptoGetAccountBalanceQuery().set_account_id(account_id)
-            balance_result = balance_query.execute(client)
-            
-            balance_hbar = balance_result.hbars.to_hbars()
-            logger.debug(f"Balance for {wallet_address}: {balance_hbar} HBAR")
-            return float(balance_hbar)
-            
+            results = await get_ledger().get_receipts(keys)
         except Exception as e:
-            logger.error(f"Failed to get balance for {wallet_address}: {str(e)}")
-            return 0.0
+            # the transactions were accepted by a node; keep polling them until
+            # their callers time out
+            logger.warning(f"Failed to poll transaction receipts: {type(e).__name__}: {str(e)}")
+            results = {}
+        finally:
+            self._polling.difference_update(keys)
+
+        for key in keys:
+            futures = self._pending.pop(key, [])
+            if key not in results:
+                if not all(future.done() for future in futures):
+                    # not final yet: poll again after the others
+                    self._pending[key] = futures
+                continue
+            outcome = results[key]
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
 
-    balance = await loop.run_in_executor(None, sync_get_balance)
-    return balance
 
-async def create_project_wallet(db: Session, project: Optional[Project] = None) -> str:
+receipt_confirmer = ReceiptConfirmer(
+    batch_size=settings.HEDERA_CONFIRM_BATCH_SIZE,
+    interval=settings.HEDERA_CONFIRM_INTERVAL
+)
+
+
+async def submit_hbar_transfer(
+    sender_wallet: str,
+    recipient_wallet: str,
+    amount_hbar: float,
+    sender_key: PrivateKey,
+    memo: Optional[str] = None
+) -> str:
     """
-    Create a new Hedera account for a project wallet.
+    Submit an HBAR transfer and return its transaction ID without waiting for consensus.
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    amount_tinybars = int(amount_hbar * 100_000_000)
+    return await consensus_breaker.call(
+        get_ledger().submit_transfer, sender_wallet, recipient_wallet, amount_tinybars, sender_key, memo
+    )
 
-    def sync_create_account():
-        try:
-            new_key = PrivateKey.generate("ecdsa")
-            logger.debug(f"Generating new ECDSA account with public key: {new_key.public_key()}")
 
-            operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
+async def confirm_transaction(transaction_id: str) -> str:
+    """
+    Wait for a submitted transaction to reach consensus and return its tx hash.
 
-            transaction = (
-                AccountCreateTransaction()
-                .set_key(new_key.public_key())
-                .set_initial_balance(Hbar(1))
-                .set_account_memo("Project donation wallet")
-                .freeze_with(client)
-                .sign(operator_key)
-            )
+    Raises:
+        ValueError: If the receipt status is not SUCCESS.
+    """
+    receipt = await receipt_confirmer.confirm(transaction_id, timeout=settings.HEDERA_CONFIRM_TIMEOUT)
 
-            receipt = transaction.execute(client)
-            logger.debug(f"Transaction submitted: {receipt.transaction_id}")
-            logger.debug(f"Transaction receipt status: {receipt.status}")
+    logger.debug(f"Transaction ID: {transaction_id}")
+    logger.debug(f"Transaction status: {receipt.status}")
 
-            # Check if account was created successfully
-            if receipt.account_id is None:
-                raise ValueError(f"Account creation failed. Status code: {receipt.status}")
+    if receipt.status != SUCCESS:
+        raise ValueError(f"Transaction failed with status: {receipt.status}")
 
-            account_id = str(receipt.account_id)
-            logger.info(f"Successfully created Hedera account: {account_id}")
-            return account_id
+    return parse_transaction_id(transaction_id).mirror_id
 
-        except Exception as e:
-            logger.error(f"Failed to create Hedera account: {type(e).__name__}: {str(e)}")
-            raise
 
+async def donate_hbar(donor_wallet: str, project_wallet: str, amount_hbar: float, donor_private_key: str) -> str:
+    """
+    Process an HBAR donation from donor to project wallet.
+    """
     try:
-        account_id = await loop.run_in_executor(None, sync_create_account)
-        if project:
-            project.wallet_address = account_id
-            db.commit()
-        return account_id
+        logger.debug(f"Processing donation: {amount_hbar} HBAR from {donor_wallet} to {project_wallet}")
+
+        donor_key = PrivateKey.from_string(donor_private_key)
+        transaction_id = await submit_hbar_transfer(donor_wallet, project_wallet, amount_hbar, donor_key)
+        tx_hash = await confirm_transaction(transaction_id)
+
+        logger.info(f"Donation transaction completed successfully: {tx_hash}")
+        return tx_hash
+
     except Exception as e:
-        logger.error(f"Failed to create Hedera wallet: {type(e).__name__}: {str(e)}")
-        raise ValueError(f"Failed to create Hedera wallet: {type(e).__name__}: {str(e)}")
-        
+        logger.error(f"Failed to process donation: {type(e).__name__}: {str(e)}")
+        raise
 
-async def donate_hbar(donor_wallet: str, project_wallet: str, amount_hbar: float, donor_private_key: str) -> str:
+async def _load_user_signing_key(user_id: UUID, db: Session, role: str) -> tuple[str, str]:
     """
-    Process an HBAR donation from donor to project wallet.
+    Load a user's wallet address and decrypted private key string.
     """
-    client = await get_hedera_client()
     loop = asyncio.get_event_loop()
 
-    def sync_donate():
-        try:
-            donor_id = AccountId.from_string(donor_wallet)
-            project_id = AccountId.from_string(project_wallet)
-            donor_key = PrivateKey.from_string(donor_private_key)
-
-            logger.debug(f"Processing donation: {amount_hbar} HBAR from {donor_wallet} to {project_wallet}")
-
-            amount_tinybars = int(amount_hbar * 100_000_000)
-            
-            transaction = (
-                TransferTransaction()
-                .add_hbar_transfer(donor_id, -amount_tinybars)
-                .add_hbar_transfer(project_id, amount_tinybars)
-                .freeze_with(client)
-                .sign(donor_key)
-            )
-
-            receipt = transaction.execute(client)
-            transaction_id = transaction.transaction_id
-            
-            logger.debug(f"Transaction ID: {transaction_id}")
-            logger.debug(f"Transaction status: {receipt.status}")
-
-            if receipt.status != 22:  # SUCCESS
-                raise ValueError(f"Transaction failed with status: {receipt.status}")
-
-            tx_str = str(transaction_id)
-            # Format 1: Replace @ with -
-            tx_hash = tx_str.replace('@', '-')
-            # Format 2: If that doesn't work, we'll try the original in verify_transaction
-            
-            logger.info(f"Donation transaction completed successfully: {tx_hash}")
-            return tx_hash
+    def sync_load():
+        from api.v1.models.user import User
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user or not user.wallet_address or not user.encrypted_private_key:
+            raise ValueError(f"{role} wallet not found or not properly configured")
 
-        except Exception as e:
-            logger.error(f"Failed to process donation: {type(e).__name__}: {str(e)}")
-            raise
+        private_key_str = decrypt_private_key(user.encrypted_private_key, settings.PRIVATE_KEY_ENCRYPTION_KEY)
+        return user.wallet_address, private_key_str
 
-    tx_hash = await loop.run_in_executor(None, sync_donate)
-    return tx_hash
+    wallet_address, private_key_str = await loop.run_in_executor(None, sync_load)
+    return wallet_address, private_key_str
 
 async def donate_hbar_from_user(user_id: UUID, project_wallet: str, amount_hbar: float, db: Session) -> str:
     """
     Process an HBAR donation using the user's stored private key.
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    try:
+        wallet_address, donor_private_key_str = await _load_user_signing_key(user_id, db, "User")
 
-    def sync_donate():
-        try:
-            from api.v1.models.user import User
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user or not user.wallet_address or not user.encrypted_private_key:
-                raise ValueError("User wallet not found or not properly configured")
-
-            donor_id = AccountId.from_string(user.wallet_address)
-            project_id = AccountId.from_string(project_wallet)
-
-            logger.debug(f"Processing donation: {amount_hbar} HBAR from {user.wallet_address} to {project_wallet}")
-
-            amount_tinybars = int(amount_hbar * 100_000_000)
-            
-            donor_private_key_str = decrypt_private_key(user.encrypted_private_key, settings.PRIVATE_KEY_ENCRYPTION_KEY)
-            
-            donor_key = PrivateKey.from_string_ecdsa(donor_private_key_str)
-            logger.debug(f"Using ECDSA key for donation: {donor_key.public_key()}")
-
-            transaction = (
-                TransferTransaction()
-                .add_hbar_transfer(donor_id, -amount_tinybars)
-                .add_hbar_transfer(project_id, amount_tinybars)
-                .freeze_with(client)
-                .sign(donor_key)
-            )
-
-            receipt = transaction.execute(client)
-            transaction_id = transaction.transaction_id
-            
-            logger.debug(f"Transaction ID: {transaction_id}")
-            logger.debug(f"Transaction status: {receipt.status}")
-
-            if receipt.status != 22:
-                raise ValueError(f"Transaction failed with status: {receipt.status}")
-
-            tx_hash = str(transaction_id).replace('@', '-')
-            logger.info(f"Donation transaction completed successfully: {tx_hash}")
-            return tx_hash
+        logger.debug(f"Processing donation: {amount_hbar} HBAR from {wallet_address} to {project_wallet}")
 
-        except Exception as e:
-            logger.error(f"Failed to process donation: {type(e).__name__}: {str(e)}")
-            raise
+        donor_key = PrivateKey.from_string_ecdsa(donor_private_key_str)
+        logger.debug(f"Using ECDSA key for donation: {donor_key.public_key()}")
+
+        transaction_id = await submit_hbar_transfer(wallet_address, project_wallet, amount_hbar, donor_key)
+        tx_hash = await confirm_transaction(transaction_id)
 
-    tx_hash = await loop.run_in_executor(None, sync_donate)
-    return tx_hash
+        logger.info(f"Donation transaction completed successfully: {tx_hash}")
+        return tx_hash
+
+    except Exception as e:
+        logger.error(f"Failed to process donation: {type(e).__name__}: {str(e)}")
+        raise
+
+def _load_private_key(private_key_str: str) -> PrivateKey:
+    """
+    Load a private key, trying ECDSA, the generic parser and raw hex bytes in turn.
+    """
+    try:
+        # Method 1: Try ECDSA explicitly first
+        donor_key = PrivateKey.from_string_ecdsa(private_key_str)
+        logger.debug("Successfully loaded as ECDSA key")
+    except Exception as e1:
+        logger.debug(f"ECDSA loading failed: {e1}, trying general method")
+        try:
+            # Method 2: Try general method
+            donor_key = PrivateKey.from_string(private_key_str)
+            logger.debug("Successfully loaded with general method")
+        except Exception as e2:
+            logger.debug(f"General method failed: {e2}, trying from bytes")
+            try:
+                # Method 3: Try from bytes
+                key_bytes = bytes.fromhex(private_key_str)
+                donor_key = PrivateKey.from_bytes_ecdsa(key_bytes)
+                logger.debug("Successfully loaded from bytes")
+            except Exception as e3:
+                logger.error(f"All key loading methods failed: {e3}")
+                raise ValueError(f"Failed to load private key: {e3}")
+    return donor_key
 
 async def transfer_hbar_p2p(sender_user_id: UUID, recipient_wallet: str, amount_hbar: float, db: Session, memo: str = "P2P transfer") -> str:
     """
     Transfer HBAR between user wallets (P2P transfer).
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    try:
+        wallet_address, donor_private_key_str = await _load_user_signing_key(sender_user_id, db, "Sender")
 
-    def sync_transfer():
-        try:
-            from api.v1.models.user import User
-            sender = db.query(User).filter(User.id == sender_user_id).first()
-            if not sender or not sender.wallet_address or not sender.encrypted_private_key:
-                raise ValueError("Sender wallet not found or not properly configured")
-
-            sender_id = AccountId.from_string(sender.wallet_address)
-            recipient_id = AccountId.from_string(recipient_wallet)
-
-            logger.debug(f"Processing P2P transfer: {amount_hbar} HBAR from {sender.wallet_address} to {recipient_wallet}")
-
-            amount_tinybars = int(amount_hbar * 100_000_000)
-            
-            donor_private_key_str = decrypt_private_key(sender.encrypted_private_key, settings.PRIVATE_KEY_ENCRYPTION_KEY)
-            
-            logger.debug(f"Decrypted private key length: {len(donor_private_key_str)}")
-            logger.debug(f"Decrypted private key (first 50 chars): {donor_private_key_str[:50]}...")
-            
-            # Try different key loading methods
-            try:
-                # Method 1: Try ECDSA explicitly first
-                donor_key = PrivateKey.from_string_ecdsa(donor_private_key_str)
-                logger.debug("Successfully loaded as ECDSA key")
-            except Exception as e1:
-                logger.debug(f"ECDSA loading failed: {e1}, trying general method")
-                try:
-                    # Method 2: Try general method
-                    donor_key = PrivateKey.from_string(donor_private_key_str)
-                    logger.debug("Successfully loaded with general method")
-                except Exception as e2:
-                    logger.debug(f"General method failed: {e2}, trying from bytes")
-                    try:
-                        # Method 3: Try from bytes
-                        key_bytes = bytes.fromhex(donor_private_key_str)
-                        donor_key = PrivateKey.from_bytes_ecdsa(key_bytes)
-                        logger.debug("Successfully loaded from bytes")
-                    except Exception as e3:
-                        logger.error(f"All key loading methods failed: {e3}")
-                        raise ValueError(f"Failed to load private key: {e3}")
-
-            logger.debug(f"Using key for P2P transfer: {donor_key.public_key()}")
-
-            transaction = (
-                TransferTransaction()
-                .add_hbar_transfer(sender_id, -amount_tinybars)
-                .add_hbar_transfer(recipient_id, amount_tinybars)
-                .set_transaction_memo(memo)
-                .freeze_with(client)
-                .sign(donor_key)
-            )
-
-            # Execute transaction
-            receipt = transaction.execute(client)
-            transaction_id = transaction.transaction_id
-            
-            logger.debug(f"P2P Transaction ID: {transaction_id}")
-            logger.debug(f"P2P Transaction status: {receipt.status}")
-
-            if receipt.status != 22:
-                raise ValueError(f"P2P transfer failed with status: {receipt.status}")
-
-            tx_hash = str(transaction_id).replace('@', '-')
-            logger.info(f"P2P transfer completed successfully: {tx_hash}")
-            return tx_hash
+        logger.debug(f"Processing P2P transfer: {amount_hbar} HBAR from {wallet_address} to {recipient_wallet}")
+        logger.debug(f"Decrypted private key length: {len(donor_private_key_str)}")
 
-        except Exception as e:
-            logger.error(f"Failed to process P2P transfer: {type(e).__name__}: {str(e)}")
-            raise
+        donor_key = _load_private_key(donor_private_key_str)
+        logger.debug(f"Using key for P2P transfer: {donor_key.public_key()}")
 
-    tx_hash = await loop.run_in_executor(None, sync_transfer)
-    return tx_hash
+        transaction_id = await submit_hbar_transfer(wallet_address, recipient_wallet, amount_hbar, donor_key, memo=memo)
+        tx_hash = await confirm_transaction(transaction_id)
+
+        logger.info(f"P2P transfer completed successfully: {tx_hash}")
+        return tx_hash
+
+    except Exception as e:
+        logger.error(f"Failed to process P2P transfer: {type(e).__name__}: {str(e)}")
+        raise
 
-async def verify_transaction(tx_hash: str) -> dict:
+_mirror_http_client: Optional[httpx.AsyncClient] = None
+
+def _mirror_node_url() -> str:
+    if settings.HEDERA_MIRROR_NODE_URL:
+        return settings.HEDERA_MIRROR_NODE_URL
+    network = settings.HEDERA_NETWORK.lower()
+    return f"https://{'testnet' if network == 'testnet' else 'mainnet'}.mirrornode.hedera.com"
+
+def get_mirror_http_client() -> httpx.AsyncClient:
     """
-    Verify a transaction using Hedera Mirror Node API.
-    Try multiple transaction ID formats.
+    Get the shared HTTP client for mirror node requests.
+
+    Reusing one client keeps connections to the mirror node alive across
+    requests instead of paying a TLS handshake per lookup.
     """
-    import httpx
-    import asyncio
-    
-    network = settings.HEDERA_NETWORK.lower()
-    mirror_node_url = f"https://{'testnet' if network == 'testnet' else 'mainnet'}.mirrornode.hedera.com"
-    
-    await asyncio.sleep(5)
-    
-    # Try multiple transaction ID formats
-    formats_to_try = [
-        tx_hash,  # Original format with -
-        tx_hash.replace('-', '@'),  # Replace - with @
-        tx_hash.split('-')[0] + '@' + tx_hash.split('-')[1].split('.')[0] + '.' + tx_hash.split('-')[1].split('.')[1][:6],  # Limited precision
-    ]
-    
-    max_retries = 3
-    for tx_format in formats_to_try:
-        for attempt in range(max_retries):
-            try:
-                url = f"{mirror_node_url}/api/v1/transactions/{tx_format}"
-                logger.debug(f"Verifying transaction attempt {attempt + 1} with format: {tx_format}")
-                
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(url)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        transactions = result.get("transactions", [])
-                        if not transactions:
-                            continue
-                        
-                        tx = transactions[0]
-                        transfers = tx.get("transfers", [])
-                        
-                        # Find the transfer amounts
-                        positive_transfers = [t for t in transfers if t.get("amount", 0) > 0]
-                        negative_transfers = [t for t in transfers if t.get("amount", 0) < 0]
-                        
-                        return {
-                            "valid": tx.get("result") == "SUCCESS",
-                            "amount": sum(t.get("amount", 0) for t in positive_transfers) / 100_000_000,
-                            "from_account": negative_transfers[0].get("account") if negative_transfers else None,
-                            "to_account": positive_transfers[0].get("account") if positive_transfers else None,
-                            "timestamp": tx.get("consensus_timestamp"),
-                            "transaction_id": tx.get("transaction_id"),
-                            "transfers": transfers
-                        }
-                    elif response.status_code == 404:
-                        # Transaction not yet indexed, wait and retry
-                        if attempt < max_retries - 1:
-                            wait_time = 2 ** attempt
-                            logger.debug(f"Transaction not indexed yet with format {tx_format}, waiting {wait_time}s...")
-                            await asyncio.sleep(wait_time)
-                            continue
-                    else:
-                        # Other HTTP error, try next format
-                        break
-                        
-            except Exception as e:
-                logger.debug(f"Failed with format {tx_format} attempt {attempt + 1}: {str(e)}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
-                    continue
-    
-    logger.warning(f"Could not verify transaction {tx_hash} with mirror node using any format")
+    global _mirror_http_client
+    if _mirror_http_client is None or _mirror_http_client.is_closed:
+        transport = None
+        ledger = get_ledger()
+        if getattr(ledger, "mirror_app", None) is not None and not settings.HEDERA_MIRROR_NODE_URL:
+            # fake ledger: serve mirror node reads in-process
+            transport = httpx.ASGITransport(app=ledger.mirror_app)
+        _mirror_http_client = httpx.AsyncClient(
+            base_url=_mirror_node_url(),
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=settings.TRACE_BATCH_CONCURRENCY * 2),
+            transport=transport
+        )
+    return _mirror_http_client
+
+def _verification_cache_key(mirror_id: str) -> str:
+    return f"trace:verification:{mirror_id}"
+
+def _unverified_result(transaction_id: str, error: str) -> dict:
     return {
         "valid": False,
         "amount": 0,
         "from_account": None,
         "to_account": None,
         "timestamp": None,
-        "transaction_id": tx_hash,
-        "error": "Transaction not found in mirror node after trying multiple formats"
+        "transaction_id": transaction_id,
+        "error": error
     }
 
-async def trace_transaction(tx_hash: str, db: Session) -> dict:
+async def _mirror_get(path: str) -> httpx.Response:
     """
-    Trace a donation by transaction hash.
-    
+    GET a mirror node path through the mirror node circuit breaker.
+
+    When HEDERA_MIRROR_HEDGE_PERCENTILE is set and enough latency samples exist,
+    a second identical request is fired once the first has taken longer than
+    that percentile of recent latencies, and the faster response wins.
+    """
+    client = get_mirror_http_client()
+
+    async def request() -> httpx.Response:
+        started = time.monotonic()
+        response = await client.get(path)
+        if response.status_code >= 500:
+            raise MirrorNodeError(f"Mirror node returned {response.status_code} for {path}")
+        mirror_latency.record(time.monotonic() - started)
+        return response
+
+    hedge_after = None
+    if settings.HEDERA_MIRROR_HEDGE_PERCENTILE and len(mirror_latency) >= settings.HEDERA_MIRROR_HEDGE_MIN_SAMPLES:
+        hedge_after = mirror_latency.percentile(settings.HEDERA_MIRROR_HEDGE_PERCENTILE)
+
+    return await mirror_breaker.call(hedged_call, request, hedge_after)
+
+async def get_mirror_receipts(transaction_ids: List[str]) -> Dict[str, LedgerReceipt]:
+    """
+    Receipts of the transactions the mirror node has already indexed, looked
+    up concurrently. Transactions it has not indexed yet, or whose lookup
+    failed, are left out to be polled again.
+    """
+    async def lookup(transaction_id: str) -> Optional[LedgerReceipt]:
+        try:
+            response = await _mirror_get(f"/api/v1/transactions/{parse_transaction_id(transaction_id).mirror_id}")
+        except Exception as e:
+            logger.debug(f"Receipt lookup of {transaction_id} failed: {type(e).__name__}: {str(e)}")
+            return None
+        transactions = response.json().get("transactions", []) if response.status_code == 200 else []
+        if not transactions:
+            return None
+        status = ResponseCode.__members__.get(transactions[0].get("result"), ResponseCode.UNKNOWN)
+        return LedgerReceipt(
+            transaction_id=transaction_id,
+            status=int(status),
+            account_id=transactions[0].get("entity_id")
+        )
+
+    receipts = await asyncio.gather(*(lookup(transaction_id) for transaction_id in transaction_ids))
+    return {
+        transaction_id: receipt
+        for transaction_id, receipt in zip(transaction_ids, receipts)
+        if receipt is not None
+    }
+
+async def _lookup_mirror_transaction(mirror_id: str, max_retries: int = 3) -> dict:
+    """
+    Fetch a transaction from the mirror node, retrying while it is not yet indexed.
+
+    Successful lookups are cached, since a transaction that reached consensus
+    never changes afterwards.
+    """
+    url = f"/api/v1/transactions/{mirror_id}"
+    for attempt in range(max_retries):
+        try:
+            logger.debug(f"Verifying transaction {mirror_id}, attempt {attempt + 1}")
+            response = await _mirror_get(url)
+
+            if response.status_code == 200:
+                transactions = response.json().get("transactions", [])
+                if transactions:
+                    tx = transactions[0]
+                    transfers = tx.get("transfers", [])
+
+                    # Find the transfer amounts
+                    positive_transfers = [t for t in transfers if t.get("amount", 0) > 0]
+                    negative_transfers = [t for t in transfers if t.get("amount", 0) < 0]
+
+                    verification = {
+                        "valid": tx.get("result") == "SUCCESS",
+                        "amount": sum(t.get("amount", 0) for t in positive_transfers) / 100_000_000,
+                        "from_account": negative_transfers[0].get("account") if negative_transfers else None,
+                        "to_account": positive_transfers[0].get("account") if positive_transfers else None,
+                        "timestamp": tx.get("consensus_timestamp"),
+                        "transaction_id": tx.get("transaction_id"),
+                        "transfers": transfers
+                    }
+                    await redis_client.set_json(_verification_cache_key(mirror_id), verification, settings.TRACE_CACHE_TTL)
+                    return verification
+            elif response.status_code != 404:
+                # Anything other than "not indexed yet" will not improve on retry
+                break
+
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping verification of {mirror_id}: {str(e)}")
+            return _unverified_result(mirror_id, str(e))
+        except Exception as e:
+            logger.debug(f"Failed to verify {mirror_id} on attempt {attempt + 1}: {str(e)}")
+
+        if attempt < max_retries - 1:
+            wait_time = 2 ** attempt
+            logger.debug(f"Transaction {mirror_id} not available yet, waiting {wait_time}s...")
+            await asyncio.sleep(wait_time)
+
+    logger.warning(f"Could not verify transaction {mirror_id} with mirror node")
+    return _unverified_result(mirror_id, "Transaction not found in mirror node")
+
+async def verify_transaction(tx_hash: str, initial_delay: float = 5) -> dict:
+    """
+    Verify a transaction using Hedera Mirror Node API.
+
     Args:
-        tx_hash: Hedera transaction ID
-        db: SQLAlchemy session
-    
-    Returns:
-        dict: Transaction details with linked donation/project
+        tx_hash: Hedera transaction ID in any accepted format
+        initial_delay: Seconds to wait for mirror node indexing when the
+            transaction is not cached yet
     """
-    verification = await verify_transaction(tx_hash)
-    donation = db.query(Donation).filter(Donation.tx_hash == tx_hash).first()
-    
+    try:
+        mirror_id = parse_transaction_id(tx_hash).mirror_id
+    except ValueError as e:
+        logger.warning(str(e))
+        return _unverified_result(tx_hash, str(e))
+
+    cached = await redis_client.get_json(_verification_cache_key(mirror_id))
+    if cached:
+        return cached
+
+    await asyncio.sleep(initial_delay)
+    return await _lookup_mirror_transaction(mirror_id)
+
+def _trace_result(transaction_id: str, verification: dict, donation: Optional[Donation]) -> dict:
     result = {
-        "transaction_id": tx_hash,
+        "transaction_id": transaction_id,
         "valid": verification["valid"],
         "amount": verification["amount"],
         "from_account": verification["from_account"],
         "to_account": verification["to_account"],
         "timestamp": verification["timestamp"]
     }
-    
+
     if donation:
         result.update({
             "donation_id": donation.id,
@@ -475,9 +550,78 @@ async def trace_transaction(tx_hash: str, db: Session) -> dict:
             "donor_id": donation.donor_id,
             "status": donation.status.value
         })
-    
+
     return result
 
+async def trace_transaction(tx_hash: str, db: Session) -> dict:
+    """
+    Trace a donation by transaction hash.
+    
+    Args:
+        tx_hash: Hedera transaction ID in SDK, mirror node or legacy format
+        db: SQLAlchemy session
+    
+    Returns:
+        dict: Transaction details with linked donation/project
+    """
+    from api.v1.services.donation import find_donation_by_transaction_id
+
+    donation = find_donation_by_transaction_id(db, tx_hash)
+    verification = await verify_transaction(tx_hash)
+    
+    return _trace_result(parse_transaction_id(tx_hash).mirror_id, verification, donation)
+
+def trace_transactions_batch(tx_hashes: List[str], db: Session) -> AsyncIterator[dict]:
+    """
+    Trace many transactions, yielding each result as soon as it is resolved.
+
+    Linked donations are loaded in one query before this returns, so `db` is
+    not used while the results are streamed. Cached verifications are read
+    in one Redis round trip; only the remaining IDs hit the mirror node, with
+    at most TRACE_BATCH_CONCURRENCY lookups in flight. Batch lookups target
+    settled transactions, so they skip the indexing delay and not-found retries.
+    """
+    from api.v1.services.donation import find_donations_by_transaction_ids
+
+    # different spellings of the same transaction collapse to one lookup
+    parsed_ids = {}
+    invalid = []
+    for tx_hash in tx_hashes:
+        try:
+            parsed = parse_transaction_id(tx_hash)
+        except ValueError as e:
+            invalid.append({"transaction_id": tx_hash, "valid": False, "error": str(e)})
+            continue
+        parsed_ids.setdefault(parsed.mirror_id, parsed)
+
+    donations = find_donations_by_transaction_ids(db, parsed_ids.values())
+    return _stream_traces(invalid, list(parsed_ids.values()), donations)
+
+async def _stream_traces(invalid: List[dict], parsed_ids: list, donations: dict) -> AsyncIterator[dict]:
+    for result in invalid:
+        yield result
+
+    cached = await redis_client.get_many_json(
+        [_verification_cache_key(parsed.mirror_id) for parsed in parsed_ids]
+    )
+
+    pending = []
+    for parsed, verification in zip(parsed_ids, cached):
+        if verification:
+            yield _trace_result(parsed.mirror_id, verification, donations.get(parsed))
+        else:
+            pending.append(parsed)
+
+    semaphore = asyncio.Semaphore(settings.TRACE_BATCH_CONCURRENCY)
+
+    async def resolve(parsed):
+        async with semaphore:
+            verification = await _lookup_mirror_transaction(parsed.mirror_id, max_retries=1)
+        return _trace_result(parsed.mirror_id, verification, donations.get(parsed))
+
+    for next_result in asyncio.as_completed([resolve(parsed) for parsed in pending]):
+        yield await next_result
+
 async def update_raised_amount(db: Session, project_id: UUID, amount: float):
     """
     Update project's amount_raised.
@@ -0,0 +1,225 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import logging
+import multiprocessing
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from api.utils.redis_utils import redis_client
+from api.utils.settings import settings
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+from api.v1.models.user_insight_snapshot import UserInsightSnapshot
+from api.v1.services.insights_engine import build_snapshot_batch
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = "insight_batch:last_run"
+METRICS_TTL = 7 * 86400
+# rows per INSERT, well below the 65535 bind parameter limit
+UPSERT_BATCH = 1000
+
+
+def stream_donor_chunks(db: Session, chunk_rows: int) -> Iterator[List[tuple]]:
+    """
+    Completed donations ordered by donor and then (created_at, id), read
+    through a server-side cursor and cut into chunks of about `chunk_rows`
+    rows that never split a donor.
+    """
+    result = db.execute(
+        select(
+            Donation.donor_id,
+            Donation.amount,
+            Donation.created_at,
+            Donation.project_id,
+            Project.category,
+            Donation.id
+        ).join(
+            Project, Project.id == Donation.project_id
+        ).where(
+            Donation.status == DonationStatus.completed
+        ).order_by(
+            Donation.donor_id, Donation.created_at, Donation.id
+        ).execution_options(stream_results=True, yield_per=chunk_rows)
+    )
+
+    return chunk_by_donor(result.partitions(chunk_rows), chunk_rows)
+
+
+def chunk_by_donor(partitions: Iterator[List[tuple]], chunk_rows: int) -> Iterator[List[tuple]]:
+    """Regroup donor-ordered row partitions into chunks that never split a donor."""
+    pending: List[tuple] = []
+    for partition in partitions:
+        pending.extend(partition)
+        if len(pending) < chunk_rows:
+            continue
+        # hold back the last donor, whose rows may continue in the next partition
+        last_donor = pending[-1][0]
+        cut = len(pending)
+        while cut and pending[cut - 1][0] == last_donor:
+            cut -= 1
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+    if pending:
+        yield pending
+
+
+def chunk_arrays(rows: List[tuple]) -> Tuple[list, tuple]:
+    """
+    Donor ids and the compact build_snapshot_batch arguments (apart from
+    `now`) for one chunk of donor-ordered rows. A trailing donation id
+    column, when present, is left to chunk_watermarks.
+    """
+    donor_ids, amounts, created_at, project_ids, categories = list(zip(*rows))[:5]
+    donor_codes, donors = pd.factorize(pd.Series(donor_ids, dtype=object))
+    starts = np.flatnonzero(np.diff(donor_codes, prepend=-1, append=-1))
+    category_codes, category_values = pd.factorize(pd.Series(categories, dtype=object))
+    project_codes, project_values = pd.factorize(pd.Series([str(project_id) for project_id in project_ids]))
+
+    return list(donors), (
+        starts,
+        np.asarray(amounts, dtype=np.float64),
+        pd.to_datetime(pd.Series(created_at), utc=True).to_numpy(dtype='datetime64[ns]').view(np.int64),
+        category_codes,
+        list(category_values),
+        project_codes,
+        list(project_values)
+    )
+
+
+def chunk_watermarks(rows: List[tuple]) -> list:
+    """
+    (created_at, id) of each donor's newest donation, in chunk_arrays donor
+    order, from rows ordered by donor and then (created_at, id).
+    """
+    latest = {}
+    for row in rows:
+        latest[row[0]] = (row[2], row[5])
+    return list(latest.values())
+
+
+def upsert_snapshots(db: Session, donor_ids: list, computed: List[Dict[str, Any]], watermarks: list):
+    """
+    Insert or replace snapshots, UPSERT_BATCH rows per statement, in one transaction.
+
+    A snapshot whose watermark has moved past the batch's, because a donation
+    was folded in after the batch read it, is kept.
+    """
+    now = datetime.now(timezone.utc)
+    for start in range(0, len(donor_ids), UPSERT_BATCH):
+        end = start + UPSERT_BATCH
+        statement = insert(UserInsightSnapshot).values([
+            {
+                "id": uuid.uuid4(),
+                "donor_id": donor_id,
+                "aggregates": snapshot["aggregates"],
+                "insights": snapshot["insights"],
+                "donation_count": snapshot["donation_count"],
+                "valid_until": snapshot["valid_until"],
+                "last_donation_at": last_donation_at,
+                "last_donation_id": last_donation_id,
+                "created_at": now,
+                "updated_at": now
+            }
+            for donor_id, snapshot, (last_donation_at, last_donation_id)
+            in zip(donor_ids[start:end], computed[start:end], watermarks[start:end])
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[UserInsightSnapshot.donor_id],
+            set_={
+                "aggregates": statement.excluded.aggregates,
+                "insights": statement.excluded.insights,
+                "donation_count": statement.excluded.donation_count,
+                "valid_until": statement.excluded.valid_until,
+                "last_donation_at": statement.excluded.last_donation_at,
+                "last_donation_id": statement.excluded.last_donation_id,
+                "updated_at": now
+            },
+            where=or_(
+                UserInsightSnapshot.last_donation_at.is_(None),
+                tuple_(statement.excluded.last_donation_at, statement.excluded.last_donation_id)
+                >= tuple_(UserInsightSnapshot.last_donation_at, UserInsightSnapshot.last_donation_id)
+            )
+        ))
+    db.commit()
+
+
+def precompute_insight_snapshots(db: Session, workers: Optional[int] = None, chunk_rows: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Rebuild the insight snapshot of every donor with completed donations.
+
+    Chunks are computed by a pool of `workers` processes (inline with 0)
+    while the next chunks are read, and each result is bulk upserted as it
+    completes. A donation committed during the run is folded in past the
+    batch's watermark or, if that was missed, caught by the count check in
+    get_insight_snapshot on the next read. Returns the run's throughput metrics,
+    which are also logged and stored in Redis under METRICS_KEY.
+    """
+    workers = settings.INSIGHT_BATCH_WORKERS if workers is None else workers
+    chunk_rows = chunk_rows or settings.INSIGHT_BATCH_CHUNK_ROWS
+    if workers and multiprocessing.current_process().daemon:
+        # e.g. a prefork Celery worker child, which may not start processes
+        logger.warning("Insight batch running in a daemon process; computing inline")
+        workers = 0
+
+    now = datetime.now()
+    started_at = datetime.now(timezone.utc)
+    began = time.perf_counter()
+    totals = {"donors": 0, "donations": 0, "chunks": 0, "write_seconds": 0.0}
+    # committing on the reading session would close its server-side cursor
+    writer = Session(bind=db.get_bind())
+
+    def write(donor_ids: list, watermarks: list, computed: List[Dict[str, Any]]):
+        start = time.perf_counter()
+        upsert_snapshots(writer, donor_ids, computed, watermarks)
+        totals["write_seconds"] += time.perf_counter() - start
+        totals["donors"] += len(donor_ids)
+        totals["chunks"] += 1
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+    in_flight: List[Tuple[list, list, Future]] = []
+    try:
+        for rows in stream_donor_chunks(db, chunk_rows):
+            donor_ids, arrays = chunk_arrays(rows)
+            watermarks = chunk_watermarks(rows)
+            totals["donations"] += len(rows)
+            if pool is None:
+                write(donor_ids, watermarks, build_snapshot_batch(*arrays, now))
+                continue
+
+            in_flight.append((donor_ids, watermarks, pool.submit(build_snapshot_batch, *arrays, now)))
+            # bound memory: keep at most two chunks per worker outstanding
+            while len(in_flight) >= workers * 2:
+                donor_ids, watermarks, future = in_flight.pop(0)
+                write(donor_ids, watermarks, future.result())
+        for donor_ids, watermarks, future in in_flight:
+            write(donor_ids, watermarks, future.result())
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - began
+    metrics = {
+        **totals,
+        "workers": workers,
+        "chunk_rows": chunk_rows,
+        "started_at": started_at.isoformat(),
+        "write_seconds": round(totals["write_seconds"], 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "donors_per_second": round(totals["donors"] / elapsed, 1) if elapsed else 0.0,
+        "donations_per_second": round(totals["donations"] / elapsed, 1) if elapsed else 0.0
+    }
+    logger.info(
+        f"Precomputed insights for {metrics['donors']} donors ({metrics['donations']} donations) "
+        f"in {metrics['elapsed_seconds']}s, {metrics['donors_per_second']} donors/s"
+    )
+    asyncio.run(redis_client.set_json(METRICS_KEY, metrics, METRICS_TTL))
+    return metrics
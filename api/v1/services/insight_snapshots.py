@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+import logging
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+from api.v1.models.donation import Donation
+from api.v1.models.donor_total import DonorTotal
+from api.v1.models.project import Project
+from api.v1.models.user_insight_snapshot import UserInsightSnapshot
+from api.v1.services.analytics_pool import run_analytics
+from api.v1.services.insights_engine import (
+    InsightAggregates, aggregates_from_dict, build_snapshot, fold_snapshot, refresh_snapshot, utc_nanos
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _store(snapshot: UserInsightSnapshot, computed: Dict[str, Any], watermark: Optional[Tuple[datetime, UUID]] = None):
+    snapshot.aggregates = computed["aggregates"]
+    snapshot.insights = computed["insights"]
+    snapshot.donation_count = computed["donation_count"]
+    snapshot.valid_until = computed["valid_until"]
+    if watermark is not None:
+        snapshot.last_donation_at, snapshot.last_donation_id = watermark
+
+
+def is_folded(snapshot: UserInsightSnapshot, created_at: datetime, donation_id: UUID) -> bool:
+    """Whether a donation is at or before the snapshot's watermark, so already in its aggregates."""
+    return (created_at, donation_id) <= (snapshot.last_donation_at, snapshot.last_donation_id)
+
+
+def donation_arrays(df: pd.DataFrame) -> tuple:
+    """
+    Factorized columns of an insight DataFrame, the arguments of
+    build_snapshot apart from `now`.
+    """
+    category_codes, categories = pd.factorize(df['category'])
+    project_codes, project_ids = pd.factorize(df['project_id'].astype(str))
+    return (
+        df['amount'].to_numpy(dtype=np.float64),
+        df['created_at'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+        category_codes,
+        list(categories),
+        project_codes,
+        list(project_ids)
+    )
+
+
+async def rebuild_snapshot(db: Session, donor_id: UUID, now: datetime) -> Optional[UserInsightSnapshot]:
+    """
+    Recompute a donor's snapshot from their completed donations.
+
+    Returns None (and drops any snapshot) for donors without completed donations.
+    """
+    from api.v1.services.analytics import DonationAnalytics
+
+    # locked before reading donations, so a concurrent fold waits for the new
+    # watermark instead of being overwritten
+    snapshot = db.query(UserInsightSnapshot).filter(UserInsightSnapshot.donor_id == donor_id).with_for_update().first()
+    analytics = DonationAnalytics(db)
+    rows = analytics._query_user_donations(donor_id)
+
+    if not rows:
+        if snapshot:
+            db.delete(snapshot)
+            db.commit()
+        return None
+
+    if snapshot is None:
+        snapshot = UserInsightSnapshot(donor_id=donor_id)
+        db.add(snapshot)
+    df = analytics._donations_to_dataframe(rows)
+    watermark = max((row.created_at, row.id) for row in rows)
+    _store(snapshot, await run_analytics(build_snapshot, *donation_arrays(df), now), watermark)
+    db.commit()
+    return snapshot
+
+
+async def get_insight_snapshot(db: Session, donor_id: UUID, now: datetime) -> Optional[Tuple[InsightAggregates, Dict[str, Any]]]:
+    """
+    A donor's aggregates and own-donation insight sections as of `now`.
+
+    The snapshot is rebuilt from raw donations when missing, when it has no
+    watermark yet, or when its donation count disagrees with donor_totals
+    (a donation was never folded in), and its sections are recomputed from
+    the stored aggregates once `valid_until` has passed. Returns None for
+    donors without donations.
+    """
+    snapshot = db.query(UserInsightSnapshot).filter(UserInsightSnapshot.donor_id == donor_id).first()
+    donation_count = db.query(DonorTotal.donation_count).filter(DonorTotal.donor_id == donor_id).scalar() or 0
+
+    if snapshot is None or snapshot.last_donation_at is None or snapshot.donation_count != donation_count:
+        snapshot = await rebuild_snapshot(db, donor_id, now)
+        if snapshot is None:
+            return None
+    elif utc_nanos(now) >= snapshot.valid_until:
+        _store(snapshot, await run_analytics(refresh_snapshot, snapshot.aggregates, now))
+        db.commit()
+
+    return aggregates_from_dict(snapshot.aggregates), snapshot.insights
+
+
+async def apply_donation_to_snapshot(db: Session, donation: Donation, project: Project, now: datetime):
+    """
+    Fold a committed, completed donation into its donor's snapshot.
+
+    Donors without a snapshot are skipped; theirs is built on first read.
+    So is a donation at or before the snapshot's watermark, which a rebuild
+    already included.
+    """
+    snapshot = db.query(UserInsightSnapshot).filter(
+        UserInsightSnapshot.donor_id == donation.donor_id
+    ).with_for_update().first()
+    if snapshot is None or snapshot.last_donation_at is None or is_folded(snapshot, donation.created_at, donation.id):
+        db.rollback()
+        return
+
+    _store(snapshot, await run_analytics(
+        fold_snapshot,
+        snapshot.aggregates,
+        donation.amount,
+        pd.Timestamp(donation.created_at).tz_convert('UTC').value,
+        project.category,
+        str(project.id),
+        now
+    ), (donation.created_at, donation.id))
+    db.commit()
@@ -0,0 +1,584 @@
+import bisect
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+import numpy as np
+import pandas as pd
+
+RECENT_ACTIVITY_DAYS = 90
+MONTHLY_TREND_MONTHS = 6
+
+IMPACT_WEIGHTS = {
+    'total_amount': 0.3,
+    'consistency': 0.25,
+    'diversity': 0.2,
+    'recent_activity': 0.15,
+    'generosity': 0.1
+}
+
+
+@dataclass
+class InsightAggregates:
+    """
+    Everything the insight sections are derived from, computed in one pass
+    over a donor's completed donations.
+
+    Timestamps are UTC epoch nanoseconds and months are counted from
+    1970-01, so month boundaries are UTC month boundaries.
+    """
+    donation_count: int
+    total_amount: np.float64
+    largest_donation: np.float64
+    first_donation: int
+    last_donation: int
+    categories: List[str]
+    category_totals: np.ndarray
+    months: np.ndarray
+    month_totals: np.ndarray
+    month_counts: np.ndarray
+    month_category_totals: np.ndarray
+    month_category_counts: np.ndarray
+    recent_donations: np.ndarray
+    project_ids: List[Any]
+
+
+def month_code(moment: datetime) -> int:
+    return (moment.year - 1970) * 12 + moment.month - 1
+
+
+def month_label(code: int) -> str:
+    return f"{1970 + code // 12}-{code % 12 + 1:02d}"
+
+
+def utc_nanos(moment: datetime) -> int:
+    """Epoch nanoseconds of a naive datetime read as UTC."""
+    return pd.Timestamp(moment, tz='UTC').value
+
+
+def aggregate_donations(
+    amount: np.ndarray,
+    created_at: np.ndarray,
+    category: Sequence[str],
+    project_id: Sequence[Any],
+    now: datetime
+) -> InsightAggregates:
+    """
+    Reduce raw donation columns to InsightAggregates.
+
+    amount is float64, created_at int64 UTC epoch nanoseconds. Only
+    timestamps inside the recent activity window of `now` are kept.
+    """
+    amount = np.asarray(amount, dtype=np.float64)
+    created_at = np.asarray(created_at, dtype=np.int64)
+
+    category_codes, categories = pd.factorize(np.asarray(category, dtype=object), sort=True)
+    month_of = created_at.view('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+    months, month_index = np.unique(month_of, return_inverse=True)
+
+    n_categories = len(categories)
+    cell = month_index * n_categories + category_codes
+    cells = len(months) * n_categories
+    month_category_totals = np.bincount(cell, weights=amount, minlength=cells).reshape(len(months), n_categories)
+    month_category_counts = np.bincount(cell, minlength=cells).reshape(len(months), n_categories)
+
+    recent_since = utc_nanos(now - timedelta(days=RECENT_ACTIVITY_DAYS))
+
+    return InsightAggregates(
+        donation_count=len(amount),
+        total_amount=amount.sum(),
+        largest_donation=amount.max(),
+        first_donation=int(created_at.min()),
+        last_donation=int(created_at.max()),
+        categories=list(categories),
+        category_totals=np.bincount(category_codes, weights=amount, minlength=n_categories),
+        months=months,
+        month_totals=np.bincount(month_index, weights=amount, minlength=len(months)),
+        month_counts=np.bincount(month_index, minlength=len(months)),
+        month_category_totals=month_category_totals,
+        month_category_counts=month_category_counts,
+        recent_donations=np.sort(created_at[created_at >= recent_since]),
+        project_ids=list(pd.unique(np.asarray(project_id, dtype=object)))
+    )
+
+
+def aggregate_frame(df: pd.DataFrame, now: datetime) -> InsightAggregates:
+    """
+    Aggregate a DataFrame built by DonationAnalytics._donations_to_dataframe.
+    """
+    return aggregate_donations(
+        df['amount'].to_numpy(dtype=np.float64),
+        df['created_at'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+        df['category'].to_numpy(),
+        df['project_id'].to_numpy(),
+        now
+    )
+
+
+def top_categories(aggregates: InsightAggregates, limit: int = 3) -> List[str]:
+    """Categories with the highest totals; ties keep alphabetical order."""
+    order = sorted(range(len(aggregates.categories)), key=lambda i: aggregates.category_totals[i], reverse=True)
+    return [aggregates.categories[i] for i in order[:limit]]
+
+
+def category_distribution(aggregates: InsightAggregates) -> Dict[str, float]:
+    """Percentage of the total donated going to each category."""
+    total_donated = aggregates.category_totals.sum()
+
+    distribution = {}
+    for category, amount in zip(aggregates.categories, aggregates.category_totals):
+        percentage = (amount / total_donated) * 100
+        distribution[category] = round(percentage, 2)
+
+    return dict(sorted(distribution.items(), key=lambda x: x[1], reverse=True))
+
+
+def most_supported_category(aggregates: InsightAggregates, now: datetime) -> Dict[str, Any]:
+    """Most supported category this month and its growth over last month."""
+    current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    current_code = month_code(current_month)
+    previous_code = month_code((current_month - timedelta(days=1)).replace(day=1))
+
+    current_rows = aggregates.months >= current_code
+    if not current_rows.any():
+        most_supported = int(np.argmax(aggregates.category_totals))
+        top_total = aggregates.category_totals[most_supported]
+        total_all_time = aggregates.total_amount
+        percentage = (top_total / total_all_time * 100) if total_all_time > 0 else 0
+
+        return {
+            "category": aggregates.categories[most_supported],
+            "percentage": round(float(percentage), 2),
+            "growth_percentage": 0.0,
+            "total_donated": round(float(top_total), 2)
+        }
+
+    current_totals = aggregates.month_category_totals[current_rows].sum(axis=0)
+    present = aggregates.month_category_counts[current_rows].sum(axis=0) > 0
+    most_supported = int(np.argmax(np.where(present, current_totals, -np.inf)))
+    top_total = current_totals[most_supported]
+    current_total = aggregates.month_totals[current_rows].sum()
+    percentage = (top_total / current_total * 100) if current_total > 0 else 0
+
+    previous_rows = aggregates.months == previous_code
+    previous_amount = aggregates.month_category_totals[previous_rows, most_supported].sum()
+    if previous_amount == 0:
+        growth = 100.0 if top_total > 0 else 0.0
+    else:
+        growth = ((top_total - previous_amount) / previous_amount) * 100
+
+    return {
+        "category": aggregates.categories[most_supported],
+        "percentage": round(float(percentage), 2),
+        "growth_percentage": round(float(growth), 2),
+        "total_donated": round(float(top_total), 2)
+    }
+
+
+def frequency_trend(aggregates: InsightAggregates) -> Dict[str, Any]:
+    """Trend of the number of donations per active month."""
+    monthly_counts = aggregates.month_counts
+
+    if len(monthly_counts) < 2:
+        return {
+            "trend": "stable",
+            "change_percentage": 0,
+            "average_monthly_donations": round(monthly_counts[0] if len(monthly_counts) == 1 else 0, 2)
+        }
+
+    # one point per active month, so the fit is cheap; np.polyfit is kept
+    # because its rounding decides ties in the rounded change_percentage
+    x = np.arange(len(monthly_counts))
+    y = monthly_counts
+
+    slope = np.polyfit(x, y, 1)[0]
+    avg_frequency = np.mean(y)
+
+    if avg_frequency == 0:
+        change_percentage = 0
+    else:
+        change_percentage = (slope / avg_frequency) * 100
+
+    trend = "increasing" if slope > 0.1 else "decreasing" if slope < -0.1 else "stable"
+
+    return {
+        "trend": trend,
+        "change_percentage": round(change_percentage, 2),
+        "average_monthly_donations": round(avg_frequency, 2)
+    }
+
+
+def impact_score(aggregates: InsightAggregates, now: datetime) -> Dict[str, Any]:
+    """Weighted impact score from amount, consistency, diversity, recency and generosity."""
+    recent_since = utc_nanos(now - timedelta(days=RECENT_ACTIVITY_DAYS))
+    recent_count = len(aggregates.recent_donations) - np.searchsorted(aggregates.recent_donations, recent_since)
+
+    factors = {
+        'total_amount': min(aggregates.total_amount / 10, 100),  # Normalize: $10 = 1 point
+        'consistency': min(len(aggregates.months) * 15, 100),  # 15 points per month
+        'diversity': min(len(aggregates.categories) * 25, 100),  # 25 points per category
+        'recent_activity': min(int(recent_count) * 20, 100),
+        'generosity': min(aggregates.total_amount / aggregates.donation_count * 2, 100)  # $50 average = 100 points
+    }
+
+    total_score = sum(factors[factor] * weight for factor, weight in IMPACT_WEIGHTS.items())
+
+    if total_score >= 80:
+        level = "Champion"
+    elif total_score >= 60:
+        level = "Supporter"
+    elif total_score >= 40:
+        level = "Contributor"
+    elif total_score >= 20:
+        level = "Starter"
+    else:
+        level = "Beginner"
+
+    return {
+        "score": round(total_score),
+        "level": level,
+        "factors": {k: round(v, 2) for k, v in factors.items()}
+    }
+
+
+def monthly_trends(aggregates: InsightAggregates) -> List[Dict[str, Any]]:
+    """Totals for the last active months."""
+    totals = np.round(aggregates.month_totals, 2)
+
+    return [{
+        "month": month_label(int(month)),
+        "total_donated": float(total),
+        "donation_count": int(count),
+        "average_donation": float(total / count) if count > 0 else 0
+    } for month, total, count in zip(aggregates.months, totals, aggregates.month_counts)][-MONTHLY_TREND_MONTHS:]
+
+
+def donation_summary(aggregates: InsightAggregates) -> Dict[str, Any]:
+    """Overall totals and the first and last donation times."""
+    return {
+        "total_donated": round(aggregates.total_amount, 2),
+        "total_donations": aggregates.donation_count,
+        "average_donation": round(aggregates.total_amount / aggregates.donation_count, 2),
+        "largest_donation": round(aggregates.largest_donation, 2),
+        "first_donation": pd.Timestamp(aggregates.first_donation, tz='UTC').isoformat(),
+        "last_donation": pd.Timestamp(aggregates.last_donation, tz='UTC').isoformat()
+    }
+
+
+def compute_insights(aggregates: InsightAggregates, now: datetime) -> Dict[str, Any]:
+    """
+    Every insight section that depends only on the donor's own donations.
+
+    `now` is the naive local time the month and recency windows are taken
+    from, read as UTC.
+    """
+    return {
+        "category_distribution": category_distribution(aggregates),
+        "most_supported_category": most_supported_category(aggregates, now),
+        "donation_frequency_trend": frequency_trend(aggregates),
+        "user_impact_score": impact_score(aggregates, now),
+        "monthly_trends": monthly_trends(aggregates),
+        "donation_summary": donation_summary(aggregates)
+    }
+
+
+def add_donation(aggregates: InsightAggregates, amount: float, created_at: int, category: str, project_id: Any, now: datetime) -> InsightAggregates:
+    """
+    Fold one more donation into existing aggregates.
+
+    Totals are running sums, so they can differ in the last bits from
+    aggregate_donations() over the same history.
+    """
+    categories = list(aggregates.categories)
+    category_totals = aggregates.category_totals
+    month_category_totals = aggregates.month_category_totals
+    month_category_counts = aggregates.month_category_counts
+    if category not in categories:
+        column = bisect.bisect_left(categories, category)
+        categories.insert(column, category)
+        category_totals = np.insert(category_totals, column, 0.0)
+        month_category_totals = np.insert(month_category_totals, column, 0.0, axis=1)
+        month_category_counts = np.insert(month_category_counts, column, 0, axis=1)
+    column = categories.index(category)
+
+    month = int(np.datetime64(created_at, 'ns').astype('datetime64[M]').astype(np.int64))
+    months = aggregates.months
+    month_totals = aggregates.month_totals
+    month_counts = aggregates.month_counts
+    row = int(np.searchsorted(months, month))
+    if row == len(months) or months[row] != month:
+        months = np.insert(months, row, month)
+        month_totals = np.insert(month_totals, row, 0.0)
+        month_counts = np.insert(month_counts, row, 0)
+        month_category_totals = np.insert(month_category_totals, row, 0.0, axis=0)
+        month_category_counts = np.insert(month_category_counts, row, 0, axis=0)
+
+    category_totals = category_totals.copy()
+    month_totals = month_totals.copy()
+    month_counts = month_counts.copy()
+    month_category_totals = month_category_totals.copy()
+    month_category_counts = month_category_counts.copy()
+    category_totals[column] += amount
+    month_totals[row] += amount
+    month_counts[row] += 1
+    month_category_totals[row, column] += amount
+    month_category_counts[row, column] += 1
+
+    recent_since = utc_nanos(now - timedelta(days=RECENT_ACTIVITY_DAYS))
+    recent = aggregates.recent_donations[aggregates.recent_donations >= recent_since]
+    if created_at >= recent_since:
+        recent = np.insert(recent, int(np.searchsorted(recent, created_at)), created_at)
+
+    project_ids = list(aggregates.project_ids)
+    if project_id not in project_ids:
+        project_ids.append(project_id)
+
+    return InsightAggregates(
+        donation_count=aggregates.donation_count + 1,
+        total_amount=np.float64(aggregates.total_amount + amount),
+        largest_donation=max(aggregates.largest_donation, np.float64(amount)),
+        first_donation=min(aggregates.first_donation, created_at),
+        last_donation=max(aggregates.last_donation, created_at),
+        categories=categories,
+        category_totals=category_totals,
+        months=months,
+        month_totals=month_totals,
+        month_counts=month_counts,
+        month_category_totals=month_category_totals,
+        month_category_counts=month_category_counts,
+        recent_donations=recent,
+        project_ids=project_ids
+    )
+
+
+def insights_valid_until(aggregates: InsightAggregates, now: datetime) -> int:
+    """
+    UTC epoch nanoseconds at which sections computed at `now` go stale: the
+    next month boundary, or when a recent donation leaves the recent window.
+    """
+    next_month = (now.replace(day=1, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=32)).replace(day=1)
+    valid_until = utc_nanos(next_month)
+
+    recent_since = utc_nanos(now - timedelta(days=RECENT_ACTIVITY_DAYS))
+    recent = aggregates.recent_donations[aggregates.recent_donations >= recent_since]
+    if len(recent):
+        window = RECENT_ACTIVITY_DAYS * 86400 * 1_000_000_000
+        valid_until = min(valid_until, int(recent[0]) + window)
+    return valid_until
+
+
+def aggregates_to_dict(aggregates: InsightAggregates) -> Dict[str, Any]:
+    """JSON-serialisable form of InsightAggregates."""
+    return {
+        "donation_count": aggregates.donation_count,
+        "total_amount": float(aggregates.total_amount),
+        "largest_donation": float(aggregates.largest_donation),
+        "first_donation": aggregates.first_donation,
+        "last_donation": aggregates.last_donation,
+        "categories": list(aggregates.categories),
+        "category_totals": aggregates.category_totals.tolist(),
+        "months": aggregates.months.tolist(),
+        "month_totals": aggregates.month_totals.tolist(),
+        "month_counts": aggregates.month_counts.tolist(),
+        "month_category_totals": aggregates.month_category_totals.tolist(),
+        "month_category_counts": aggregates.month_category_counts.tolist(),
+        "recent_donations": aggregates.recent_donations.tolist(),
+        "project_ids": [str(project_id) for project_id in aggregates.project_ids]
+    }
+
+
+def aggregates_from_dict(data: Dict[str, Any]) -> InsightAggregates:
+    n_categories = len(data["categories"])
+    return InsightAggregates(
+        donation_count=data["donation_count"],
+        total_amount=np.float64(data["total_amount"]),
+        largest_donation=np.float64(data["largest_donation"]),
+        first_donation=data["first_donation"],
+        last_donation=data["last_donation"],
+        categories=list(data["categories"]),
+        category_totals=np.asarray(data["category_totals"], dtype=np.float64),
+        months=np.asarray(data["months"], dtype=np.int64),
+        month_totals=np.asarray(data["month_totals"], dtype=np.float64),
+        month_counts=np.asarray(data["month_counts"], dtype=np.int64),
+        month_category_totals=np.asarray(data["month_category_totals"], dtype=np.float64).reshape(-1, n_categories),
+        month_category_counts=np.asarray(data["month_category_counts"], dtype=np.int64).reshape(-1, n_categories),
+        recent_donations=np.asarray(data["recent_donations"], dtype=np.int64),
+        project_ids=[UUID(project_id) for project_id in data["project_ids"]]
+    )
+
+
+def to_builtin(value: Any) -> Any:
+    """Convert NumPy scalars inside computed sections to plain Python values."""
+    if isinstance(value, dict):
+        return {k: to_builtin(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_builtin(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _snapshot(aggregates: InsightAggregates, now: datetime) -> Dict[str, Any]:
+    return {
+        "aggregates": aggregates_to_dict(aggregates),
+        "insights": to_builtin(compute_insights(aggregates, now)),
+        "donation_count": aggregates.donation_count,
+        "valid_until": insights_valid_until(aggregates, now)
+    }
+
+
+def build_snapshot(
+    amount: np.ndarray,
+    created_at: np.ndarray,
+    category_codes: np.ndarray,
+    categories: Sequence[str],
+    project_codes: np.ndarray,
+    project_ids: Sequence[str],
+    now: datetime
+) -> Dict[str, Any]:
+    """
+    Aggregates, sections and expiry for a donor, as plain JSON values.
+
+    Takes factorized columns so the arguments stay compact when this runs
+    in the analytics process pool.
+    """
+    aggregates = aggregate_donations(
+        amount,
+        created_at,
+        np.asarray(categories, dtype=object)[category_codes],
+        np.asarray(project_ids, dtype=object)[project_codes],
+        now
+    )
+    return _snapshot(aggregates, now)
+
+
+def refresh_snapshot(aggregates: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Recompute the sections of stored aggregates as of `now`."""
+    return _snapshot(aggregates_from_dict(aggregates), now)
+
+
+def fold_snapshot(aggregates: Dict[str, Any], amount: float, created_at: int, category: str, project_id: str, now: datetime) -> Dict[str, Any]:
+    """Add one donation to stored aggregates and recompute the sections."""
+    return _snapshot(add_donation(aggregates_from_dict(aggregates), amount, created_at, category, UUID(project_id), now), now)
+
+
+def aggregate_donor_batch(
+    starts: np.ndarray,
+    amount: np.ndarray,
+    created_at: np.ndarray,
+    category: Sequence[str],
+    project_id: Sequence[Any],
+    now: datetime
+) -> List[InsightAggregates]:
+    """
+    InsightAggregates for many donors at once.
+
+    Rows are grouped by donor, donor i owning rows starts[i]:starts[i + 1].
+    Month, category and month x category totals of every donor are reduced
+    in grouped passes that accumulate in row order like aggregate_donations()
+    does, so both give identical aggregates; only slicing the results apart
+    is done per donor.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    amount = np.asarray(amount, dtype=np.float64)
+    created_at = np.asarray(created_at, dtype=np.int64)
+    n_donors = len(starts) - 1
+    if n_donors <= 0:
+        return []
+    lengths = np.diff(starts)
+    donor_of = np.repeat(np.arange(n_donors), lengths)
+
+    category_codes, categories = pd.factorize(np.asarray(category, dtype=object), sort=True)
+    month_of = created_at.view('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+    first_month = int(month_of.min())
+    n_months = int(month_of.max()) - first_month + 1
+    n_categories = len(categories)
+
+    # one key per (donor, month, category) cell, sorted in that order
+    key = (donor_of * n_months + (month_of - first_month)) * n_categories + category_codes
+    cells, cell_index = np.unique(key, return_inverse=True)
+    cell_totals = np.bincount(cell_index, weights=amount, minlength=len(cells))
+    cell_counts = np.bincount(cell_index, minlength=len(cells))
+    cell_category = cells % n_categories
+    cell_month = (cells // n_categories) % n_months + first_month
+    cell_starts = np.searchsorted(cells // (n_categories * n_months), np.arange(n_donors + 1))
+
+    donor_months, month_group = np.unique(donor_of * n_months + (month_of - first_month), return_inverse=True)
+    month_totals = np.bincount(month_group, weights=amount, minlength=len(donor_months))
+    month_counts = np.bincount(month_group, minlength=len(donor_months))
+    month_starts = np.searchsorted(donor_months // n_months, np.arange(n_donors + 1))
+    donor_categories, category_group = np.unique(donor_of * n_categories + category_codes, return_inverse=True)
+    category_totals = np.bincount(category_group, weights=amount, minlength=len(donor_categories))
+    category_starts = np.searchsorted(donor_categories // n_categories, np.arange(n_donors + 1))
+
+    largest = np.maximum.reduceat(amount, starts[:-1])
+    first = np.minimum.reduceat(created_at, starts[:-1])
+    last = np.maximum.reduceat(created_at, starts[:-1])
+
+    recent_since = utc_nanos(now - timedelta(days=RECENT_ACTIVITY_DAYS))
+    recent = created_at >= recent_since
+    recent_order = np.lexsort((created_at[recent], donor_of[recent]))
+    recent_times = created_at[recent][recent_order]
+    recent_starts = np.searchsorted(donor_of[recent][recent_order], np.arange(n_donors + 1))
+
+    # first occurrence of each (donor, project) pair, in row order
+    project_codes, projects = pd.factorize(np.asarray(project_id, dtype=object))
+    pairs = donor_of * max(len(projects), 1) + project_codes
+    _, first_rows = np.unique(pairs, return_index=True)
+    first_rows.sort()
+    pair_starts = np.searchsorted(donor_of[first_rows], np.arange(n_donors + 1))
+    projects = np.asarray(projects, dtype=object)
+
+    batch = []
+    for donor in range(n_donors):
+        c0, c1 = cell_starts[donor], cell_starts[donor + 1]
+        m0, m1 = month_starts[donor], month_starts[donor + 1]
+        k0, k1 = category_starts[donor], category_starts[donor + 1]
+        months = donor_months[m0:m1] % n_months + first_month
+        codes = donor_categories[k0:k1] % n_categories
+        month_category_totals = np.zeros((m1 - m0, k1 - k0))
+        month_category_counts = np.zeros((m1 - m0, k1 - k0), dtype=np.int64)
+        cell_rows = np.searchsorted(months, cell_month[c0:c1])
+        cell_columns = np.searchsorted(codes, cell_category[c0:c1])
+        month_category_totals[cell_rows, cell_columns] = cell_totals[c0:c1]
+        month_category_counts[cell_rows, cell_columns] = cell_counts[c0:c1]
+
+        batch.append(InsightAggregates(
+            donation_count=int(lengths[donor]),
+            total_amount=amount[starts[donor]:starts[donor + 1]].sum(),
+            largest_donation=largest[donor],
+            first_donation=int(first[donor]),
+            last_donation=int(last[donor]),
+            categories=[categories[code] for code in codes],
+            category_totals=category_totals[k0:k1],
+            months=months,
+            month_totals=month_totals[m0:m1],
+            month_counts=month_counts[m0:m1],
+            month_category_totals=month_category_totals,
+            month_category_counts=month_category_counts,
+            recent_donations=recent_times[recent_starts[donor]:recent_starts[donor + 1]],
+            project_ids=list(projects[project_codes[first_rows[pair_starts[donor]:pair_starts[donor + 1]]]])
+        ))
+    return batch
+
+
+def build_snapshot_batch(
+    starts: np.ndarray,
+    amount: np.ndarray,
+    created_at: np.ndarray,
+    category_codes: np.ndarray,
+    categories: Sequence[str],
+    project_codes: np.ndarray,
+    project_ids: Sequence[str],
+    now: datetime
+) -> List[Dict[str, Any]]:
+    """build_snapshot() for every donor of a batch, in donor order."""
+    batch = aggregate_donor_batch(
+        starts,
+        amount,
+        created_at,
+        np.asarray(categories, dtype=object)[category_codes],
+        np.asarray(project_ids, dtype=object)[project_codes],
+        now
+    )
+    return [_snapshot(aggregates, now) for aggregates in batch]
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+from hiero_sdk_python import Client, AccountId, PrivateKey, Hbar, AccountCreateTransaction, Network, TransferTransaction, CryptoGetAccountBalanceQuery, TransactionId
+from hiero_sdk_python.crypto.public_key import PublicKey
+from api.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SUCCESS = 22
+
+
+@dataclass
+class LedgerReceipt:
+    transaction_id: str
+    status: int
+    account_id: Optional[str] = None
+
+
+class LedgerBackend(ABC):
+    """
+    The ledger operations the donation platform relies on.
+
+    Transaction IDs are exchanged in SDK string form (`0.0.x@seconds.nanos`).
+    """
+
+    @abstractmethod
+    async def create_account(self, public_key: PublicKey, initial_balance_hbar: float, memo: str) -> str:
+        """Create an account owned by public_key and return its account ID."""
+
+    @abstractmethod
+    async def get_balance(self, account_id: str) -> float:
+        """Return the HBAR balance of an account."""
+
+    @abstractmethod
+    async def submit_transfer(
+        self,
+        sender_id: str,
+        recipient_id: str,
+        amount_tinybars: int,
+        sender_key: PrivateKey,
+        memo: Optional[str] = None
+    ) -> str:
+        """Submit an HBAR transfer without waiting for consensus and return its transaction ID."""
+
+    @abstractmethod
+    async def get_receipts(self, transaction_ids: List[str]) -> Dict[str, Union[LedgerReceipt, Exception]]:
+        """
+        Receipts of those transactions that have already reached consensus.
+
+        Must not wait for consensus: transactions still pending are left out
+        and the caller asks again later.
+        """
+
+
+async def get_hedera_client() -> Client:
+    """
+    Get configured Hedera client for testnet or mainnet.
+    """
+    try:
+        network = settings.HEDERA_NETWORK.lower()
+        client = Client(Network(network='testnet' if network == 'testnet' else 'mainnet'))
+
+        account_id = AccountId.from_string(settings.HEDERA_OPERATOR_ID)
+        operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
+
+        # Debug the actual key type
+        pub_key = operator_key.public_key()
+        logger.debug(f"Setting operator with ID: {account_id}")
+        logger.debug(f"Operator key type: {type(pub_key)}")
+        logger.debug(f"Operator public key: {pub_key}")
+
+        client.set_operator(account_id, operator_key)
+        return client
+
+    except ValueError as e:
+        logger.error(f"Invalid Hedera configuration: {str(e)}")
+        raise ValueError(f"Invalid Hedera configuration: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_hedera_client: {type(e).__name__}: {str(e)}")
+        raise ValueError(f"Failed to initialize Hedera client: {type(e).__name__}: {str(e)}")
+
+
+def _submit_transaction(transaction, client: Client) -> TransactionId:
+    """
+    Submit a frozen, signed transaction without waiting for its receipt.
+
+    Mirrors Transaction.execute() up to the point where it would block on
+    TransactionGetReceiptQuery, so the calling thread is released as soon as
+    the node has accepted the transaction (precheck).
+
+    hiero-sdk-python has no public submit-only call, so this uses the private
+    Transaction._execute; the SDK is pinned to an exact version in
+    requirements.txt for that reason and this must be re-checked on upgrade.
+    """
+    if not transaction.is_signed_by(client.operator_private_key.public_key()):
+        transaction.sign(client.operator_private_key)
+
+    transaction._execute(client)
+    return transaction.transaction_id
+
+
+class HederaLedger(LedgerBackend):
+    """
+    Ledger backend talking to Hedera consensus nodes through hiero_sdk_python.
+
+    The SDK is blocking, so every call runs on the default executor. Receipts
+    are read from the mirror node instead, whose lookups are plain async HTTP.
+    """
+
+    async def create_account(self, public_key: PublicKey, initial_balance_hbar: float, memo: str) -> str:
+        client = await get_hedera_client()
+        loop = asyncio.get_event_loop()
+
+        def sync_create_account():
+            operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
+
+            transaction = (
+                AccountCreateTransaction()
+                .set_key(public_key)
+                .set_initial_balance(Hbar(initial_balance_hbar))
+                .set_account_memo(memo)
+                .freeze_with(client)
+                .sign(operator_key)
+            )
+
+            receipt = transaction.execute(client)
+            logger.debug(f"Account create transaction submitted: {receipt.transaction_id}")
+            logger.debug(f"Transaction receipt status: {receipt.status}")
+
+            if receipt.status != SUCCESS:
+                raise ValueError(f"Account creation failed with status: {receipt.status}")
+
+            # Check if account was created successfully
+            if receipt.account_id is None:
+                raise ValueError(f"Account creation failed. Status code: {receipt.status}")
+
+            return str(receipt.account_id)
+
+        return await loop.run_in_executor(None, sync_create_account)
+
+    async def get_balance(self, account_id: str) -> float:
+        client = await get_hedera_client()
+        loop = asyncio.get_event_loop()
+
+        def sync_get_balance():
+            balance_query = CryptoGetAccountBalanceQuery().set_account_id(AccountId.from_string(account_id))
+            balance_result = balance_query.execute(client)
+            return float(balance_result.hbars.to_hbars())
+
+        return await loop.run_in_executor(None, sync_get_balance)
+
+    async def submit_transfer(
+        self,
+        sender_id: str,
+        recipient_id: str,
+        amount_tinybars: int,
+        sender_key: PrivateKey,
+        memo: Optional[str] = None
+    ) -> str:
+        client = await get_hedera_client()
+        loop = asyncio.get_event_loop()
+
+        def sync_submit():
+            transaction = (
+                TransferTransaction()
+                .add_hbar_transfer(AccountId.from_string(sender_id), -amount_tinybars)
+                .add_hbar_transfer(AccountId.from_string(recipient_id), amount_tinybars)
+            )
+            if memo:
+                transaction.set_transaction_memo(memo)
+            transaction.freeze_with(client).sign(sender_key)
+
+            return str(_submit_transaction(transaction, client))
+
+        return await loop.run_in_executor(None, sync_submit)
+
+    async def get_receipts(self, transaction_ids: List[str]) -> Dict[str, Union[LedgerReceipt, Exception]]:
+        from api.v1.services.hedera import get_mirror_receipts
+        return await get_mirror_receipts(transaction_ids)
+
+
+_ledger: Optional[LedgerBackend] = None
+
+
+def get_ledger() -> LedgerBackend:
+    """
+    Get the ledger backend selected by LEDGER_BACKEND ("hedera" or "fake").
+    """
+    global _ledger
+    if _ledger is None:
+        if settings.LEDGER_BACKEND == "fake":
+            from api.v1.services.fake_ledger import get_fake_ledger
+            _ledger = get_fake_ledger()
+        else:
+            _ledger = HederaLedger()
+    return _ledger
+
+
+def set_ledger(ledger: Optional[LedgerBackend]):
+    """
+    Replace the active ledger backend, e.g. with a FakeLedger in tests.
+    """
+    global _ledger
+    _ledger = ledger
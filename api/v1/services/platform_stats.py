@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import time
+import uuid
+from sqlalchemy import distinct, func, select, true
+from sqlalchemy.orm import Session
+from api.utils.redis_utils import redis_client
+from api.utils.settings import settings
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+from api.v1.services.donor_counters import HLL_STANDARD_ERROR, approximate_distinct_donors
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "platform_stats"
+LOCK_KEY = f"{STATS_KEY}:lock"
+# longer than the query ever takes, so the lock outlives its holder only on a crash
+LOCK_TTL = 10
+LOCK_WAIT = 2.0
+LOCK_POLL = 0.05
+RECENT_DAYS = 7
+
+_local_lock = asyncio.Lock()
+
+
+def compute_platform_stats(db: Session, now: Optional[datetime] = None, count_donors: bool = True) -> Dict[str, Any]:
+    """
+    Platform-wide donation and project counts in a single statement.
+
+    Recent counts cover the RECENT_DAYS days before `now`. Without
+    `count_donors` the distinct donor count, the costliest part, is skipped.
+    """
+    now = now or datetime.now(timezone.utc)
+    since = now - timedelta(days=RECENT_DAYS)
+
+    donations = select(
+        func.count(Donation.id).label("total_donations"),
+        func.coalesce(func.sum(Donation.amount), 0).label("total_amount"),
+        func.count(Donation.id).filter(Donation.created_at >= since).label("recent_donations"),
+        *([func.count(distinct(Donation.donor_id)).label("total_donors")] if count_donors else [])
+    ).where(Donation.status == DonationStatus.completed).subquery()
+
+    projects = select(
+        func.count(Project.id).filter(Project.verified == True).label("total_projects"),
+        func.count(Project.id).filter(Project.created_at >= since).label("recent_projects")
+    ).subquery()
+
+    row = db.execute(select(donations, projects).select_from(donations.join(projects, true()))).one()
+    stats = dict(row._mapping)
+    stats["total_amount"] = float(stats["total_amount"])
+    stats["average_donation"] = round(stats["total_amount"] / stats["total_donations"], 2) if stats["total_donations"] else 0
+    stats["computed_at"] = now.isoformat()
+    return stats
+
+
+async def get_platform_stats(db: Session) -> Dict[str, Any]:
+    """
+    Cached platform stats, recomputed at most once per PLATFORM_STATS_CACHE_TTL.
+
+    On a miss, one request per process (an asyncio lock) and one process
+    across workers (a Redis lock) runs the query; the others wait up to
+    LOCK_WAIT seconds for its result before computing it themselves.
+    """
+    cached = await redis_client.get_json(STATS_KEY)
+    if cached is not None:
+        return cached
+
+    async with _local_lock:
+        cached = await redis_client.get_json(STATS_KEY)
+        if cached is not None:
+            return cached
+
+        token = uuid.uuid4().hex
+        if await redis_client.acquire_lock(LOCK_KEY, token, LOCK_TTL):
+            try:
+                return await _refresh(db)
+            finally:
+                await redis_client.release_lock(LOCK_KEY, token)
+
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL)
+            cached = await redis_client.get_json(STATS_KEY)
+            if cached is not None:
+                return cached
+        logger.warning("Timed out waiting for platform stats from another worker; computing them here")
+        return await _refresh(db)
+
+
+async def _refresh(db: Session) -> Dict[str, Any]:
+    donors = await approximate_distinct_donors("platform")
+    stats = compute_platform_stats(db, count_donors=donors is None)
+    if donors is not None:
+        stats["total_donors"] = donors
+    stats["total_donors_error"] = None if donors is None else HLL_STANDARD_ERROR
+    await redis_client.set_json(STATS_KEY, stats, settings.PLATFORM_STATS_CACHE_TTL)
+    return stats
@@ -3,6 +3,7 @@ from api.v1.models.project import Project
 from api.v1.models.donation import Donation
 from api.v1.schemas.project import ProjectCreate, ProjectResponse, ProjectDB
 from api.v1.services.hedera import create_project_wallet, verify_transaction
+from api.v1.services.recommender import queue_project_index_update
 from datetime import datetime, timezone
 from uuid import UUID
 from typing import List
@@ -11,6 +12,9 @@ import uuid
 from PIL import Image
 import io
 from fastapi import HTTPException
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Remove UPLOAD_DIR since we're storing in DB
 ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
@@ -33,7 +37,9 @@ def project_to_response(project: Project) -> ProjectResponse:
         image_mime_type=project.image_mime_type,
         created_by=project.created_by,
         created_at=project.created_at,
-        updated_at=project.updated_at
+        updated_at=project.updated_at,
+        forecast_completion_date=project.forecast_completion_date,
+        forecast_probability=project.forecast_probability
     )
 
 async def optimize_image(image_file) -> tuple[bytes, str]:
@@ -89,8 +95,21 @@ async def create_project(db: Session, project: ProjectCreate, user_id: UUID, ima
     db.add(new_project)
     db.commit()
     db.refresh(new_project)
+    if new_project.verified:
+        await _index_project(new_project)
     return project_to_response(new_project)
 
+async def _index_project(project: Project):
+    """
+    Make a verified project recommendable; the project itself is already
+    saved, so a failure is logged and picked up by the next index rebuild.
+    """
+    try:
+        # applied to the saved index by the Celery worker
+        queue_project_index_update(project.id)
+    except Exception as e:
+        logger.error(f"Failed to add project {project.id} to the recommendation index: {str(e)}")
+
 async def upload_project_image(db: Session, project_id: UUID, image_file, user_id: UUID) -> ProjectResponse:
     """
     Upload and optimize image for a project (store in database).
@@ -151,6 +170,7 @@ async def verify_project(db: Session, project_id: UUID) -> ProjectResponse:
     project.verified = True
     db.commit()
     db.refresh(project)
+    await _index_project(project)
     return project_to_response(project)
 
 async def get_project_transparency(db: Session, project_id: UUID) -> dict:
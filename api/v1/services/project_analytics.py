@@ -0,0 +1,100 @@
+from typing import Any, Dict, List
+from uuid import UUID
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session
+from api.utils.redis_utils import redis_client
+from api.utils.settings import settings
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.services.donor_counters import HLL_STANDARD_ERROR, approximate_distinct_donors
+
+RECENT_DONATIONS = 10
+
+
+def recent_project_donations(db: Session, project_id: UUID, limit: int = RECENT_DONATIONS) -> List[Any]:
+    """The project's latest completed donations, newest first, read from ix_donations_project_created_at."""
+    return db.query(
+        Donation.id,
+        Donation.amount,
+        Donation.created_at,
+        Donation.donor_id
+    ).filter(
+        Donation.project_id == project_id,
+        Donation.status == DonationStatus.completed
+    ).order_by(Donation.created_at.desc()).limit(limit).all()
+
+
+def project_donation_totals(db: Session, project_id: UUID, count_donors: bool = True) -> Dict[str, Any]:
+    """
+    Amount raised, donation count and (with `count_donors`) distinct donors
+    of a project in one aggregate query.
+    """
+    row = db.query(
+        func.coalesce(func.sum(Donation.amount), 0).label("total_raised"),
+        func.count(Donation.id).label("donation_count"),
+        *([func.count(distinct(Donation.donor_id)).label("donor_count")] if count_donors else [])
+    ).filter(
+        Donation.project_id == project_id,
+        Donation.status == DonationStatus.completed
+    ).one()
+    totals = {"total_raised": float(row.total_raised), "donation_count": row.donation_count}
+    if count_donors:
+        totals["donor_count"] = row.donor_count
+    return totals
+
+
+def _totals_cache_key(project_id: UUID, latest: Any) -> str:
+    # a completed donation is only ever added, so the newest one identifies the totals
+    return f"project_analytics:{project_id}:{latest.created_at.isoformat()}:{latest.id}"
+
+
+async def build_project_analytics(db: Session, project: Any) -> Dict[str, Any]:
+    """
+    Funding statistics and the latest donations of a project.
+
+    Totals are cached for PROJECT_ANALYTICS_CACHE_TTL seconds (0 disables
+    it) under a key that includes the newest donation, so a new donation
+    is reflected immediately without invalidating anything. The donor count
+    comes from the HyperLogLog counters when they are reconciled.
+    """
+    recent = recent_project_donations(db, project.id)
+
+    totals = None
+    cache_key = None
+    if recent and settings.PROJECT_ANALYTICS_CACHE_TTL:
+        cache_key = _totals_cache_key(project.id, recent[0])
+        totals = await redis_client.get_json(cache_key)
+    if totals is None:
+        if recent:
+            donors = await approximate_distinct_donors("project", project.id)
+            totals = project_donation_totals(db, project.id, count_donors=donors is None)
+            if donors is not None:
+                totals["donor_count"] = donors
+            totals["donor_count_error"] = None if donors is None else HLL_STANDARD_ERROR
+        else:
+            totals = {"total_raised": 0.0, "donation_count": 0, "donor_count": 0, "donor_count_error": None}
+        if cache_key:
+            await redis_client.set_json(cache_key, totals, settings.PROJECT_ANALYTICS_CACHE_TTL)
+
+    total_raised = totals["total_raised"]
+    donation_count = totals["donation_count"]
+    average_donation = total_raised / donation_count if donation_count > 0 else 0
+    completion_percentage = (total_raised / project.target_amount * 100) if project.target_amount > 0 else 0
+
+    return {
+        "project_id": str(project.id),
+        "project_title": project.title,
+        "total_raised": round(total_raised, 2),
+        "donation_count": donation_count,
+        "average_donation": round(average_donation, 2),
+        "completion_percentage": round(completion_percentage, 2),
+        "donor_count": totals["donor_count"],
+        "donor_count_error": totals.get("donor_count_error"),
+        "recent_donations": [
+            {
+                "amount": donation.amount,
+                "date": donation.created_at.isoformat(),
+                "donor_id": str(donation.donor_id)
+            }
+            for donation in recent
+        ]
+    }
@@ -0,0 +1,305 @@
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+import io
+import logging
+import threading
+import time
+import uuid
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
+from sqlalchemy.orm import Session
+from api.v1.models.project import Project
+from api.v1.models.recommender_index import RecommenderIndex
+
+logger = logging.getLogger(__name__)
+
+# hashed feature spaces are stateless, so a project can be added to the
+# index without refitting anything; only the idf weights come from a rebuild
+CATEGORY_FEATURES = 2 ** 8
+LOCATION_FEATURES = 2 ** 10
+TEXT_FEATURES = 2 ** 18
+
+FEATURE_WEIGHTS = {
+    'category': 1.0,
+    'location': 0.3,
+    'text': 0.6,
+    'progress': 0.2,
+    'recency': 0.2
+}
+RECENCY_HALF_LIFE_DAYS = 90
+
+PROJECT_COLUMNS = (
+    Project.id,
+    Project.title,
+    Project.description,
+    Project.category,
+    Project.location,
+    Project.amount_raised,
+    Project.target_amount,
+    Project.created_at,
+    Project.verified
+)
+
+_category_hasher = FeatureHasher(n_features=CATEGORY_FEATURES, input_type='string', alternate_sign=False)
+_location_hasher = FeatureHasher(n_features=LOCATION_FEATURES, input_type='string', alternate_sign=False)
+_text_vectorizer = HashingVectorizer(
+    n_features=TEXT_FEATURES, alternate_sign=False, norm=None, stop_words='english'
+)
+
+
+def _project_features(projects: Sequence[Any], tfidf: TfidfTransformer, now: datetime) -> sp.csr_matrix:
+    """
+    One L2-normalised row per project, so a dot product of two rows is
+    their cosine similarity.
+    """
+    categories = _category_hasher.transform([[project.category or ""] for project in projects])
+    locations = _location_hasher.transform([[(project.location or "").strip().lower()] for project in projects])
+    text = normalize(tfidf.transform(_text_vectorizer.transform(
+        [f"{project.title} {project.description}" for project in projects]
+    )))
+
+    progress = np.array([
+        min((project.amount_raised or 0) / project.target_amount, 1.0) if project.target_amount else 0.0
+        for project in projects
+    ])
+    age_days = np.array([max((now - project.created_at).total_seconds() / 86400, 0.0) for project in projects])
+    recency = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+    features = sp.hstack([
+        categories * FEATURE_WEIGHTS['category'],
+        locations * FEATURE_WEIGHTS['location'],
+        text * FEATURE_WEIGHTS['text'],
+        sp.csr_matrix(progress[:, None] * FEATURE_WEIGHTS['progress']),
+        sp.csr_matrix(recency[:, None] * FEATURE_WEIGHTS['recency'])
+    ], format='csr')
+    return normalize(features)
+
+
+class ProjectIndex:
+    """
+    Precomputed feature matrix of projects for content-based recommendations.
+
+    Rows are never removed in place: replaced or unverified projects are
+    masked out with `active` until the next full build compacts the matrix.
+    A column-major copy lets scoring touch only the columns a donor's
+    preference vector uses; it is rebuilt on load rather than persisted.
+    """
+
+    def __init__(self, features: sp.csr_matrix, project_ids: List[str], active: np.ndarray, tfidf: TfidfTransformer, built_at: datetime):
+        self.features = features.astype(np.float32)
+        self.columns = self.features.tocsc()
+        self.project_ids = project_ids
+        self.active = active
+        self.tfidf = tfidf
+        self.built_at = built_at
+        self.row_of = {project_id: row for row, project_id in enumerate(project_ids)}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['columns'], state['row_of']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.columns = self.features.tocsc()
+        self.row_of = {project_id: row for row, project_id in enumerate(self.project_ids)}
+
+    @classmethod
+    def build(cls, projects: Sequence[Any], now: Optional[datetime] = None) -> "ProjectIndex":
+        now = now or datetime.now(timezone.utc)
+        projects = [project for project in projects if project.verified]
+        tfidf = TfidfTransformer()
+        tfidf.fit(_text_vectorizer.transform([f"{project.title} {project.description}" for project in projects] or [""]))
+
+        if projects:
+            features = _project_features(projects, tfidf, now)
+        else:
+            features = sp.csr_matrix((0, CATEGORY_FEATURES + LOCATION_FEATURES + TEXT_FEATURES + 2))
+        return cls(features, [str(project.id) for project in projects], np.ones(len(projects), dtype=bool), tfidf, now)
+
+    def __len__(self) -> int:
+        return int(self.active.sum())
+
+    def upsert(self, project: Any, now: Optional[datetime] = None):
+        """Add or replace a project; unverified projects are only masked out."""
+        project_id = str(project.id)
+        row = self.row_of.get(project_id)
+        if row is not None:
+            self.active[row] = False
+        if not project.verified:
+            return
+
+        row = self._append(_project_features([project], self.tfidf, now or datetime.now(timezone.utc)), project_id)
+        self.row_of[project_id] = row
+
+    def _append(self, features: sp.csr_matrix, project_id: str) -> int:
+        self.features = sp.vstack([self.features, features.astype(np.float32)], format='csr')
+        self.columns = self.features.tocsc()
+        self.project_ids.append(project_id)
+        self.active = np.append(self.active, True)
+        return len(self.project_ids) - 1
+
+    def preference(self, project_ids: Iterable[Any]) -> Optional[np.ndarray]:
+        """Mean feature vector of the projects a donor supported, if any are indexed."""
+        rows = [self.row_of[str(project_id)] for project_id in project_ids if str(project_id) in self.row_of]
+        if not rows:
+            return None
+        return np.asarray(self.features[rows].mean(axis=0)).ravel()
+
+    def recommend(self, donated_project_ids: Sequence[Any], limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Top `limit` active projects by cosine similarity to the donor's
+        preference vector, excluding projects already donated to.
+        """
+        preference = self.preference(donated_project_ids)
+        if preference is None:
+            return []
+
+        used = np.flatnonzero(preference)
+        scores = np.asarray(self.columns[:, used] @ preference[used], dtype=np.float64)
+        scores[~self.active] = -np.inf
+        for project_id in donated_project_ids:
+            row = self.row_of.get(str(project_id))
+            if row is not None:
+                scores[row] = -np.inf
+
+        candidates = int(np.isfinite(scores).sum())
+        if not candidates:
+            return []
+        limit = min(limit, candidates)
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.project_ids[row], float(scores[row])) for row in top]
+
+
+INDEX_NAME = "projects"
+# how often a worker that finds no saved index asks for a build
+REBUILD_REQUEST_INTERVAL = 300
+
+_lock = threading.Lock()
+_index: Optional[ProjectIndex] = None
+_index_version: Optional[int] = None
+_rebuild_requested_at: Optional[float] = None
+
+
+def save_project_index(db: Session, index: ProjectIndex) -> int:
+    """
+    Store the index in the database, where every worker reads it, and
+    commit. Returns the new version.
+    """
+    buffer = io.BytesIO()
+    joblib.dump(index, buffer)
+    row = db.query(RecommenderIndex).filter(RecommenderIndex.name == INDEX_NAME).with_for_update().first()
+    if row is None:
+        row = RecommenderIndex(name=INDEX_NAME, version=0)
+        db.add(row)
+    row.version += 1
+    row.data = buffer.getvalue()
+    row.built_at = index.built_at
+    db.commit()
+    return row.version
+
+
+def load_project_index(db: Session, for_update: bool = False) -> Optional[Tuple[ProjectIndex, int]]:
+    """The saved index and its version, or None; `for_update` locks it until the transaction ends."""
+    query = db.query(RecommenderIndex.data, RecommenderIndex.version).filter(RecommenderIndex.name == INDEX_NAME)
+    row = (query.with_for_update() if for_update else query).first()
+    if row is None:
+        return None
+    return joblib.load(io.BytesIO(row.data)), row.version
+
+
+def project_index_saved(db: Session) -> bool:
+    return db.query(RecommenderIndex.id).filter(RecommenderIndex.name == INDEX_NAME).first() is not None
+
+
+def rebuild_project_index(db: Session) -> ProjectIndex:
+    """
+    Build the index from every verified project and save it.
+
+    Also refreshes funding progress and recency, which incremental updates
+    only record as of when each project was added.
+    """
+    global _index, _index_version
+
+    projects = db.query(*PROJECT_COLUMNS).filter(Project.verified == True).all()
+    index = ProjectIndex.build(projects)
+    version = save_project_index(db, index)
+    with _lock:
+        _index, _index_version = index, version
+    logger.info(f"Rebuilt project index with {len(index)} projects")
+    return index
+
+
+def _request_rebuild():
+    global _rebuild_requested_at
+
+    now = time.monotonic()
+    if _rebuild_requested_at is not None and now - _rebuild_requested_at < REBUILD_REQUEST_INTERVAL:
+        return
+    _rebuild_requested_at = now
+    try:
+        from api.utils.celery_app import rebuild_project_index_task
+        rebuild_project_index_task.apply_async(kwargs={"only_missing": True}, retry=False)
+    except Exception as e:
+        logger.error(f"Failed to queue a project index build: {str(e)}")
+
+
+def get_project_index(db: Session) -> Optional[ProjectIndex]:
+    """
+    The process-wide copy of the saved index, reloaded when another worker
+    has saved a newer version. When none is saved yet, a build is queued
+    on the Celery worker and None is returned meanwhile; building it takes
+    too long to ever happen in a request.
+    """
+    global _index, _index_version
+
+    version = db.query(RecommenderIndex.version).filter(RecommenderIndex.name == INDEX_NAME).scalar()
+    if version is None:
+        _request_rebuild()
+        return None
+    if _index is not None and version == _index_version:
+        return _index
+
+    with _lock:
+        if version != _index_version:
+            loaded = load_project_index(db)
+            if loaded is not None:
+                _index, _index_version = loaded
+    return _index
+
+
+def queue_project_index_update(project_id: Any):
+    """
+    Have the Celery worker add a created or (un)verified project to the
+    saved index, so the request does not load and save the whole index.
+    """
+    from api.utils.celery_app import update_project_index_task
+    update_project_index_task.apply_async(args=[[str(project_id)]], retry=False)
+
+
+def update_projects_in_index(db: Session, project_ids: Sequence[Any]) -> int:
+    """
+    Apply created or (un)verified projects to the saved index with a single
+    load and save, holding a row lock on it meanwhile so concurrent updates
+    are not lost. Without a saved index there is nothing to update, and the
+    next build includes the projects. Returns the number of projects applied.
+    """
+    loaded = load_project_index(db, for_update=True)
+    if loaded is None:
+        db.rollback()
+        logger.info(f"No project index saved yet; {len(project_ids)} projects are added by the next build")
+        return 0
+
+    index, _ = loaded
+    projects = db.query(*PROJECT_COLUMNS).filter(
+        Project.id.in_([uuid.UUID(str(project_id)) for project_id in project_ids])
+    ).all()
+    for project in projects:
+        index.upsert(project)
+    save_project_index(db, index)
+    return len(projects)
@@ -0,0 +1,203 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List
+from uuid import UUID
+from sqlalchemy import DateTime, String, and_, cast, exists, func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.donation_rollup import DonationDailyRollup
+from api.v1.models.project import Project
+from api.v1.services.donor_counters import HLL_STANDARD_ERROR, approximate_distinct_donors_between
+
+SCOPES = ("platform", "project", "category")
+BUCKETS = ("day", "week", "month")
+
+
+def utc_day(moment: datetime) -> date:
+    return moment.astimezone(timezone.utc).date()
+
+
+def platform_shard(donor_id: UUID) -> str:
+    """
+    scope_key of the platform rollup row a donor's donations go to: the
+    last hex digit of the donor id, so concurrent donations by different
+    donors mostly update different rows, and each donor is counted in
+    one shard per day.
+    """
+    return str(donor_id)[-1]
+
+
+def record_donation_in_rollups(db: Session, donor_id: UUID, project_id: UUID, category: str, amount: float, created_at: datetime):
+    """
+    Add a completed donation to the platform, project and category rollups
+    of its UTC day. The platform rollup is split over the shards of
+    platform_shard.
+
+    Must run before the donation itself is flushed, so the donor is only
+    counted once per day and scope. Issues an upsert in the caller's
+    transaction without committing. Two same-day donations by one donor
+    committed concurrently can both count the donor; rebuild_daily_rollups
+    repairs that.
+    """
+    day = utc_day(created_at)
+    day_start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    same_day = and_(
+        Donation.donor_id == donor_id,
+        Donation.status == DonationStatus.completed,
+        Donation.created_at >= day_start,
+        Donation.created_at < day_start + timedelta(days=1)
+    )
+    seen = db.execute(select(
+        exists().where(same_day),
+        exists().where(same_day, Donation.project_id == project_id),
+        exists().where(same_day, Donation.project_id == Project.id, Project.category == category)
+    )).one()
+
+    now = datetime.now(timezone.utc)
+    statement = insert(DonationDailyRollup).values([
+        {
+            "id": uuid.uuid4(),
+            "scope": scope,
+            "scope_key": scope_key,
+            "day": day,
+            "total_amount": amount,
+            "donation_count": 1,
+            "donor_count": 0 if already_counted else 1,
+            "created_at": now,
+            "updated_at": now
+        }
+        for scope, scope_key, already_counted in zip(SCOPES, (platform_shard(donor_id), str(project_id), category), seen)
+    ])
+    db.execute(statement.on_conflict_do_update(
+        constraint="uq_donation_daily_rollups_scope_day",
+        set_={
+            "total_amount": DonationDailyRollup.total_amount + statement.excluded.total_amount,
+            "donation_count": DonationDailyRollup.donation_count + 1,
+            "donor_count": DonationDailyRollup.donor_count + statement.excluded.donor_count,
+            "updated_at": now
+        }
+    ))
+
+
+def bucket_start(bucket: str, day: date) -> date:
+    """First day of the day, ISO week or month containing `day`, as date_trunc gives."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(bucket: str, start: date) -> date:
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def get_timeseries(db: Session, scope: str, scope_key: str, bucket: str, start: date, end: date) -> List[Dict[str, Any]]:
+    """
+    Donation totals per day, week or month between `start` and `end`
+    (inclusive, widened to whole buckets), with empty buckets filled in.
+
+    Distinct donors only add up within a day, so coarser buckets report
+    donor_days (the sum of daily distinct donors) and no distinct_donors;
+    fill_distinct_donors adds those where the donor counters allow.
+
+    Raises:
+        ValueError: For an unknown scope or bucket, or end before start.
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"scope must be one of {', '.join(SCOPES)}")
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+    if end < start:
+        raise ValueError("end must not be before start")
+    start = bucket_start(bucket, start)
+
+    # on a plain timestamp, so the session time zone cannot shift buckets
+    truncated = func.date_trunc(bucket, cast(DonationDailyRollup.day, DateTime)).label("bucket_start")
+    rows = db.query(
+        truncated,
+        func.sum(DonationDailyRollup.total_amount).label("total_amount"),
+        func.sum(DonationDailyRollup.donation_count).label("donation_count"),
+        func.sum(DonationDailyRollup.donor_count).label("donor_days")
+    ).filter(
+        DonationDailyRollup.scope == scope,
+        # platform totals add up the shards
+        DonationDailyRollup.scope_key == scope_key if scope != "platform" else true(),
+        DonationDailyRollup.day >= start,
+        DonationDailyRollup.day <= end
+    ).group_by(truncated).all()
+    by_bucket = {row.bucket_start.date(): row for row in rows}
+
+    points = []
+    current = start
+    while current <= end:
+        row = by_bucket.get(current)
+        donor_days = int(row.donor_days) if row else 0
+        points.append({
+            "bucket_start": current,
+            "total_amount": round(row.total_amount, 2) if row else 0.0,
+            "donation_count": int(row.donation_count) if row else 0,
+            "donor_days": donor_days,
+            "distinct_donors": donor_days if bucket == "day" else None
+        })
+        current = _next_bucket(bucket, current)
+    return points
+
+
+async def fill_distinct_donors(points: List[Dict[str, Any]], scope: str, bucket: str, end: date):
+    """
+    Set distinct_donors of the week or month buckets of a platform
+    timeseries from the union of the HyperLogLog day counters, with its
+    error in distinct_donors_error. Buckets the counters cannot answer,
+    and other scopes, keep distinct_donors None.
+    """
+    if scope != "platform" or bucket == "day":
+        return
+    for point in points:
+        last_day = min(_next_bucket(bucket, point["bucket_start"]) - timedelta(days=1), end)
+        donors = await approximate_distinct_donors_between(point["bucket_start"], last_day)
+        if donors is not None:
+            point["distinct_donors"] = donors
+            point["distinct_donors_error"] = HLL_STANDARD_ERROR
+
+
+def rebuild_daily_rollups(db: Session) -> int:
+    """
+    Recompute every rollup row from completed donations.
+
+    Used to backfill the table and to repair drift; returns the number of rows.
+    """
+    day = func.date(func.timezone("UTC", Donation.created_at))
+    columns = ["id", "scope", "scope_key", "day", "total_amount", "donation_count", "donor_count", "created_at", "updated_at"]
+    scopes = {
+        # as platform_shard
+        "platform": func.right(cast(Donation.donor_id, String), 1),
+        "project": cast(Donation.project_id, String),
+        "category": Project.category
+    }
+
+    db.query(DonationDailyRollup).delete(synchronize_session=False)
+    for scope, scope_key in scopes.items():
+        query = select(
+            func.gen_random_uuid(),
+            literal(scope),
+            scope_key,
+            day,
+            func.sum(Donation.amount),
+            func.count(Donation.id),
+            func.count(func.distinct(Donation.donor_id)),
+            func.now(),
+            func.now()
+        ).select_from(Donation).where(
+            Donation.status == DonationStatus.completed
+        ).group_by(scope_key, day)
+        if scope == "category":
+            query = query.join(Project, Project.id == Donation.project_id)
+        db.execute(insert(DonationDailyRollup).from_select(columns, query))
+    db.commit()
+    return db.query(DonationDailyRollup).count()
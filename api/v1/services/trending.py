@@ -0,0 +1,135 @@
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+import logging
+import math
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, case, exists, func, select, update
+from sqlalchemy.orm import Session
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+# A project's trending score is the sum over its donations of
+# weight * 0.5 ** (age / half-life). Every score decays by the same factor,
+# so the order never changes between donations. Each project therefore stores
+# log(sum of weight * exp(DECAY_RATE * (donated_at - EPOCH))). That value
+# only changes when a donation is added, and its column index gives the
+# top-k directly.
+HALF_LIFE_HOURS = 72
+DECAY_RATE = math.log(2) / (HALF_LIFE_HOURS * 3600)
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# a donation counts log1p(amount) for volume, so whales do not dominate,
+# plus DONOR_WEIGHT when it is the donor's first to the project
+DONOR_WEIGHT = 1.0
+
+
+def donation_weight(amount: float, new_donor: bool) -> float:
+    return math.log1p(max(amount, 0.0)) + (DONOR_WEIGHT if new_donor else 0.0)
+
+
+def log_contribution(weight: float, donated_at: datetime) -> float:
+    return math.log(weight) + DECAY_RATE * (donated_at - EPOCH).total_seconds()
+
+
+def trending_score(log_score: Optional[float], now: Optional[datetime] = None) -> float:
+    """The decayed score as of `now` from a stored log score."""
+    if log_score is None:
+        return 0.0
+    now = now or datetime.now(timezone.utc)
+    return math.exp(log_score - DECAY_RATE * (now - EPOCH).total_seconds())
+
+
+def record_trending_donation(db: Session, project_id: UUID, donor_id: UUID, amount: float, donated_at: datetime):
+    """
+    Add a completed donation to its project's trending score in O(1).
+
+    Must run before the donation is flushed, so that earlier donations
+    alone decide whether the donor is new to the project. Updates the
+    project row in the caller's transaction and does not commit.
+    """
+    new_donor = not db.execute(select(exists().where(
+        Donation.donor_id == donor_id,
+        Donation.project_id == project_id,
+        Donation.status == DonationStatus.completed
+    ))).scalar()
+
+    weight = donation_weight(amount, new_donor)
+    if weight <= 0:
+        return
+    contribution = log_contribution(weight, donated_at)
+    current = Project.trending_log_score
+    # log(exp(current) + exp(contribution)), evaluated without overflow
+    db.execute(update(Project).where(Project.id == project_id).values(trending_log_score=case(
+        (current.is_(None), contribution),
+        else_=func.greatest(current, contribution) + func.ln(1 + func.exp(-func.abs(current - contribution)))
+    )))
+
+
+def log_scores(project_ids: np.ndarray, donor_ids: np.ndarray, amounts: np.ndarray, seconds: np.ndarray) -> pd.Series:
+    """
+    Log trending score per project from donations in chronological order,
+    with `seconds` since EPOCH.
+    """
+    frame = pd.DataFrame({"project": project_ids, "donor": donor_ids})
+    new_donor = ~frame.duplicated(["project", "donor"]).to_numpy()
+    weights = np.log1p(np.maximum(amounts, 0.0)) + np.where(new_donor, DONOR_WEIGHT, 0.0)
+
+    keep = weights > 0
+    frame = frame[keep].assign(x=np.log(weights[keep]) + DECAY_RATE * seconds[keep])
+    grouped = frame.groupby("project")["x"]
+    peak = grouped.transform("max")
+    return grouped.max() + np.log(np.exp(frame["x"] - peak).groupby(frame["project"]).sum())
+
+
+def rebuild_trending_scores(db: Session, chunk_size: int = 10_000) -> int:
+    """
+    Recompute every project's trending score from completed donations.
+
+    Used to backfill the column and to repair updates lost to failed
+    transactions; returns the number of projects with a score.
+    """
+    rows = db.query(Donation.project_id, Donation.donor_id, Donation.amount, Donation.created_at).filter(
+        Donation.status == DonationStatus.completed
+    ).order_by(Donation.created_at).all()
+
+    scores = pd.Series(dtype=np.float64)
+    if rows:
+        project_ids, donor_ids, amounts, created_at = zip(*rows)
+        seconds = (pd.to_datetime(pd.Series(created_at), utc=True) - pd.Timestamp(EPOCH)).dt.total_seconds().to_numpy()
+        scores = log_scores(
+            np.asarray([str(project_id) for project_id in project_ids], dtype=object),
+            np.asarray([str(donor_id) for donor_id in donor_ids], dtype=object),
+            np.asarray(amounts, dtype=np.float64),
+            seconds
+        )
+
+    db.execute(update(Project).values(trending_log_score=None))
+    statement = update(Project.__table__).where(Project.__table__.c.id == bindparam("project_id")).values(
+        trending_log_score=bindparam("score")
+    )
+    items = list(scores.items())
+    for start in range(0, len(items), chunk_size):
+        db.execute(statement, [
+            {"project_id": UUID(project_id), "score": float(score)}
+            for project_id, score in items[start:start + chunk_size]
+        ])
+    db.commit()
+    logger.info(f"Rebuilt trending scores for {len(items)} projects")
+    return len(items)
+
+
+def get_trending_projects(db: Session, limit: int = 10, category: Optional[str] = None) -> List[Tuple[Any, float]]:
+    """Top verified projects by trending score, read from ix_projects_trending."""
+    query = db.query(Project).filter(
+        Project.verified == True,
+        Project.trending_log_score.isnot(None)
+    )
+    if category:
+        query = query.filter(Project.category == category)
+    projects = query.order_by(Project.trending_log_score.desc()).limit(limit).all()
+
+    now = datetime.now(timezone.utc)
+    return [(project, trending_score(project.trending_log_score, now)) for project in projects]
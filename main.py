@@ -2,8 +2,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
+import logging
 from api.utils.settings import settings
 from api.v1.routes import api_version_one
+from api.v1.services.hedera import get_upstream_health
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -24,6 +28,36 @@ app.mount("/static/projects/", StaticFiles(directory="static"), name="static")
 
 app.include_router(api_version_one)
 
+if settings.LEDGER_BACKEND == "fake":
+    from api.v1.services.fake_ledger import get_fake_ledger
+    # expose the in-process mirror node stand-in for load-test tooling
+    app.mount("/mirror", get_fake_ledger().mirror_app, name="fake_mirror")
+
+if settings.ANALYTICS_EXECUTION_MODE == "process":
+    from api.v1.services.analytics_pool import get_pool, shutdown_pool
+
+    @app.on_event("startup")
+    def start_analytics_pool():
+        get_pool()
+
+    @app.on_event("shutdown")
+    def stop_analytics_pool():
+        shutdown_pool()
+
+@app.on_event("startup")
+def schedule_backfills():
+    # never built in a request; a fresh deployment gets them from the worker
+    try:
+        from api.utils.celery_app import rebuild_donor_totals_task, rebuild_project_index_task
+        rebuild_donor_totals_task.apply_async(kwargs={"only_if_incomplete": True}, retry=False)
+        rebuild_project_index_task.apply_async(kwargs={"only_missing": True}, retry=False)
+    except Exception as e:
+        logger.error(f"Failed to queue startup backfills: {str(e)}")
+
 @app.get("/")
 def healthcheck():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/health/upstreams")
+def upstream_healthcheck():
+    return get_upstream_health()
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+""" Scores every completed donation for anomalies and stores the flags.
+Safe to rerun; donations already flagged are skipped.
+"""
+import sys, os
+import warnings
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.v1.models import *
+from api.db.database import get_db
+from api.v1.services.anomaly import backfill_anomalies
+
+db = next(get_db())
+
+counts = backfill_anomalies(db)
+for kind, count in counts.items():
+    print(f"{kind}: {count}")
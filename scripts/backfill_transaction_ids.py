@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+""" Fills the canonical transaction ID columns for donations stored before
+they existed and rewrites tx_hash into mirror node format.
+"""
+import sys, os
+import logging
+import warnings
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.v1.models import *
+from api.db.database import get_db
+from api.utils.transaction_id import parse_transaction_id
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+db = next(get_db())
+
+updated = 0
+skipped = 0
+last_id = None
+while True:
+    query = db.query(Donation).filter(
+        Donation.tx_hash.isnot(None),
+        Donation.tx_valid_start_seconds.is_(None)
+    )
+    if last_id is not None:
+        query = query.filter(Donation.id > last_id)
+    donations = query.order_by(Donation.id).limit(BATCH_SIZE).all()
+    if not donations:
+        break
+
+    for donation in donations:
+        try:
+            parsed = parse_transaction_id(donation.tx_hash)
+        except ValueError:
+            logger.warning(f"Skipping donation {donation.id} with unparseable tx_hash {donation.tx_hash}")
+            skipped += 1
+            continue
+        donation.tx_hash = parsed.mirror_id
+        donation.tx_payer_account = parsed.payer_account
+        donation.tx_valid_start_seconds = parsed.valid_start_seconds
+        donation.tx_valid_start_nanos = parsed.valid_start_nanos
+        updated += 1
+    last_id = donations[-1].id
+    db.commit()
+
+print(f"Backfilled {updated} donations, skipped {skipped} with unparseable tx_hash")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+""" Micro-benchmarks for the DonationAnalytics and insights engine hot paths.
+
+The insight loading and engine steps run on synthetic donation histories of
+increasing size (drawn with the same distributions as generate_dataset.py).
+The script records the median and best wall time and the peak traced memory.
+
+    python scripts/bench_analytics.py --output bench.json
+    python scripts/bench_analytics.py --baseline bench.json --threshold 0.2
+
+With --baseline, any case whose median time or peak memory grows by more
+than --threshold (a fraction) is reported as a regression and the script
+exits with status 1. --db also times the database-backed paths
+(get_user_insights, percentile, recommendations) against the configured
+database, e.g. one filled by generate_dataset.py.
+"""
+import sys, os
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+import uuid
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.generate_dataset import CATEGORIES, generate_donations, power_law_weights
+from api.v1.services.insights_engine import add_donation, aggregate_frame, compute_insights
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def synthetic_history(rng: np.random.Generator, size: int, projects: int = 200) -> pd.DataFrame:
+    """
+    One donor's history of `size` completed donations over the last two years,
+    shaped like the frame _donations_to_dataframe builds.
+    """
+    end = np.datetime64(datetime.now(timezone.utc).date()) + np.timedelta64(1, "D")
+    start = end - np.timedelta64(730, "D")
+    donations = generate_donations(rng, size, np.ones(1), power_law_weights(rng, projects, 1.2), start, end)
+    project_categories = CATEGORIES[rng.integers(0, len(CATEGORIES), size=projects)]
+    project_ids = np.array([str(uuid.UUID(int=i + 1)) for i in range(projects)])
+
+    return pd.DataFrame({
+        "amount": donations["amount"],
+        # the database stores microseconds
+        "created_at": pd.to_datetime(donations["timestamp"], unit="ns", utc=True).floor("us"),
+        "project_id": project_ids[donations["project"]],
+        "project_title": [f"Project {p}" for p in donations["project"]],
+        "category": project_categories[donations["project"]]
+    })
+
+
+def donation_rows(df: pd.DataFrame) -> list:
+    """
+    Rows as returned by DonationAnalytics._query_user_donations, without the
+    trailing donation id, which the data frame does not use.
+    """
+    return [
+        (row.amount, row.created_at.to_pydatetime(), row.project_id, row.project_title, row.category)
+        for row in df.itertuples(index=False)
+    ]
+
+
+def measure(func, setup=None, repeat: int = 5) -> dict:
+    """
+    Median and best wall time over `repeat` runs plus the peak traced memory
+    of one extra run, after a warm-up call. `setup` builds the call's
+    arguments outside the timing.
+    """
+    setup = setup or (lambda: ())
+    # warm-up run so import and first-call costs are not measured
+    func(*setup())
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def synthetic_cases(analytics, sizes: list, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    cases = {}
+    for size in sizes:
+        df = synthetic_history(rng, size)
+        rows = donation_rows(df)
+        aggregates = aggregate_frame(df, now)
+
+        cases[f"_donations_to_dataframe[{size}]"] = (analytics._donations_to_dataframe, lambda rows=rows: (rows,))
+        cases[f"aggregate_frame[{size}]"] = (aggregate_frame, lambda df=df: (df, now))
+        cases[f"compute_insights[{size}]"] = (compute_insights, lambda aggregates=aggregates: (aggregates, now))
+        cases[f"add_donation[{size}]"] = (
+            add_donation, lambda aggregates=aggregates: (aggregates, 25.0, aggregates.last_donation, "Health", uuid.uuid4(), now)
+        )
+    return cases
+
+
+def recommender_cases(rng: np.random.Generator, projects: int) -> dict:
+    """
+    ProjectIndex scoring over `projects` synthetic verified projects with
+    short generated titles and descriptions.
+    """
+    from types import SimpleNamespace
+    from api.v1.services.recommender import ProjectIndex
+
+    words = np.array([f"word{i}" for i in range(5_000)])
+    locations = np.array([f"City {i}" for i in range(300)])
+    now = datetime.now(timezone.utc)
+    rows = [
+        SimpleNamespace(
+            id=uuid.UUID(int=i + 1),
+            title=" ".join(words[rng.integers(0, len(words), 5)]),
+            description=" ".join(words[rng.integers(0, len(words), 40)]),
+            category=CATEGORIES[rng.integers(0, len(CATEGORIES))],
+            location=locations[rng.integers(0, len(locations))],
+            amount_raised=float(rng.uniform(0, 10_000)),
+            target_amount=10_000.0,
+            created_at=now - timedelta(days=float(rng.uniform(0, 730))),
+            verified=True
+        )
+        for i in range(projects)
+    ]
+    index = ProjectIndex.build(rows, now)
+    donated = [row.id for row in rows[:20]]
+
+    return {
+        f"ProjectIndex.recommend[{projects} projects]": (index.recommend, lambda: (donated, 5)),
+        f"ProjectIndex.upsert[{projects} projects]": (index.upsert, lambda: (rows[0], now))
+    }
+
+
+def forecast_cases(rng: np.random.Generator, projects: int) -> dict:
+    """fit_forecasts over `projects` synthetic projects' window sums."""
+    from api.v1.services.forecast import FIT_WINDOW_DAYS, fit_forecasts
+
+    active_days = rng.integers(1, FIT_WINDOW_DAYS + 1, projects)
+    daily_mean = rng.exponential(50, projects)
+    totals = daily_mean * active_days
+    squares = totals * daily_mean * 3
+    remaining = rng.uniform(-1_000, 10_000, projects)
+
+    return {
+        f"fit_forecasts[{projects} projects]": (fit_forecasts, lambda: (totals, squares, active_days, remaining))
+    }
+
+
+def database_cases(samples: int) -> dict:
+    """
+    End-to-end paths against the configured database for the most active
+    donor and a few donors spread across the activity distribution.
+    """
+    from sqlalchemy import func
+    from api.db.database import get_db
+    from api.v1.models.donation import Donation, DonationStatus
+    from api.v1.services.analytics import DonationAnalytics
+
+    db = next(get_db())
+    analytics = DonationAnalytics(db)
+    counts = db.query(Donation.donor_id, func.count(Donation.id).label("n")).filter(
+        Donation.status == DonationStatus.completed
+    ).group_by(Donation.donor_id).order_by(func.count(Donation.id).desc()).all()
+    if not counts:
+        return {}
+
+    picks = sorted({0, *np.linspace(0, len(counts) - 1, samples).astype(int)})
+    cases = {}
+    for index in picks:
+        donor_id, count = counts[index]
+        label = f"rank {index + 1}, {count} donations"
+        aggregates = aggregate_frame(analytics._donations_to_dataframe(analytics._query_user_donations(donor_id)), datetime.now())
+        cases[f"db:get_user_insights[{label}]"] = (
+            lambda donor_id=donor_id: asyncio.run(analytics.get_user_insights(donor_id)), None
+        )
+        cases[f"db:_calculate_user_percentile[{label}]"] = (
+            lambda donor_id=donor_id: analytics._calculate_user_percentile(donor_id, db), None
+        )
+        cases[f"db:_get_recommended_projects[{label}]"] = (
+            lambda donor_id=donor_id, aggregates=aggregates: asyncio.run(analytics._get_recommended_projects(donor_id, aggregates, db)), None
+        )
+    return cases
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        for metric in ("median_ms", "peak_kib"):
+            if before[metric] and current[metric] > before[metric] * (1 + threshold):
+                change = (current[metric] - before[metric]) / before[metric] * 100
+                regressions.append(f"{name} {metric}: {before[metric]} -> {current[metric]} (+{change:.1f}%)")
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(args) -> int:
+    from api.v1.services.analytics import DonationAnalytics
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cases = synthetic_cases(DonationAnalytics(db=None), sizes, args.seed)
+    if args.projects:
+        cases.update(recommender_cases(np.random.default_rng(args.seed), args.projects))
+        cases.update(forecast_cases(np.random.default_rng(args.seed), args.projects))
+    if args.db:
+        cases.update(database_cases(args.db_samples))
+    if args.filter:
+        cases = {name: case for name, case in cases.items() if args.filter in name}
+
+    results = {}
+    for name, (func, setup) in cases.items():
+        results[name] = measure(func, setup, repeat=args.repeat)
+        print(f"{name:50} {results[name]['median_ms']:>12.3f} ms {results[name]['peak_kib']:>12.1f} KiB")
+
+    report = {
+        "commit": git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DonationAnalytics methods.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated donation history sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--filter", help="Only run cases whose name contains this string")
+    parser.add_argument("--projects", type=int, default=100_000, help="Projects in the recommender index and forecast cases, 0 to skip")
+    parser.add_argument("--db", action="store_true", help="Also benchmark the database-backed paths")
+    parser.add_argument("--db-samples", type=int, default=3, help="Donors sampled across the activity distribution")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown as a fraction, e.g. 0.2 for 20%%")
+    args = parser.parse_args()
+
+    sys.exit(main(args))
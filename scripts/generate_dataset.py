@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+""" Bulk generator for a large, realistic synthetic dataset.
+
+Creates donors, organisation accounts with their organisations, projects
+across categories and donations, then loads them with PostgreSQL COPY in
+chunks. Who donates and which projects receive donations follow power-law
+(Zipf-like) distributions: a few donors and projects account for most of
+the activity, as in production. Donation times follow a yearly season with
+a December peak, a weekly cycle and daytime hours.
+
+The same --seed and sizes always produce the same rows.
+
+    python scripts/generate_dataset.py --users 1000000 --projects 20000 --donations 10000000
+"""
+import sys, os
+import argparse
+import io
+import time
+import uuid
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+CATEGORIES = np.array([
+    "Education", "Health", "Environment", "Water & Sanitation", "Agriculture",
+    "Disaster Relief", "Technology", "Women Empowerment", "Community", "Arts & Culture"
+])
+CATEGORY_WEIGHTS = np.array([0.2, 0.18, 0.12, 0.1, 0.09, 0.08, 0.08, 0.06, 0.05, 0.04])
+LOCATIONS = np.array(["Lagos", "Abuja", "Nairobi", "Accra", "Kampala", "Kigali", "Dakar", "Cape Town", "Addis Ababa", "Cairo"])
+STATUSES = np.array(["completed", "failed", "pending"])
+STATUS_WEIGHTS = np.array([0.97, 0.02, 0.01])
+
+NANOS_PER_SECOND = 1_000_000_000
+
+
+def uuids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """
+    n reproducible version 4 UUID strings.
+    """
+    raw = rng.bytes(16 * n)
+    return np.array([str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4)) for i in range(n)])
+
+
+def power_law_weights(rng: np.random.Generator, n: int, exponent: float) -> np.ndarray:
+    """
+    Selection probabilities proportional to 1 / rank**exponent, with ranks
+    shuffled so that popularity does not follow insertion order.
+    """
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def seasonal_day_weights(days: np.ndarray) -> np.ndarray:
+    """
+    Relative donation volume for each day (datetime64[D]).
+
+    Yearly cycle peaking in late December (giving season), a smaller spring
+    bump, a Giving Tuesday spike and quieter weekends.
+    """
+    day_of_year = (days - days.astype("datetime64[Y]")).astype(np.int64)
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+
+    yearly = 1.0 + 0.35 * np.cos(2 * np.pi * (day_of_year - 355) / 365.25)
+    spring = 0.25 * np.exp(-0.5 * ((day_of_year - 90) / 10) ** 2)
+    giving_tuesday = 1.5 * ((day_of_year >= 331) & (day_of_year <= 336))
+    weekly = np.where(weekday >= 5, 0.8, 1.05)
+
+    weights = (yearly + spring + giving_tuesday) * weekly
+    return weights / weights.sum()
+
+
+def donation_timestamps(rng: np.random.Generator, n: int, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """
+    n donation times (int64 nanoseconds since epoch) drawn from the seasonal day
+    profile, with a daytime-heavy hour of day.
+    """
+    days = np.arange(start.astype("datetime64[D]"), end.astype("datetime64[D]"))
+    day_index = rng.choice(len(days), size=n, p=seasonal_day_weights(days))
+
+    hours = np.clip(rng.normal(14, 4, size=n), 0, 23.999)
+    offset_nanos = (hours * 3600 * NANOS_PER_SECOND).astype(np.int64)
+    day_nanos = days[day_index].astype("datetime64[ns]").astype(np.int64)
+    return day_nanos + offset_nanos + rng.integers(0, NANOS_PER_SECOND, size=n)
+
+
+def generate_donations(
+    rng: np.random.Generator,
+    n: int,
+    donor_weights: np.ndarray,
+    project_weights: np.ndarray,
+    start: np.datetime64,
+    end: np.datetime64
+) -> dict:
+    """
+    Columns for n donations as NumPy arrays: donor and project indices,
+    amount in HBAR, timestamp in epoch nanoseconds and status.
+    """
+    return {
+        "donor": rng.choice(len(donor_weights), size=n, p=donor_weights),
+        "project": rng.choice(len(project_weights), size=n, p=project_weights),
+        # most donations are small, with a long tail of large gifts
+        "amount": np.round(np.clip(rng.lognormal(mean=2.3, sigma=1.1, size=n), 1, 50_000), 2),
+        "timestamp": donation_timestamps(rng, n, start, end),
+        "status": STATUSES[rng.choice(len(STATUSES), size=n, p=STATUS_WEIGHTS)]
+    }
+
+
+def copy_frame(cursor, table: str, frame: pd.DataFrame):
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False, na_rep="")
+    buffer.seek(0)
+    columns = ", ".join(frame.columns)
+    cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def to_timestamps(nanos: np.ndarray) -> pd.Series:
+    return pd.Series(pd.to_datetime(nanos, unit="ns", utc=True))
+
+
+def build_users(rng, count: int, offset: int, prefix: str, role: str, password_hash: str, wallet_base: int, created: np.ndarray) -> pd.DataFrame:
+    index = np.arange(offset, offset + count)
+    return pd.DataFrame({
+        "id": uuids(rng, count),
+        "name": [f"{prefix.title()} {role.title()} {i}" for i in index],
+        "email": [f"{prefix}-{role.lower()}-{i}@example.org" for i in index],
+        "password": password_hash,
+        "role": role,
+        "wallet_address": [f"0.0.{wallet_base + i}" for i in index],
+        "encrypted_private_key": None,
+        "is_verified": True,
+        "created_at": to_timestamps(created),
+        "updated_at": to_timestamps(created)
+    })
+
+
+def main(args):
+    from api.db.database import engine
+    from api.v1.services.auth import pwd_context
+
+    rng = np.random.default_rng(args.seed)
+    start = np.datetime64(args.start)
+    end = np.datetime64(args.end)
+    start_nanos = start.astype("datetime64[ns]").astype(np.int64)
+    span_nanos = end.astype("datetime64[ns]").astype(np.int64) - start_nanos
+    password_hash = pwd_context.hash(args.password)
+
+    connection = engine.raw_connection()
+    cursor = connection.cursor()
+    began = time.perf_counter()
+    try:
+        # donors and organisation accounts
+        donor_ids = []
+        for offset in range(0, args.users, args.chunk_size):
+            count = min(args.chunk_size, args.users - offset)
+            created = start_nanos + rng.integers(0, span_nanos, size=count)
+            frame = build_users(rng, count, offset, args.prefix, "DONOR", password_hash, args.wallet_base, created)
+            copy_frame(cursor, "users", frame)
+            donor_ids.append(frame["id"].to_numpy())
+        donor_ids = np.concatenate(donor_ids) if donor_ids else np.array([], dtype=object)
+        donor_wallets = np.array([f"0.0.{args.wallet_base + i}" for i in range(args.users)])
+
+        org_created = start_nanos + rng.integers(0, span_nanos // 4, size=args.orgs)
+        org_users = build_users(rng, args.orgs, args.users, args.prefix, "ORG", password_hash, args.wallet_base, org_created)
+        copy_frame(cursor, "users", org_users)
+        copy_frame(cursor, "organizations", pd.DataFrame({
+            "id": uuids(rng, args.orgs),
+            "name": [f"{args.prefix.title()} Organisation {i}" for i in range(args.orgs)],
+            "contact_email": org_users["email"],
+            "region": LOCATIONS[rng.integers(0, len(LOCATIONS), size=args.orgs)],
+            "verified": rng.random(args.orgs) < 0.8,
+            "created_by": org_users["id"],
+            "created_at": to_timestamps(org_created),
+            "updated_at": to_timestamps(org_created)
+        }))
+        print(f"Loaded {args.users} donors and {args.orgs} organisations in {time.perf_counter() - began:.1f}s")
+
+        # projects are loaded before donations and their totals, counts and
+        # creation times are patched once all donations are known
+        project_ids = uuids(rng, args.projects)
+        categories = CATEGORIES[rng.choice(len(CATEGORIES), size=args.projects, p=CATEGORY_WEIGHTS)]
+        placeholder_created = to_timestamps(np.full(args.projects, start_nanos))
+        project_wallet_base = args.wallet_base + args.users + args.orgs
+        copy_frame(cursor, "projects", pd.DataFrame({
+            "id": project_ids,
+            "title": [f"{c} project {i}" for i, c in enumerate(categories)],
+            "description": [f"Synthetic {c.lower()} project generated for benchmarking." for c in categories],
+            "category": categories,
+            "target_amount": 0.0,
+            "amount_raised": 0.0,
+            "backers_count": 0,
+            "location": LOCATIONS[rng.integers(0, len(LOCATIONS), size=args.projects)],
+            "verified": rng.random(args.projects) < 0.9,
+            "wallet_address": [f"0.0.{project_wallet_base + i}" for i in range(args.projects)],
+            "created_by": org_users["id"].to_numpy()[rng.integers(0, args.orgs, size=args.projects)],
+            "created_at": placeholder_created,
+            "updated_at": placeholder_created
+        }))
+        connection.commit()
+
+        donor_weights = power_law_weights(rng, args.users, args.donor_exponent)
+        project_weights = power_law_weights(rng, args.projects, args.project_exponent)
+        raised = np.zeros(args.projects)
+        first_donation = np.full(args.projects, np.iinfo(np.int64).max)
+        backer_pairs = []
+
+        loaded = 0
+        for offset in range(0, args.donations, args.chunk_size):
+            count = min(args.chunk_size, args.donations - offset)
+            donations = generate_donations(rng, count, donor_weights, project_weights, start, end)
+            seconds = donations["timestamp"] // NANOS_PER_SECOND
+            # nanos carry the global row number so every transaction ID is unique
+            nanos = np.arange(offset, offset + count)
+            payer = donor_wallets[donations["donor"]]
+
+            completed = donations["status"] == "completed"
+            np.add.at(raised, donations["project"][completed], donations["amount"][completed])
+            np.minimum.at(first_donation, donations["project"], donations["timestamp"])
+            backer_pairs.append(np.unique(donations["project"][completed].astype(np.int64) * args.users + donations["donor"][completed]))
+
+            copy_frame(cursor, "donations", pd.DataFrame({
+                "id": uuids(rng, count),
+                "donor_id": donor_ids[donations["donor"]],
+                "project_id": project_ids[donations["project"]],
+                "amount": donations["amount"],
+                "tx_hash": [f"{p}-{s}-{n:09d}" for p, s, n in zip(payer, seconds, nanos)],
+                "tx_payer_account": payer,
+                "tx_valid_start_seconds": seconds,
+                "tx_valid_start_nanos": nanos,
+                "status": donations["status"],
+                "created_at": to_timestamps(donations["timestamp"]),
+                "updated_at": to_timestamps(donations["timestamp"])
+            }))
+            connection.commit()
+            loaded += count
+            if loaded % (args.chunk_size * 10) == 0 or loaded == args.donations:
+                elapsed = time.perf_counter() - began
+                print(f"Loaded {loaded}/{args.donations} donations ({loaded / elapsed:,.0f} rows/s)")
+
+        pairs = np.unique(np.concatenate(backer_pairs)) if backer_pairs else np.array([], dtype=np.int64)
+        backers = np.bincount(pairs // args.users, minlength=args.projects)
+        no_donations = first_donation == np.iinfo(np.int64).max
+        first_donation[no_donations] = start_nanos + rng.integers(0, span_nanos, size=no_donations.sum())
+        # each project opens up to 30 days before its first donation
+        project_created = np.maximum(first_donation - rng.integers(0, 30 * 86400 * NANOS_PER_SECOND, size=args.projects), start_nanos)
+
+        cursor.execute(
+            "CREATE TEMP TABLE project_totals (id uuid, target_amount float, amount_raised float, "
+            "backers_count integer, created_at timestamptz) ON COMMIT DROP"
+        )
+        copy_frame(cursor, "project_totals", pd.DataFrame({
+            "id": project_ids,
+            "target_amount": np.round(np.maximum(raised * rng.uniform(0.8, 3.0, size=args.projects), 1000), -2),
+            "amount_raised": np.round(raised, 2),
+            "backers_count": backers,
+            "created_at": to_timestamps(project_created)
+        }))
+        cursor.execute(
+            "UPDATE projects SET target_amount = t.target_amount, amount_raised = t.amount_raised, "
+            "backers_count = t.backers_count, created_at = t.created_at, updated_at = t.created_at "
+            "FROM project_totals t WHERE projects.id = t.id"
+        )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+    # tables derived from donations are rebuilt from what was just loaded
+    from api.db.database import get_db
+    from api.v1.services.donor_totals import rebuild_donor_totals
+    from api.v1.services.co_donation import rebuild_project_neighbors
+    from api.v1.services.recommender import rebuild_project_index
+    from api.v1.services.rollups import rebuild_daily_rollups
+    from api.v1.services.donor_counters import reconcile_donor_counters
+    from api.v1.services.trending import rebuild_trending_scores
+    from api.v1.services.forecast import rebuild_project_forecasts
+
+    db = next(get_db())
+    print(f"Rebuilt totals for {rebuild_donor_totals(db)} donors")
+    print(f"Rebuilt {rebuild_daily_rollups(db)} daily rollup rows")
+    print(f"Rebuilt trending scores for {rebuild_trending_scores(db)} projects")
+    print(f"Forecast completion for {rebuild_project_forecasts(db)} projects")
+    print(f"Reconciled donor counters for {reconcile_donor_counters(db)['projects']} projects")
+    print(f"Indexed {len(rebuild_project_index(db))} projects for recommendations")
+    print(f"Rebuilt {rebuild_project_neighbors(db)} co-donation neighbours")
+
+    print(f"Done in {time.perf_counter() - began:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic donation dataset and load it with COPY.")
+    parser.add_argument("--users", type=int, default=100_000, help="Number of donors")
+    parser.add_argument("--orgs", type=int, default=500, help="Number of organisation accounts")
+    parser.add_argument("--projects", type=int, default=5_000)
+    parser.add_argument("--donations", type=int, default=1_000_000)
+    parser.add_argument("--start", default="2023-01-01")
+    parser.add_argument("--end", default=datetime.now(timezone.utc).strftime("%Y-%m-%d"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--donor-exponent", type=float, default=1.1, help="Power-law exponent of donor activity")
+    parser.add_argument("--project-exponent", type=float, default=1.2, help="Power-law exponent of project popularity")
+    parser.add_argument("--prefix", default="synthetic", help="Prefix for generated emails, keeps runs apart")
+    parser.add_argument("--wallet-base", type=int, default=10_000_000, help="First generated account number")
+    parser.add_argument("--password", default="synthetic-password")
+    args = parser.parse_args()
+
+    main(args)
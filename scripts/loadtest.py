@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+""" Async load generator replaying realistic donation traffic against a running API.
+
+Intended to run against the app started with LEDGER_BACKEND=fake and a local
+Postgres, e.g.
+
+    LEDGER_BACKEND=fake uvicorn main:app --port 8000
+    python scripts/loadtest.py --base-url http://localhost:8000 --output loadtest.json
+
+Scenarios:
+    signup_burst    concurrent registrations, each creating a ledger wallet
+    donation_spike  every donor donating to one hot project at once
+    browse          anonymous GET /projects and project detail pages
+    analytics       dashboard refresh for logged in donors
+
+Results are written as JSON with p50/p95/p99 latency, throughput and error
+rate per endpoint. Pass --baseline with an earlier result file to print the
+change per endpoint.
+"""
+import sys, os
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import uuid
+import warnings
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PASSWORD = "loadtest-password"
+SCENARIOS = ["signup_burst", "donation_spike", "browse", "analytics"]
+
+
+def percentile(ordered: list, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+    return ordered[index]
+
+
+class Recorder:
+    """
+    Collects latency and outcome of every request, keyed by endpoint label.
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies[label].append(time.perf_counter() - start)
+            self.statuses[label][type(e).__name__] += 1
+            self.errors[label] += 1
+            return None
+        self.latencies[label].append(time.perf_counter() - start)
+        self.statuses[label][str(response.status_code)] += 1
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label, samples in self.latencies.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            endpoints[label] = {
+                "requests": count,
+                "errors": self.errors[label],
+                "error_rate": round(self.errors[label] / count, 4) if count else 0.0,
+                "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+                "status_codes": dict(self.statuses[label])
+            }
+        return {"elapsed_s": round(elapsed, 3), "endpoints": endpoints}
+
+
+async def run_bounded(concurrency: int, jobs):
+    """
+    Await the coroutines in `jobs` with at most `concurrency` in flight.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(job):
+        async with semaphore:
+            await job
+
+    await asyncio.gather(*(bounded(job) for job in jobs))
+
+
+def new_email(run_id: str, kind: str, index: int) -> str:
+    return f"loadtest+{run_id}-{kind}-{index}@example.com"
+
+
+async def register(client, recorder, email: str, role: str = "donor", label: str = "POST /auth/register"):
+    return await recorder.request(client, label, "POST", "/api/v1/auth/register", json={
+        "name": "Load Test",
+        "email": email,
+        "password": PASSWORD,
+        "role": role
+    })
+
+
+async def login(client, recorder, email: str):
+    response = await recorder.request(client, "POST /auth/login", "POST", "/api/v1/auth/login", json={
+        "email": email,
+        "password": PASSWORD
+    })
+    if response is None or response.status_code != 200:
+        return None
+    return response.json()["access_token"]
+
+
+def mark_verified(emails: list):
+    """
+    Skip the OTP email round trip for load test accounts.
+    """
+    from api.db.database import get_db
+    from api.v1.models.user import User
+
+    db = next(get_db())
+    try:
+        db.query(User).filter(User.email.in_(emails)).update({User.is_verified: True}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+class Fixture:
+    """
+    Accounts and projects shared by the scenarios of one run.
+    """
+
+    def __init__(self):
+        self.donor_tokens = []
+        self.project_ids = []
+        self.hot_project_id = None
+
+
+async def setup(client, args, run_id: str) -> Fixture:
+    recorder = Recorder()
+    fixture = Fixture()
+
+    admin_email = new_email(run_id, "admin", 0)
+    donor_emails = [new_email(run_id, "donor", i) for i in range(args.donors)]
+
+    await register(client, recorder, admin_email, role="admin")
+    await run_bounded(args.concurrency, [register(client, recorder, email) for email in donor_emails])
+    mark_verified([admin_email] + donor_emails)
+
+    admin_token = await login(client, recorder, admin_email)
+    if admin_token is None:
+        raise RuntimeError("Could not log in the load test admin; is the API running with a reachable database?")
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    categories = ["Education", "Health", "Environment", "Water", "Agriculture"]
+    for i in range(args.projects):
+        response = await recorder.request(client, "POST /projects", "POST", "/api/v1/projects/", headers=admin_headers, json={
+            "title": f"Load test project {run_id}-{i}",
+            "description": "Created by scripts/loadtest.py",
+            "category": categories[i % len(categories)],
+            "target_amount": 100000,
+            "location": "Lagos",
+            "verified": True
+        })
+        if response is not None and response.status_code == 200:
+            fixture.project_ids.append(response.json()["id"])
+    if not fixture.project_ids:
+        raise RuntimeError("Could not create any load test project")
+    fixture.hot_project_id = fixture.project_ids[0]
+
+    tokens = []
+    await run_bounded(args.concurrency, [_collect_token(client, recorder, email, tokens) for email in donor_emails])
+    fixture.donor_tokens = tokens
+    return fixture
+
+
+async def _collect_token(client, recorder, email, tokens):
+    token = await login(client, recorder, email)
+    if token is not None:
+        tokens.append(token)
+
+
+async def signup_burst(client, recorder, args, fixture, run_id):
+    emails = [new_email(run_id, "signup", i) for i in range(args.signups)]
+    await run_bounded(args.concurrency, [register(client, recorder, email) for email in emails])
+
+
+async def donation_spike(client, recorder, args, fixture, run_id):
+    rng = random.Random(args.seed)
+
+    async def donate(token):
+        await recorder.request(client, "POST /donations", "POST", "/api/v1/donations/",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"project_id": fixture.hot_project_id, "amount": round(rng.uniform(1, 20), 2)})
+
+    jobs = [donate(token) for _ in range(args.donations_per_donor) for token in fixture.donor_tokens]
+    await run_bounded(args.concurrency, jobs)
+
+
+async def browse(client, recorder, args, fixture, run_id):
+    rng = random.Random(args.seed)
+
+    async def page():
+        await recorder.request(client, "GET /projects", "GET", "/api/v1/projects/")
+        for project_id in rng.sample(fixture.project_ids, min(3, len(fixture.project_ids))):
+            await recorder.request(client, "GET /projects/{id}", "GET", f"/api/v1/projects/{project_id}")
+
+    await run_bounded(args.concurrency, [page() for _ in range(args.page_views)])
+
+
+async def analytics(client, recorder, args, fixture, run_id):
+    rng = random.Random(args.seed)
+
+    async def refresh(token):
+        headers = {"Authorization": f"Bearer {token}"}
+        await asyncio.gather(
+            recorder.request(client, "GET /analytics/user/insights", "GET", "/api/v1/analytics/user/insights", headers=headers),
+            recorder.request(client, "GET /analytics/global/stats", "GET", "/api/v1/analytics/global/stats"),
+            recorder.request(client, "GET /analytics/platform/overview", "GET", "/api/v1/analytics/platform/overview", headers=headers),
+            recorder.request(client, "GET /analytics/categories/top", "GET", "/api/v1/analytics/categories/top"),
+            recorder.request(client, "GET /analytics/project/{id}", "GET", f"/api/v1/analytics/project/{rng.choice(fixture.project_ids)}"),
+        )
+
+    jobs = [refresh(rng.choice(fixture.donor_tokens)) for _ in range(args.dashboard_refreshes)]
+    await run_bounded(args.concurrency, jobs)
+
+
+SCENARIO_FUNCTIONS = {
+    "signup_burst": signup_burst,
+    "donation_spike": donation_spike,
+    "browse": browse,
+    "analytics": analytics
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_comparison(result: dict, baseline: dict):
+    for scenario, data in result["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {}).get("endpoints", {})
+        for label, stats in data["endpoints"].items():
+            before = previous.get(label)
+            if not before:
+                print(f"{scenario:15} {label:35} new")
+                continue
+            change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+            print(
+                f"{scenario:15} {label:35} p95 {before['p95_ms']:>9.1f} -> {stats['p95_ms']:>9.1f} ms ({change:+.1f}%)"
+                f"  errors {before['error_rate']:.2%} -> {stats['error_rate']:.2%}"
+            )
+
+
+async def main(args) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    scenarios = SCENARIOS if args.scenario == "all" else [args.scenario]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        fixture = await setup(client, args, run_id)
+        print(f"Fixture ready: {len(fixture.donor_tokens)} donors, {len(fixture.project_ids)} projects")
+
+        results = {}
+        for name in scenarios:
+            recorder = Recorder()
+            start = time.perf_counter()
+            await SCENARIO_FUNCTIONS[name](client, recorder, args, fixture, run_id)
+            results[name] = recorder.summary(time.perf_counter() - start)
+            print(f"{name}: {sum(s['requests'] for s in results[name]['endpoints'].values())} requests in {results[name]['elapsed_s']}s")
+
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "config": {
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "donors": args.donors,
+            "projects": args.projects,
+            "signups": args.signups,
+            "donations_per_donor": args.donations_per_donor,
+            "page_views": args.page_views,
+            "dashboard_refreshes": args.dashboard_refreshes
+        },
+        "scenarios": results
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay donation platform traffic and report latency per endpoint.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=["all"] + SCENARIOS, default="all")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--donors", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--signups", type=int, default=200)
+    parser.add_argument("--donations-per-donor", type=int, default=3)
+    parser.add_argument("--page-views", type=int, default=500)
+    parser.add_argument("--dashboard-refreshes", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON result to this file instead of stdout")
+    parser.add_argument("--baseline", help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(result, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            print_comparison(result, json.load(f))
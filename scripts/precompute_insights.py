@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+""" Precomputes the insight snapshot of every donor, as the nightly Celery job does.
+
+    python scripts/precompute_insights.py --workers 8 --chunk-rows 200000
+"""
+import sys, os
+import argparse
+import json
+import warnings
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.v1.models import *
+from api.db.database import get_db
+from api.v1.services.insight_batch import precompute_insight_snapshots
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute insight snapshots for all donors.")
+    parser.add_argument("--workers", type=int, help="Worker processes, 0 to compute inline")
+    parser.add_argument("--chunk-rows", type=int, help="Donations per chunk")
+    args = parser.parse_args()
+
+    db = next(get_db())
+    metrics = precompute_insight_snapshots(db, workers=args.workers, chunk_rows=args.chunk_rows)
+    print(json.dumps(metrics, indent=2))
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+""" Recomputes the donor_totals ranking table from completed donations.
+"""
+import sys, os
+import warnings
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.v1.models import *
+from api.db.database import get_db
+from api.v1.services.donor_totals import rebuild_donor_totals
+
+db = next(get_db())
+
+donors = rebuild_donor_totals(db)
+print(f"Rebuilt totals for {donors} donors")
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+""" Rebuilds the persisted project recommendation index from verified projects.
+
+Run periodically (e.g. nightly) to refresh funding progress and recency and
+to compact rows replaced by incremental updates.
+"""
+import sys, os
+import warnings
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.v1.models import *
+from api.db.database import get_db
+from api.v1.services.recommender import rebuild_project_index
+
+db = next(get_db())
+
+index = rebuild_project_index(db)
+print(f"Indexed {len(index)} projects")
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+""" Recomputes the donation_daily_rollups table from completed donations.
+"""
+import sys, os
+import warnings
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.v1.models import *
+from api.db.database import get_db
+from api.v1.services.rollups import rebuild_daily_rollups
+
+db = next(get_db())
+
+rows = rebuild_daily_rollups(db)
+print(f"Rebuilt {rows} daily rollup rows")
@@ -0,0 +1,64 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.v1.services import analytics_pool
+from api.v1.services.analytics_pool import run_analytics, shutdown_pool
+from api.v1.services.insight_snapshots import donation_arrays
+from api.v1.services.insights_engine import build_snapshot
+
+with open(os.path.join(os.path.dirname(__file__), "insights_golden.json")) as f:
+    GOLDEN = json.load(f)
+
+NOW = datetime.fromisoformat(GOLDEN["now"])
+
+
+def frame(case):
+    return pd.DataFrame({
+        "amount": case["amount"],
+        "created_at": pd.to_datetime(np.asarray(case["created_at_us"], dtype=np.int64), unit="us", utc=True),
+        "project_id": [f"00000000-0000-0000-0000-00000000000{i % 7}" for i in range(len(case["amount"]))],
+        "project_title": "Project",
+        "category": case["category"]
+    })
+
+
+def slow(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def process_mode():
+    with patch.object(analytics_pool.settings, "ANALYTICS_EXECUTION_MODE", "process"), \
+            patch.object(analytics_pool.settings, "ANALYTICS_POOL_SIZE", 1), \
+            patch.object(analytics_pool.settings, "ANALYTICS_POOL_TIMEOUT", 0.5):
+        yield
+    shutdown_pool()
+
+
+@pytest.mark.parametrize("case", GOLDEN["cases"][:3], ids=[case["name"] for case in GOLDEN["cases"][:3]])
+def test_snapshot_from_compact_arrays_matches_previous_implementation(case):
+    computed = build_snapshot(*donation_arrays(frame(case)), NOW)
+
+    for section, expected in case["expected"].items():
+        assert computed["insights"][section] == expected, section
+
+
+def test_process_mode_gives_the_same_snapshot(process_mode):
+    case = GOLDEN["cases"][0]
+    arrays = donation_arrays(frame(case))
+
+    assert asyncio.run(run_analytics(build_snapshot, *arrays, NOW)) == build_snapshot(*arrays, NOW)
+
+
+def test_process_mode_times_out(process_mode):
+    with pytest.raises(TimeoutError):
+        asyncio.run(run_analytics(slow, 2))
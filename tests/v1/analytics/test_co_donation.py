@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from api.v1.services.co_donation import co_donation_neighbors
+
+
+def neighbours_of(result, project):
+    mask = result["project"] == project
+    order = np.argsort(result["rank"][mask])
+    return list(result["neighbor"][mask][order])
+
+
+def test_neighbours_are_ranked_by_cosine_of_shared_donors():
+    # project 0: donors 0-3; project 1: donors 0-2; project 2: donors 2-3 plus 4-9
+    donors = [0, 1, 2, 3, 0, 1, 2, 2, 3, 4, 5, 6, 7, 8, 9]
+    projects = [0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2]
+
+    result = co_donation_neighbors(np.array(donors), np.array(projects), 3, min_co_donors=1)
+
+    assert neighbours_of(result, 0) == [1, 2]
+    score = result["score"][(result["project"] == 0) & (result["neighbor"] == 1)][0]
+    assert score == pytest.approx(3 / np.sqrt(4 * 3))
+    assert result["co_donors"][(result["project"] == 0) & (result["neighbor"] == 1)][0] == 3
+
+
+def test_repeat_donations_count_once_and_self_is_excluded():
+    donors = np.array([0, 0, 0, 1, 1])
+    projects = np.array([0, 0, 1, 0, 1])
+
+    result = co_donation_neighbors(donors, projects, 2, min_co_donors=1)
+
+    assert neighbours_of(result, 0) == [1]
+    assert result["score"][result["project"] == 0][0] == pytest.approx(1.0)
+
+
+def test_k_and_min_co_donors_limit_neighbours():
+    rng = np.random.default_rng(0)
+    donors = rng.integers(0, 200, 3000)
+    projects = rng.integers(0, 50, 3000)
+
+    result = co_donation_neighbors(donors, projects, 50, k=5, min_co_donors=3, block_size=7)
+
+    assert np.bincount(result["project"], minlength=50).max() <= 5
+    assert result["co_donors"].min() >= 3
+    assert set(result["rank"]) <= {1, 2, 3, 4, 5}
+
+    unblocked = co_donation_neighbors(donors, projects, 50, k=5, min_co_donors=3)
+    for key in ("project", "neighbor", "rank", "co_donors"):
+        np.testing.assert_array_equal(result[key], unblocked[key])
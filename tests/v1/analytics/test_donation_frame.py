@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from api.v1.services.analytics import DonationAnalytics, DONATION_COLUMNS
+
+
+def test_frame_is_built_from_columns_and_normalised_to_utc():
+    project_id = uuid4()
+    lagos = timezone(timedelta(hours=1))
+    rows = [
+        (10.0, datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc), project_id, "Wells", "Water"),
+        (2.5, datetime(2024, 3, 1, 13, 30, tzinfo=lagos), project_id, "Wells", "Water"),
+    ]
+
+    df = DonationAnalytics(db=None)._donations_to_dataframe(rows)
+
+    assert list(df.columns) == DONATION_COLUMNS
+    assert df["amount"].dtype == "float64"
+    assert str(df["created_at"].dt.tz) == "UTC"
+    assert df["created_at"].iloc[1] == datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc)
+    assert df["project_id"].tolist() == [project_id, project_id]
+
+
+def test_empty_rows_give_empty_frame_with_columns():
+    df = DonationAnalytics(db=None)._donations_to_dataframe([])
+
+    assert df.empty
+    assert list(df.columns) == DONATION_COLUMNS
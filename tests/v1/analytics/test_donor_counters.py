@@ -0,0 +1,60 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.v1.services import donor_counters
+from api.v1.services.donor_counters import (
+    HLL_STANDARD_ERROR, _replace_grouped, count_distinct_donors, counter_key, record_donor
+)
+
+
+def test_donation_is_added_to_all_four_counters_by_utc_day():
+    redis = MagicMock(add_to_hyperloglogs=AsyncMock(return_value=True))
+    donor, project = uuid.uuid4(), uuid.uuid4()
+    # late evening west of UTC is already the next UTC day
+    created_at = datetime(2024, 3, 1, 22, 30, tzinfo=timezone(timedelta(hours=-5)))
+
+    with patch.object(donor_counters, "redis_client", redis):
+        asyncio.run(record_donor(donor, project, "health", created_at))
+
+    entries, value = redis.add_to_hyperloglogs.await_args.args
+    assert value == str(donor)
+    assert [key for key, _ in entries] == [
+        "donors:platform", f"donors:project:{project}", "donors:category:health", "donors:day:2024-03-02"
+    ]
+    assert entries[0][1] is None and entries[3][1] >= 1
+
+
+def test_counts_are_approximate_once_reconciled():
+    redis = MagicMock(get_json=AsyncMock(return_value="2024-03-01T04:00:00"), count_hyperloglog=AsyncMock(return_value=1234))
+
+    with patch.object(donor_counters, "redis_client", redis), \
+            patch.object(donor_counters, "exact_distinct_donors") as exact:
+        assert asyncio.run(count_distinct_donors(MagicMock(), "category", "health")) == (1234, HLL_STANDARD_ERROR)
+
+    redis.count_hyperloglog.assert_awaited_once_with("donors:category:health")
+    exact.assert_not_called()
+
+
+def test_unreconciled_counters_fall_back_to_exact_sql():
+    redis = MagicMock(get_json=AsyncMock(return_value=None), count_hyperloglog=AsyncMock())
+
+    with patch.object(donor_counters, "redis_client", redis), \
+            patch.object(donor_counters, "exact_distinct_donors", return_value=7) as exact:
+        assert asyncio.run(count_distinct_donors(MagicMock(), "day", date(2024, 3, 2))) == (7, None)
+
+    exact.assert_called_once()
+    redis.count_hyperloglog.assert_not_awaited()
+
+
+def test_reconciliation_replaces_one_counter_per_group():
+    redis = MagicMock(replace_hyperloglog=AsyncMock(return_value=True))
+    rows = [("a", 1), ("a", 2), ("b", 3)]
+
+    with patch.object(donor_counters, "redis_client", redis):
+        groups = asyncio.run(_replace_grouped(iter(rows), "category"))
+
+    assert groups == 2
+    calls = [call.args for call in redis.replace_hyperloglog.await_args_list]
+    assert calls == [(counter_key("category", "a"), ["1", "2"], None), (counter_key("category", "b"), ["3"], None)]
@@ -0,0 +1,59 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from api.v1.models.base_class import Base
+from api.v1.models.donor_total import DonorTotal
+from api.v1.models.user import User
+from api.v1.services import donor_totals
+from api.v1.services.donor_totals import get_donor_rank
+
+TOTALS = [50.0, 40.0, 40.0, 40.0, 30.0, 20.0, 20.0, 10.0, 5.0]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__, DonorTotal.__table__])
+    with Session(engine) as session:
+        donors = [User(name=f"donor {i}", email=f"donor{i}@example.com", password="x") for i in range(len(TOTALS))]
+        session.add_all(donors)
+        session.flush()
+        session.add_all([
+            DonorTotal(donor_id=donor.id, total_amount=total, donation_count=1)
+            for donor, total in zip(donors, TOTALS)
+        ])
+        session.commit()
+        session.donors = donors
+        with patch.object(donor_totals, "_rank_buckets", None):
+            yield session
+
+
+@pytest.mark.parametrize("bucket_size", [1, 2, 3, 1000])
+def test_rank_matches_count_of_higher_totals(db, bucket_size):
+    with patch.object(donor_totals, "RANK_BUCKET_SIZE", bucket_size):
+        ranks = [get_donor_rank(db, donor.id) for donor in db.donors]
+
+    assert [ranking["rank"] for ranking in ranks] == [
+        1 + sum(other > total for other in TOTALS) for total in TOTALS
+    ]
+    assert all(ranking["total_donors"] == len(TOTALS) for ranking in ranks)
+
+
+def test_donor_without_total_has_no_rank(db):
+    ranking = get_donor_rank(db, uuid.uuid4())
+
+    assert ranking == {"total_amount": None, "rank": None, "total_donors": len(TOTALS)}
+
+
+def test_buckets_are_computed_once_per_ttl(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    for donor in db.donors:
+        get_donor_rank(db, donor.id)
+
+    assert sum("row_number()" in statement for statement in statements) == 1
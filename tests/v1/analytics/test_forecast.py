@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+from api.v1.services.forecast import fit_forecasts
+
+
+def fit(daily_amounts, active_days, remaining, horizon_days=90):
+    totals = np.array([sum(amounts) for amounts in daily_amounts], dtype=np.float64)
+    squares = np.array([sum(a * a for a in amounts) for amounts in daily_amounts], dtype=np.float64)
+    return fit_forecasts(totals, squares, np.array(active_days), np.array(remaining, dtype=np.float64), horizon_days)
+
+
+def test_steady_donations_reach_target_on_schedule():
+    days, probability = fit([[10.0] * 30], [30], [100.0])
+
+    assert days[0] == pytest.approx(10.0)
+    assert probability[0] == 1.0
+
+
+def test_inactive_and_funded_projects():
+    days, probability = fit([[], [5.0]], [30, 30], [100.0, -1.0])
+
+    assert math.isinf(days[0]) and probability[0] == 0.0
+    assert days[1] == 0.0 and probability[1] == 1.0
+
+
+def test_matches_per_project_normal_approximation():
+    rng = np.random.default_rng(7)
+    daily = [list(rng.exponential(20, rng.integers(1, 40))) for _ in range(50)]
+    active = [max(len(amounts), int(rng.integers(1, 90))) for amounts in daily]
+    remaining = list(rng.uniform(10, 3000, 50))
+
+    days, probability = fit(daily, active, remaining)
+
+    for i, (amounts, n, need) in enumerate(zip(daily, active, remaining)):
+        values = np.array(amounts + [0.0] * (n - len(amounts)))
+        mean = values.mean()
+        sd = values.std(ddof=1) if n > 1 else mean
+        z = (90 * mean - need) / (sd * math.sqrt(90))
+        assert days[i] == pytest.approx(need / mean)
+        assert probability[i] == pytest.approx(0.5 * math.erfc(-z / math.sqrt(2)))
+
+
+def test_probability_falls_as_the_target_grows():
+    daily = [[5.0, 30.0, 0.0, 12.0]] * 3
+
+    _, probability = fit(daily, [10] * 3, [100.0, 400.0, 1000.0])
+
+    assert probability[0] > probability[1] > probability[2]
+
+
+def test_closing_soon_route_is_not_shadowed_by_project_id():
+    from api.v1.routes.project import router
+
+    paths = [route.path for route in router.routes]
+    assert paths.index(f"{router.prefix}/closing-soon") < paths.index(f"{router.prefix}/{{project_id}}")
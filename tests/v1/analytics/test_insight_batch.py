@@ -0,0 +1,112 @@
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from api.v1.models.base_class import Base
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+from api.v1.models.user import User
+from api.v1.services.insight_batch import chunk_arrays, chunk_by_donor, chunk_watermarks, stream_donor_chunks
+from api.v1.services.insights_engine import build_snapshot, build_snapshot_batch
+
+with open(os.path.join(os.path.dirname(__file__), "insights_golden.json")) as f:
+    GOLDEN = json.load(f)
+
+NOW = datetime.fromisoformat(GOLDEN["now"])
+PROJECTS = [uuid.UUID(int=i + 1) for i in range(7)]
+
+
+def donor_rows(donor_id, case):
+    return [
+        (
+            donor_id,
+            amount,
+            datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=created_at_us),
+            PROJECTS[i % 7],
+            category
+        )
+        for i, (amount, created_at_us, category) in enumerate(zip(case["amount"], case["created_at_us"], case["category"]))
+    ]
+
+
+def test_batch_matches_per_donor_engine_and_golden_outputs():
+    donors = [uuid.UUID(int=1000 + i) for i in range(len(GOLDEN["cases"]))]
+    rows = [row for donor, case in zip(donors, GOLDEN["cases"]) for row in donor_rows(donor, case)]
+
+    donor_ids, arrays = chunk_arrays(rows)
+    computed = build_snapshot_batch(*arrays, NOW)
+
+    assert donor_ids == donors
+    for donor, case, snapshot in zip(donors, GOLDEN["cases"], computed):
+        _, single_arrays = chunk_arrays(donor_rows(donor, case))
+        assert snapshot == build_snapshot(*single_arrays[1:], NOW)
+        for section, expected in case["expected"].items():
+            assert snapshot["insights"][section] == expected, (case["name"], section)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 3, 4, 100])
+def test_chunks_never_split_a_donor(chunk_rows):
+    rows = [(donor, i) for donor, count in enumerate([3, 1, 4, 2, 5]) for i in range(count)]
+    partitions = [rows[i:i + 2] for i in range(0, len(rows), 2)]
+
+    chunks = list(chunk_by_donor(iter(partitions), chunk_rows))
+
+    assert [row for chunk in chunks for row in chunk] == rows
+    donors_per_chunk = [{donor for donor, _ in chunk} for chunk in chunks]
+    for a in range(len(donors_per_chunk)):
+        for b in range(a + 1, len(donors_per_chunk)):
+            assert not donors_per_chunk[a] & donors_per_chunk[b]
+
+
+def test_watermark_is_each_donors_newest_donation():
+    donors = [uuid.UUID(int=1000 + i) for i in range(len(GOLDEN["cases"]))]
+    rows = []
+    for donor, case in zip(donors, GOLDEN["cases"]):
+        donations = [row + (uuid.uuid4(),) for row in donor_rows(donor, case)]
+        rows += sorted(donations, key=lambda row: (row[2], row[5]))
+
+    donor_ids, arrays = chunk_arrays(rows)
+
+    assert donor_ids == donors
+    assert chunk_watermarks(rows) == [
+        max((row[2], row[5]) for row in rows if row[0] == donor) for donor in donors
+    ]
+
+
+def test_stream_donor_chunks_reads_completed_donations_from_a_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__, Project.__table__, Donation.__table__])
+    with Session(engine) as db:
+        creator = User(name="creator", email="creator@example.com", password="x")
+        donors = [User(name=f"donor {i}", email=f"donor{i}@example.com", password="x") for i in range(4)]
+        db.add_all([creator, *donors])
+        db.flush()
+        project = Project(
+            title="p", description="d", category="health", target_amount=100.0,
+            wallet_address="0.0.1", created_by=creator.id
+        )
+        db.add(project)
+        db.flush()
+        for i, donor in enumerate(donors):
+            for j in range(i + 1):
+                db.add(Donation(
+                    donor_id=donor.id, project_id=project.id, amount=float(j + 1),
+                    status=DonationStatus.completed, created_at=NOW - timedelta(days=j)
+                ))
+            db.add(Donation(donor_id=donor.id, project_id=project.id, amount=50.0, status=DonationStatus.pending))
+        db.commit()
+
+        chunks = list(stream_donor_chunks(db, chunk_rows=3))
+
+    rows = [row for chunk in chunks for row in chunk]
+    assert len(rows) == 1 + 2 + 3 + 4
+    assert all(row[4] == "health" and row[1] != 50.0 for row in rows)
+    assert [row[0] for row in rows] == sorted(row[0] for row in rows)
+    donors_per_chunk = [{row[0] for row in chunk} for chunk in chunks]
+    assert len(chunks) > 1
+    assert sum(len(donors) for donors in donors_per_chunk) == len(donors)
@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from api.v1.services.analytics import DonationAnalytics, INSIGHT_SECTIONS
+
+OWN_SECTIONS = {section: {"section": section} for section in INSIGHT_SECTIONS
+                if section not in ("recommended_projects", "user_percentile")}
+
+
+def analytics_with_snapshot(snapshot):
+    analytics = DonationAnalytics(db=MagicMock())
+    analytics._get_recommended_projects = AsyncMock(return_value=[])
+    analytics._calculate_user_percentile = MagicMock(return_value={"rank": 1})
+    patcher = patch("api.v1.services.analytics.get_insight_snapshot", new=AsyncMock(return_value=snapshot))
+    return analytics, patcher
+
+
+def test_summary_only_skips_recommendations_and_percentile():
+    analytics, patcher = analytics_with_snapshot((MagicMock(), OWN_SECTIONS))
+    with patcher:
+        insights = asyncio.run(analytics.get_user_insights(uuid.uuid4(), ["donation_summary"]))
+
+    assert insights == {"donation_summary": OWN_SECTIONS["donation_summary"]}
+    analytics._get_recommended_projects.assert_not_called()
+    analytics._calculate_user_percentile.assert_not_called()
+
+
+def test_all_sections_by_default_in_order():
+    analytics, patcher = analytics_with_snapshot((MagicMock(), OWN_SECTIONS))
+    with patcher:
+        insights = asyncio.run(analytics.get_user_insights(uuid.uuid4()))
+
+    assert tuple(insights) == INSIGHT_SECTIONS
+    analytics._get_recommended_projects.assert_awaited_once()
+    analytics._calculate_user_percentile.assert_called_once()
+
+
+def test_empty_insights_are_filtered_and_keep_message():
+    analytics, patcher = analytics_with_snapshot(None)
+    with patcher:
+        insights = asyncio.run(analytics.get_user_insights(uuid.uuid4(), ["user_percentile"]))
+
+    assert set(insights) == {"user_percentile", "message"}
+
+
+def test_unknown_section_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(DonationAnalytics(db=MagicMock()).get_user_insights(uuid.uuid4(), ["donation_summary", "nope"]))
@@ -0,0 +1,91 @@
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from api.v1.services.insight_snapshots import is_folded
+from api.v1.services.insights_engine import (
+    add_donation, aggregate_donations, aggregates_from_dict, aggregates_to_dict,
+    compute_insights, insights_valid_until, to_builtin, utc_nanos
+)
+
+with open(os.path.join(os.path.dirname(__file__), "insights_golden.json")) as f:
+    GOLDEN = json.load(f)
+
+NOW = datetime.fromisoformat(GOLDEN["now"])
+PROJECTS = [uuid.UUID(int=i + 1) for i in range(7)]
+
+
+def columns(case):
+    created_at = np.asarray(case["created_at_us"], dtype=np.int64) * 1000
+    project_ids = [PROJECTS[i % 7] for i in range(len(case["amount"]))]
+    return case["amount"], created_at, case["category"], project_ids
+
+
+def assert_same_aggregates(actual, expected):
+    assert actual.donation_count == expected.donation_count
+    assert actual.total_amount == pytest.approx(expected.total_amount)
+    assert actual.largest_donation == expected.largest_donation
+    assert actual.first_donation == expected.first_donation
+    assert actual.last_donation == expected.last_donation
+    assert actual.categories == expected.categories
+    np.testing.assert_allclose(actual.category_totals, expected.category_totals)
+    np.testing.assert_array_equal(actual.months, expected.months)
+    np.testing.assert_allclose(actual.month_totals, expected.month_totals)
+    np.testing.assert_array_equal(actual.month_counts, expected.month_counts)
+    np.testing.assert_allclose(actual.month_category_totals, expected.month_category_totals)
+    np.testing.assert_array_equal(actual.month_category_counts, expected.month_category_counts)
+    np.testing.assert_array_equal(actual.recent_donations, expected.recent_donations)
+    assert sorted(actual.project_ids) == sorted(expected.project_ids)
+
+
+@pytest.mark.parametrize("case", GOLDEN["cases"], ids=[case["name"] for case in GOLDEN["cases"]])
+def test_incremental_aggregates_match_full_aggregation(case):
+    amount, created_at, category, project_ids = columns(case)
+    aggregates = aggregate_donations(amount[:1], created_at[:1], category[:1], project_ids[:1], NOW)
+
+    for i in range(1, len(amount)):
+        aggregates = aggregates_from_dict(aggregates_to_dict(aggregates))
+        aggregates = add_donation(aggregates, amount[i], int(created_at[i]), category[i], project_ids[i], NOW)
+
+    assert_same_aggregates(aggregates, aggregate_donations(amount, created_at, category, project_ids, NOW))
+
+
+@pytest.mark.parametrize("case", GOLDEN["cases"], ids=[case["name"] for case in GOLDEN["cases"]])
+def test_serialized_aggregates_give_the_same_insights(case):
+    aggregates = aggregate_donations(*columns(case), NOW)
+    restored = aggregates_from_dict(json.loads(json.dumps(aggregates_to_dict(aggregates))))
+
+    insights = json.loads(json.dumps(to_builtin(compute_insights(restored, NOW))))
+
+    for section, expected in case["expected"].items():
+        assert insights[section] == expected, section
+
+
+def test_valid_until_is_next_month_without_recent_donations():
+    aggregates = aggregate_donations([10.0], [utc_nanos(NOW - timedelta(days=200))], ["Health"], [PROJECTS[0]], NOW)
+
+    assert insights_valid_until(aggregates, NOW) == utc_nanos(datetime(NOW.year, NOW.month + 1, 1))
+
+
+def test_valid_until_is_when_the_oldest_recent_donation_expires():
+    oldest = NOW - timedelta(days=80)
+    aggregates = aggregate_donations(
+        [10.0, 20.0], [utc_nanos(oldest), utc_nanos(NOW - timedelta(days=1))], ["Health", "Water"], PROJECTS[:2], NOW
+    )
+
+    assert insights_valid_until(aggregates, NOW) == utc_nanos(oldest + timedelta(days=90))
+
+
+def test_only_donations_past_the_watermark_are_folded():
+    at = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    snapshot = SimpleNamespace(last_donation_at=at, last_donation_id=uuid.UUID(int=5))
+
+    assert is_folded(snapshot, at - timedelta(seconds=1), uuid.UUID(int=9))
+    assert is_folded(snapshot, at, uuid.UUID(int=5))
+    assert not is_folded(snapshot, at, uuid.UUID(int=6))
+    assert not is_folded(snapshot, at + timedelta(microseconds=1), uuid.UUID(int=1))
@@ -0,0 +1,46 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from api.v1.services.insights_engine import aggregate_donations, compute_insights, top_categories
+
+# Outputs of the per-method DonationAnalytics implementation this engine
+# replaced, captured with datetime.now() frozen at the fixture's "now".
+with open(os.path.join(os.path.dirname(__file__), "insights_golden.json")) as f:
+    GOLDEN = json.load(f)
+
+NOW = datetime.fromisoformat(GOLDEN["now"])
+
+
+def aggregate(case):
+    created_at = np.asarray(case["created_at_us"], dtype=np.int64) * 1000
+    project_ids = [f"p{i % 7}" for i in range(len(case["amount"]))]
+    return aggregate_donations(case["amount"], created_at, case["category"], project_ids, NOW)
+
+
+@pytest.mark.parametrize("case", GOLDEN["cases"], ids=[case["name"] for case in GOLDEN["cases"]])
+def test_sections_match_previous_implementation(case):
+    insights = compute_insights(aggregate(case), NOW)
+
+    for section, expected in case["expected"].items():
+        assert insights[section] == expected, section
+    # distribution order is part of the output
+    assert list(insights["category_distribution"]) == list(case["expected"]["category_distribution"])
+
+
+@pytest.mark.parametrize("case", GOLDEN["cases"], ids=[case["name"] for case in GOLDEN["cases"]])
+def test_top_categories_match_previous_implementation(case):
+    assert top_categories(aggregate(case), 3) == case["expected_top_categories"]
+
+
+def test_recent_window_is_applied_at_compute_time():
+    case = GOLDEN["cases"][0]
+    aggregates = aggregate(case)
+
+    later = datetime(NOW.year + 1, NOW.month, NOW.day)
+    insights = compute_insights(aggregates, later)
+
+    assert insights["user_impact_score"]["factors"]["recent_activity"] == 0
@@ -0,0 +1,71 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.v1.services import platform_stats
+from api.v1.services.platform_stats import compute_platform_stats, get_platform_stats
+
+STATS = {"total_donations": 4, "total_amount": 10.0, "total_donors": 2}
+
+
+def stats_db(row):
+    db = MagicMock()
+    db.execute.return_value.one.return_value = MagicMock(_mapping=row)
+    return db
+
+
+def test_stats_come_from_one_statement():
+    db = stats_db({
+        "total_donations": 4, "total_amount": 10, "total_donors": 2,
+        "recent_donations": 1, "total_projects": 3, "recent_projects": 0
+    })
+
+    stats = compute_platform_stats(db)
+
+    assert db.execute.call_count == 1
+    assert db.query.call_count == 0
+    sql = str(db.execute.call_args.args[0])
+    assert sql.count("FILTER (WHERE") == 3
+    assert stats["average_donation"] == 2.5
+    assert stats["total_amount"] == 10.0
+
+
+def test_cache_hit_skips_the_database():
+    redis = MagicMock(get_json=AsyncMock(return_value=STATS))
+    with patch.object(platform_stats, "redis_client", redis), \
+            patch.object(platform_stats, "compute_platform_stats") as compute:
+        assert asyncio.run(get_platform_stats(MagicMock())) == STATS
+
+    compute.assert_not_called()
+
+
+def test_concurrent_misses_compute_once():
+    redis = MagicMock(
+        acquire_lock=AsyncMock(return_value=True),
+        release_lock=AsyncMock(return_value=True)
+    )
+    cache = {}
+    redis.get_json = AsyncMock(side_effect=lambda key: cache.get(key))
+    redis.set_json = AsyncMock(side_effect=lambda key, value, ttl: cache.__setitem__(key, value))
+
+    async def run():
+        return await asyncio.gather(*(get_platform_stats(MagicMock()) for _ in range(5)))
+
+    with patch.object(platform_stats, "redis_client", redis), \
+            patch.object(platform_stats, "compute_platform_stats", return_value=STATS) as compute:
+        results = asyncio.run(run())
+
+    assert results == [STATS] * 5
+    compute.assert_called_once()
+    redis.release_lock.assert_awaited_once()
+
+
+def test_waits_for_the_lock_holder_in_another_worker():
+    redis = MagicMock(acquire_lock=AsyncMock(return_value=False))
+    redis.get_json = AsyncMock(side_effect=[None, None, None, STATS])
+
+    with patch.object(platform_stats, "redis_client", redis), \
+            patch.object(platform_stats, "LOCK_POLL", 0), \
+            patch.object(platform_stats, "compute_platform_stats") as compute:
+        assert asyncio.run(get_platform_stats(MagicMock())) == STATS
+
+    compute.assert_not_called()
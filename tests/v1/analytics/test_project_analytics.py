@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.v1.services import project_analytics
+from api.v1.services.project_analytics import build_project_analytics
+
+PROJECT = SimpleNamespace(id=uuid.uuid4(), title="Wells", target_amount=200.0)
+NOW = datetime(2024, 5, 1, tzinfo=timezone.utc)
+RECENT = [
+    SimpleNamespace(id=uuid.uuid4(), amount=5.0 + i, created_at=NOW - timedelta(hours=i), donor_id=uuid.uuid4())
+    for i in range(3)
+]
+TOTALS = {"total_raised": 50.0, "donation_count": 4, "donor_count": 3}
+
+
+def run(redis, recent=RECENT, totals=TOTALS):
+    with patch.object(project_analytics, "redis_client", redis), \
+            patch.object(project_analytics, "recent_project_donations", return_value=recent), \
+            patch.object(project_analytics, "project_donation_totals", return_value=totals) as aggregate:
+        return asyncio.run(build_project_analytics(MagicMock(), PROJECT)), aggregate
+
+
+def test_totals_are_computed_and_cached_by_newest_donation():
+    redis = MagicMock(get_json=AsyncMock(return_value=None), set_json=AsyncMock())
+
+    result, aggregate = run(redis)
+
+    aggregate.assert_called_once()
+    key = redis.set_json.await_args.args[0]
+    assert str(RECENT[0].id) in key and NOW.isoformat() in key
+    assert result["total_raised"] == 50.0
+    assert result["average_donation"] == 12.5
+    assert result["completion_percentage"] == 25.0
+    assert [d["date"] for d in result["recent_donations"]] == [d.created_at.isoformat() for d in RECENT]
+
+
+def test_cache_hit_skips_the_aggregate():
+    redis = MagicMock(get_json=AsyncMock(return_value=TOTALS), set_json=AsyncMock())
+
+    result, aggregate = run(redis)
+
+    aggregate.assert_not_called()
+    assert result["donor_count"] == 3
+
+
+def test_project_without_donations_needs_no_aggregate():
+    redis = MagicMock(get_json=AsyncMock(), set_json=AsyncMock())
+
+    result, aggregate = run(redis, recent=[])
+
+    aggregate.assert_not_called()
+    redis.get_json.assert_not_awaited()
+    assert result["donation_count"] == 0 and result["recent_donations"] == []
@@ -0,0 +1,155 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from api.v1.models.base_class import Base
+from api.v1.models.project import Project
+from api.v1.models.recommender_index import RecommenderIndex
+from api.v1.models.user import User
+from api.v1.services import recommender
+from api.v1.services.recommender import ProjectIndex, load_project_index, save_project_index
+
+NOW = datetime(2025, 3, 14, tzinfo=timezone.utc)
+
+
+def project(category, title, description="", location="Lagos", verified=True, age_days=10):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title=title,
+        description=description,
+        category=category,
+        location=location,
+        amount_raised=500.0,
+        target_amount=1000.0,
+        created_at=NOW - timedelta(days=age_days),
+        verified=verified
+    )
+
+
+@pytest.fixture
+def projects():
+    return [
+        project("Water", "Borehole for Kano school", "clean drinking water borehole"),
+        project("Water", "Wells in Kaduna", "drinking water wells for villages"),
+        project("Health", "Rural clinic", "maternal health clinic"),
+        project("Education", "Library books", "books for a school library"),
+        project("Water", "Unverified well", "drinking water", verified=False),
+    ]
+
+
+def test_recommends_similar_projects_and_excludes_donated(projects):
+    index = ProjectIndex.build(projects, NOW)
+
+    ranked = index.recommend([projects[0].id], limit=2)
+
+    assert [project_id for project_id, _ in ranked][0] == str(projects[1].id)
+    assert str(projects[0].id) not in [project_id for project_id, _ in ranked]
+    assert len(index) == 4
+
+
+def test_unverified_projects_are_not_indexed(projects):
+    index = ProjectIndex.build(projects, NOW)
+
+    ranked = index.recommend([projects[0].id], limit=10)
+
+    assert str(projects[4].id) not in [project_id for project_id, _ in ranked]
+    assert len(ranked) == 3
+
+
+def test_upsert_adds_and_masks_projects(projects):
+    index = ProjectIndex.build(projects[:4], NOW)
+    new = project("Water", "Rainwater tanks", "drinking water tanks")
+
+    index.upsert(new, NOW)
+    assert str(new.id) in [project_id for project_id, _ in index.recommend([projects[0].id], limit=2)]
+
+    new.verified = False
+    index.upsert(new, NOW)
+    assert str(new.id) not in [project_id for project_id, _ in index.recommend([projects[0].id], limit=10)]
+
+
+def test_no_recommendations_without_indexed_donations(projects):
+    index = ProjectIndex.build(projects, NOW)
+
+    assert index.recommend([uuid.uuid4()]) == []
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__, Project.__table__, RecommenderIndex.__table__])
+    monkeypatch.setattr(recommender, "_index", None)
+    monkeypatch.setattr(recommender, "_index_version", None)
+    monkeypatch.setattr(recommender, "_rebuild_requested_at", None)
+    with Session(engine) as session:
+        yield session
+
+
+def saved_project(db, category, title, description="", verified=True):
+    creator = User(name=title, email=f"{uuid.uuid4()}@example.com", password="x")
+    db.add(creator)
+    db.flush()
+    row = Project(
+        title=title, description=description, category=category, location="Lagos", amount_raised=500.0,
+        target_amount=1000.0, verified=verified, wallet_address="0.0.1", created_by=creator.id
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+def test_index_round_trips_through_the_database(projects, db):
+    index = ProjectIndex.build(projects, NOW)
+
+    assert save_project_index(db, index) == 1
+    assert save_project_index(db, index) == 2
+    loaded, version = load_project_index(db)
+
+    assert version == 2
+    assert loaded.recommend([projects[0].id]) == index.recommend([projects[0].id])
+
+
+def test_missing_index_is_queued_for_a_build_once(db):
+    with patch.object(recommender, "_request_rebuild", wraps=recommender._request_rebuild) as request, \
+            patch("api.utils.celery_app.rebuild_project_index_task") as task:
+        assert recommender.get_project_index(db) is None
+        assert recommender.get_project_index(db) is None
+
+    assert request.call_count == 2
+    task.apply_async.assert_called_once_with(kwargs={"only_missing": True}, retry=False)
+
+
+def test_workers_reload_a_newer_saved_index(projects, db):
+    save_project_index(db, ProjectIndex.build(projects[:2], NOW))
+    assert len(recommender.get_project_index(db)) == 2
+
+    # saved by another worker
+    save_project_index(db, ProjectIndex.build(projects[:4], NOW))
+
+    assert len(recommender.get_project_index(db)) == 4
+
+
+class NaiveDatetime(datetime):
+    # SQLite hands back created_at without its time zone
+    @classmethod
+    def now(cls, tz=None):
+        return NOW.replace(tzinfo=None)
+
+
+def test_queued_updates_are_applied_to_the_saved_index(projects, db, monkeypatch):
+    monkeypatch.setattr(recommender, "datetime", NaiveDatetime)
+    new = saved_project(db, "Water", "Solar pump", "water pump")
+    assert recommender.update_projects_in_index(db, [new.id]) == 0
+    assert load_project_index(db) is None
+
+    save_project_index(db, ProjectIndex.build(projects[:4], NOW))
+    assert recommender.update_projects_in_index(db, [str(new.id)]) == 1
+
+    assert len(recommender.get_project_index(db)) == 5
+    loaded, version = load_project_index(db)
+    assert len(loaded) == 5 and version == 2
@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from api.v1.services import donor_counters
+from api.v1.services.donor_counters import HLL_STANDARD_ERROR, counter_key
+from api.v1.services.rollups import _next_bucket, bucket_start, fill_distinct_donors, get_timeseries, platform_shard
+
+
+def rollup_db(rows):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.group_by.return_value.all.return_value = rows
+    return db
+
+
+def test_bucket_start_matches_date_trunc():
+    day = date(2024, 3, 14)  # a Thursday
+
+    assert bucket_start("day", day) == day
+    assert bucket_start("week", day) == date(2024, 3, 11)
+    assert bucket_start("month", day) == date(2024, 3, 1)
+
+
+def test_next_bucket_crosses_month_and_year_ends():
+    assert _next_bucket("day", date(2024, 2, 28)) == date(2024, 2, 29)
+    assert _next_bucket("week", date(2024, 12, 30)) == date(2025, 1, 6)
+    assert _next_bucket("month", date(2024, 1, 1)) == date(2024, 2, 1)
+    assert _next_bucket("month", date(2024, 12, 1)) == date(2025, 1, 1)
+
+
+def test_timeseries_fills_empty_buckets():
+    rows = [SimpleNamespace(bucket_start=datetime(2024, 3, 2), total_amount=12.345, donation_count=3, donor_days=2)]
+
+    points = get_timeseries(rollup_db(rows), "platform", "", "day", date(2024, 3, 1), date(2024, 3, 3))
+
+    assert [point["bucket_start"] for point in points] == [date(2024, 3, 1), date(2024, 3, 2), date(2024, 3, 3)]
+    assert points[0] == {
+        "bucket_start": date(2024, 3, 1), "total_amount": 0.0, "donation_count": 0, "donor_days": 0, "distinct_donors": 0
+    }
+    assert points[1]["total_amount"] == 12.35
+    assert points[1]["distinct_donors"] == 2
+
+
+def test_coarse_buckets_report_donor_days_only():
+    rows = [SimpleNamespace(bucket_start=datetime(2024, 1, 1), total_amount=10.0, donation_count=4, donor_days=4)]
+
+    points = get_timeseries(rollup_db(rows), "category", "education", "month", date(2024, 1, 15), date(2024, 3, 31))
+
+    assert [point["bucket_start"] for point in points] == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert points[0]["donor_days"] == 4
+    assert points[0]["distinct_donors"] is None
+
+
+def test_platform_weeks_count_the_union_of_their_day_counters():
+    monday = datetime.now(timezone.utc).date() - timedelta(days=30)
+    monday -= timedelta(days=monday.weekday())
+    end = monday + timedelta(days=9)
+    points = get_timeseries(rollup_db([]), "platform", "", "week", monday, end)
+    redis = MagicMock(get_json=AsyncMock(return_value="reconciled"), count_hyperloglog=AsyncMock(side_effect=[40, 12]))
+
+    with patch.object(donor_counters, "redis_client", redis):
+        asyncio.run(fill_distinct_donors(points, "platform", "week", end))
+
+    assert [point["distinct_donors"] for point in points] == [40, 12]
+    assert points[0]["distinct_donors_error"] == HLL_STANDARD_ERROR
+    first_week, second_week = [call.args for call in redis.count_hyperloglog.await_args_list]
+    assert first_week == tuple(counter_key("day", monday + timedelta(days=i)) for i in range(7))
+    # the last bucket stops at end
+    assert second_week == tuple(counter_key("day", monday + timedelta(days=i)) for i in range(7, 10))
+
+
+def test_unreconciled_counters_leave_coarse_buckets_without_distinct_donors():
+    points = get_timeseries(rollup_db([]), "platform", "", "month", date(2024, 1, 1), date(2024, 2, 29))
+    redis = MagicMock(get_json=AsyncMock(return_value=None), count_hyperloglog=AsyncMock())
+
+    with patch.object(donor_counters, "redis_client", redis):
+        asyncio.run(fill_distinct_donors(points, "platform", "month", date(2024, 2, 29)))
+
+    assert all(point["distinct_donors"] is None for point in points)
+    redis.count_hyperloglog.assert_not_awaited()
+
+
+def test_platform_rows_are_sharded_by_donor():
+    donors = [uuid.UUID(int=i) for i in range(64)]
+
+    assert {platform_shard(donor) for donor in donors} == set("0123456789abcdef")
+    assert platform_shard(donors[5]) == platform_shard(donors[5])
+
+
+def test_platform_timeseries_adds_up_every_shard():
+    platform = rollup_db([])
+    project = rollup_db([])
+
+    get_timeseries(platform, "platform", "", "day", date(2024, 3, 1), date(2024, 3, 1))
+    get_timeseries(project, "project", "p1", "day", date(2024, 3, 1), date(2024, 3, 1))
+
+    assert "scope_key" not in " ".join(str(condition) for condition in platform.query.return_value.filter.call_args.args)
+    assert "scope_key" in " ".join(str(condition) for condition in project.query.return_value.filter.call_args.args)
+
+
+@pytest.mark.parametrize("scope,bucket,start,end", [
+    ("donor", "day", date(2024, 1, 1), date(2024, 1, 2)),
+    ("platform", "year", date(2024, 1, 1), date(2024, 1, 2)),
+    ("platform", "day", date(2024, 1, 2), date(2024, 1, 1)),
+])
+def test_invalid_arguments_raise(scope, bucket, start, end):
+    with pytest.raises(ValueError):
+        get_timeseries(MagicMock(), scope, "", bucket, start, end)
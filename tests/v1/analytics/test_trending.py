@@ -0,0 +1,62 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from api.v1.services.trending import (
+    EPOCH, HALF_LIFE_HOURS, donation_weight, log_contribution, log_scores, trending_score
+)
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def test_score_halves_every_half_life():
+    log_score = log_contribution(2.0, NOW)
+
+    assert trending_score(log_score, NOW) == pytest.approx(2.0)
+    assert trending_score(log_score, NOW + timedelta(hours=HALF_LIFE_HOURS)) == pytest.approx(1.0)
+    assert trending_score(None, NOW) == 0.0
+
+
+def test_batch_scores_match_incremental_updates():
+    rng = np.random.default_rng(3)
+    projects = rng.choice(["a", "b", "c"], 200).astype(object)
+    donors = rng.integers(0, 20, 200).astype(str).astype(object)
+    amounts = rng.exponential(50, 200)
+    times = sorted(NOW - timedelta(hours=float(hours)) for hours in rng.uniform(0, 500, 200))
+    seconds = np.array([(moment - EPOCH).total_seconds() for moment in times])
+
+    batch = log_scores(projects, donors, amounts, seconds)
+
+    incremental, seen = {}, set()
+    for project, donor, amount, moment in zip(projects, donors, amounts, times):
+        contribution = log_contribution(donation_weight(amount, (project, donor) not in seen), moment)
+        seen.add((project, donor))
+        current = incremental.get(project)
+        incremental[project] = contribution if current is None else (
+            max(current, contribution) + math.log1p(math.exp(-abs(current - contribution)))
+        )
+
+    for project, log_score in incremental.items():
+        assert batch[project] == pytest.approx(log_score)
+
+
+def test_recent_activity_outranks_older_larger_volume():
+    old = NOW - timedelta(days=30)
+    seconds = np.array([(old - EPOCH).total_seconds()] * 5 + [(NOW - EPOCH).total_seconds()])
+    scores = log_scores(
+        np.array(["old"] * 5 + ["new"], dtype=object),
+        np.array(["1", "2", "3", "4", "5", "6"], dtype=object),
+        np.array([1000.0] * 5 + [10.0]),
+        seconds
+    )
+
+    assert scores["new"] > scores["old"]
+
+
+def test_trending_route_is_not_shadowed_by_project_id():
+    from api.v1.routes.project import router
+
+    paths = [route.path for route in router.routes]
+    assert paths.index(f"{router.prefix}/trending") < paths.index(f"{router.prefix}/{{project_id}}")
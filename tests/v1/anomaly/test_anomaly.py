@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from api.v1.services.anomaly import (
+    DONOR_HISTORY, FAN_OUT_PROJECTS, PROJECT_HISTORY, RAPID_COUNT, flagged_donations, score_donation, score_donations
+)
+
+
+def stream(donors, projects, times, amounts):
+    """Feed donations one at a time through score_donation with fixed-size histories."""
+    history, project_history, flags = {}, {}, []
+    for i, (donor, project, time, amount) in enumerate(zip(donors, projects, times, amounts)):
+        times_, amounts_, projects_ = history.setdefault(donor, ([], [], []))
+        project_amounts = project_history.setdefault(project, [])
+        for kind, score, details in score_donation(times_, amounts_, projects_, project_amounts, time, amount, project):
+            flags.append((i, kind, score, details))
+        history[donor] = (
+            (times_ + [time])[-DONOR_HISTORY:], (amounts_ + [amount])[-DONOR_HISTORY:], (projects_ + [project])[-DONOR_HISTORY:]
+        )
+        project_history[project] = (project_amounts + [amount])[-PROJECT_HISTORY:]
+    return flags
+
+
+def batch(donors, projects, times, amounts, chunk_rows=100_000):
+    scores = score_donations(np.asarray(donors), np.asarray(projects), np.asarray(times, dtype=np.float64),
+                             np.asarray(amounts, dtype=np.float64), chunk_rows)
+    return flagged_donations(scores)
+
+
+def kinds(flags):
+    return {(i, kind) for i, kind, _, _ in flags}
+
+
+def test_rapid_small_donations_are_flagged():
+    n = RAPID_COUNT
+    flags = stream([0] * n, [0] * n, [60.0 * i for i in range(n)], [0.5] * n)
+
+    assert kinds(flags) == {(n - 1, "rapid_small_donations")}
+
+
+def test_fan_out_to_many_projects_is_flagged():
+    n = FAN_OUT_PROJECTS
+    flags = stream([0] * n, list(range(n)), [300.0 * i for i in range(n)], [10.0] * n)
+
+    assert kinds(flags) == {(n - 1, "donor_fan_out")}
+
+
+def test_sudden_large_transfer_is_flagged():
+    amounts = [10.0, 12.0, 8.0, 11.0, 9.0, 10.0, 5000.0]
+    flags = stream([0] * 7, [0] * 7, [86400.0 * i for i in range(7)], amounts)
+
+    (index, kind, score, details), = flags
+    assert (index, kind) == (6, "large_transfer")
+    assert details["donor_z"] == pytest.approx(score)
+    assert details["project_z"] is None
+
+
+@pytest.mark.parametrize("chunk_rows", [100_000, 37])
+def test_backfill_matches_streaming(chunk_rows):
+    rng = np.random.default_rng(11)
+    n = 3000
+    donors = rng.integers(0, 40, n)
+    projects = rng.integers(0, 25, n)
+    times = np.sort(rng.uniform(0, 3 * 86400, n))
+    amounts = np.where(rng.random(n) < 0.3, rng.uniform(0.1, 1.0, n), rng.lognormal(3, 1.5, n))
+
+    streamed = stream(list(donors), list(projects), list(times), list(amounts))
+    batched = batch(donors, projects, times, amounts, chunk_rows)
+
+    assert streamed
+    assert kinds(batched) == kinds(streamed)
+    scores = {(i, kind): score for i, kind, score, _ in streamed}
+    for i, kind, score, _ in batched:
+        assert score == pytest.approx(scores[(i, kind)])
@@ -0,0 +1,157 @@
+import asyncio
+import fnmatch
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from api.utils.redis_utils import redis_client
+from api.v1.models.donation import Donation
+from api.v1.models.project import Project
+from api.v1.routes import events as events_routes
+from api.v1.services import events
+from api.v1.services.events import DonationEventHub, PLATFORM_CHANNEL, project_channel, publish_donation_event
+
+
+class FakeRedis:
+    """In-process stand-in for Redis pub/sub, serving both the sync publisher and asyncio subscribers."""
+
+    def __init__(self):
+        self.subscriptions = []
+
+    def publish(self, channel, data):
+        for pubsub in self.subscriptions:
+            if fnmatch.fnmatchcase(channel, pubsub.pattern):
+                pubsub.messages.put_nowait({"type": "pmessage", "channel": channel, "data": data})
+        return len(self.subscriptions)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def aclose(self):
+        pass
+
+
+class FakePubSub:
+    def __init__(self, bus):
+        self.bus = bus
+        self.pattern = None
+        self.messages = asyncio.Queue()
+
+    async def psubscribe(self, pattern):
+        self.pattern = pattern
+        self.bus.subscriptions.append(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        if self in self.bus.subscriptions:
+            self.bus.subscriptions.remove(self)
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.fixture
+def bus():
+    fake = FakeRedis()
+    with patch.object(redis_client, "redis_client", fake), \
+            patch.object(events, "get_async_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def hub():
+    fresh = DonationEventHub(queue_size=10)
+    with patch.object(events_routes, "donation_event_hub", fresh):
+        yield fresh
+
+
+async def _until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def _project():
+    return Project(id=uuid.uuid4(), title="Wells", category="water", amount_raised=40.0, target_amount=100.0)
+
+
+def _donation(project):
+    return Donation(id=uuid.uuid4(), project_id=project.id, amount=10.0, created_at=datetime.now(timezone.utc))
+
+
+def test_completed_donation_is_published_to_platform_and_project_channels(bus):
+    project = _project()
+    donation = _donation(project)
+    listener = bus.pubsub()
+
+    async def scenario():
+        await listener.psubscribe("donations:*")
+        await publish_donation_event(donation, project)
+        return [await listener.get_message(timeout=1) for _ in range(2)]
+
+    messages = asyncio.run(scenario())
+
+    assert [message["channel"] for message in messages] == [PLATFORM_CHANNEL, project_channel(project.id)]
+    event = json.loads(messages[0]["data"])
+    assert event == json.loads(messages[1]["data"])
+    assert event["donation_id"] == str(donation.id)
+    assert event["completion_percentage"] == 40.0
+
+
+def test_project_stream_only_receives_its_own_donations(bus, hub):
+    project, other = _project(), _project()
+    request = FakeRequest()
+
+    async def scenario():
+        stream = events_routes._event_stream(request, project_channel(project.id), {"project_id": str(project.id)})
+        snapshot = await stream.__anext__()
+        await _until(lambda: bus.subscriptions)
+
+        await publish_donation_event(_donation(other), other)
+        await publish_donation_event(_donation(project), project)
+        received = await stream.__anext__()
+
+        request.disconnected = True
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        return snapshot, received
+
+    snapshot, received = asyncio.run(scenario())
+
+    assert snapshot.startswith("event: snapshot\n")
+    assert received.startswith("event: donation\n")
+    assert json.loads(received.split("data: ", 1)[1])["project_id"] == str(project.id)
+    assert hub._listeners == {}
+
+
+def test_listener_and_subscription_are_released_when_the_client_goes_away(bus, hub):
+    async def scenario():
+        platform = events_routes._event_stream(FakeRequest(), PLATFORM_CHANNEL)
+        pending = asyncio.ensure_future(platform.__anext__())
+        await _until(lambda: bus.subscriptions)
+        assert set(hub._listeners) == {PLATFORM_CHANNEL}
+
+        # the server closes the response body generator on disconnect
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        await platform.aclose()
+
+        assert hub._listeners == {}
+        await asyncio.wait_for(hub._task, timeout=3)
+        return bus.subscriptions
+
+    assert asyncio.run(scenario()) == []
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from hiero_sdk_python import PrivateKey
+
+from api.v1.services import hedera
+from api.v1.services.fake_ledger import FakeLedger, INSUFFICIENT_ACCOUNT_BALANCE
+from api.v1.services.ledger import SUCCESS, LedgerReceipt, set_ledger
+
+
+@pytest.fixture
+def ledger():
+    fake = FakeLedger(seed=1, initial_balance_hbar=100)
+    set_ledger(fake)
+    hedera._mirror_http_client = None
+    yield fake
+    set_ledger(None)
+    hedera._mirror_http_client = None
+
+
+def _key():
+    return PrivateKey.generate("ecdsa")
+
+
+def test_transfer_moves_balance_and_produces_receipt(ledger):
+    async def scenario():
+        sender = await ledger.create_account(_key().public_key(), 1, "sender")
+        recipient = await ledger.create_account(_key().public_key(), 1, "recipient")
+        transaction_id = await ledger.submit_transfer(sender, recipient, 25 * 100_000_000, _key())
+        receipts = await ledger.get_receipts([transaction_id])
+        return sender, recipient, receipts[transaction_id]
+
+    sender, recipient, receipt = asyncio.run(scenario())
+
+    assert receipt.status == SUCCESS
+    assert ledger.balances[sender] == 75 * 100_000_000
+    assert ledger.balances[recipient] == 125 * 100_000_000
+
+
+def test_insufficient_balance_fails_receipt(ledger):
+    async def scenario():
+        sender = await ledger.create_account(_key().public_key(), 1, "sender")
+        recipient = await ledger.create_account(_key().public_key(), 1, "recipient")
+        transaction_id = await ledger.submit_transfer(sender, recipient, 500 * 100_000_000, _key())
+        return (await ledger.get_receipts([transaction_id]))[transaction_id]
+
+    assert asyncio.run(scenario()).status == INSUFFICIENT_ACCOUNT_BALANCE
+
+
+def test_failure_injection_is_deterministic():
+    def failures(seed):
+        fake = FakeLedger(seed=seed, failure_rate=0.5, initial_balance_hbar=1)
+        outcomes = []
+        for _ in range(20):
+            try:
+                asyncio.run(fake.get_balance(fake.operator_id))
+                outcomes.append(True)
+            except ConnectionError:
+                outcomes.append(False)
+        return outcomes
+
+    assert failures(7) == failures(7)
+    assert not all(failures(7))
+
+
+def test_donation_flow_and_trace_against_fake_mirror(ledger):
+    async def scenario():
+        donor = await ledger.create_account(_key().public_key(), 1, "donor")
+        project = await ledger.create_account(_key().public_key(), 1, "project")
+        tx_hash = await hedera.donate_hbar(donor, project, 10, _key().to_string())
+        verification = await hedera.verify_transaction(tx_hash, initial_delay=0)
+        return donor, project, tx_hash, verification
+
+    donor, project, tx_hash, verification = asyncio.run(scenario())
+
+    assert verification["valid"] is True
+    assert verification["amount"] == 10
+    assert verification["from_account"] == donor
+    assert verification["to_account"] == project
+    assert verification["transaction_id"] == tx_hash
+
+
+def test_slow_receipt_batch_does_not_block_next_batch(ledger):
+    class SlowFirstBatch:
+        def __init__(self):
+            self.calls = 0
+
+        async def get_receipts(self, transaction_ids):
+            self.calls += 1
+            if self.calls == 1:
+                await asyncio.sleep(1)
+            return {
+                transaction_id: LedgerReceipt(transaction_id=transaction_id, status=SUCCESS)
+                for transaction_id in transaction_ids
+            }
+
+    set_ledger(SlowFirstBatch())
+    confirmer = hedera.ReceiptConfirmer(batch_size=1, interval=0.01)
+
+    async def scenario():
+        slow = asyncio.ensure_future(confirmer.confirm("0.0.2@1.1", timeout=5))
+        await asyncio.sleep(0)
+        fast = await confirmer.confirm("0.0.2@2.2", timeout=0.5)
+        return slow.done(), fast, await slow
+
+    slow_done, fast, slow = asyncio.run(scenario())
+
+    assert not slow_done
+    assert fast.status == SUCCESS
+    assert slow.status == SUCCESS
+
+
+def test_pending_receipts_are_polled_again(ledger):
+    class ConsensusOnThirdPoll:
+        def __init__(self):
+            self.polls = 0
+
+        async def get_receipts(self, transaction_ids):
+            self.polls += 1
+            if self.polls < 3:
+                return {}
+            return {
+                transaction_id: LedgerReceipt(transaction_id=transaction_id, status=SUCCESS)
+                for transaction_id in transaction_ids
+            }
+
+    backend = ConsensusOnThirdPoll()
+    set_ledger(backend)
+    confirmer = hedera.ReceiptConfirmer(batch_size=10, interval=0.01)
+
+    receipt = asyncio.run(confirmer.confirm("0.0.2@1.1", timeout=1))
+
+    assert receipt.status == SUCCESS
+    assert backend.polls == 3
+    assert not confirmer._pending
+
+
+def test_mirror_receipts_leave_out_unindexed_transactions(ledger):
+    async def scenario():
+        sender = await ledger.create_account(_key().public_key(), 1, "sender")
+        recipient = await ledger.create_account(_key().public_key(), 1, "recipient")
+        paid = await ledger.submit_transfer(sender, recipient, 25 * 100_000_000, _key())
+        overdrawn = await ledger.submit_transfer(sender, recipient, 500 * 100_000_000, _key())
+        return paid, overdrawn, await hedera.get_mirror_receipts([paid, overdrawn, "0.0.2@1.1"])
+
+    paid, overdrawn, receipts = asyncio.run(scenario())
+
+    assert receipts[paid].status == SUCCESS
+    assert receipts[overdrawn].status == INSUFFICIENT_ACCOUNT_BALANCE
+    assert "0.0.2@1.1" not in receipts
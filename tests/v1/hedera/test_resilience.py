@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+
+from api.utils.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, hedged_call
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _fail():
+    raise ConnectionError("upstream down")
+
+
+async def _ok():
+    return "ok"
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            asyncio.run(breaker.call(_fail))
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.call(_ok))
+    assert breaker.metrics["rejections"] == 1
+
+
+def test_breaker_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    with pytest.raises(ConnectionError):
+        asyncio.run(breaker.call(_fail))
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    with pytest.raises(ConnectionError):
+        asyncio.run(breaker.call(_fail))
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert asyncio.run(breaker.call(_ok)) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_ignored_exceptions_do_not_trip_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, ignored_exceptions=(ValueError,))
+
+    async def business_error():
+        raise ValueError("insufficient balance")
+
+    with pytest.raises(ValueError):
+        asyncio.run(breaker.call(business_error))
+    assert breaker.state == "closed"
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=100)
+    for value in range(1, 101):
+        tracker.record(value / 100)
+
+    assert tracker.percentile(50) == pytest.approx(0.51)
+    assert tracker.percentile(99) == pytest.approx(1.0)
+
+
+def test_hedged_call_returns_faster_second_request():
+    delays = [0.5, 0.01]
+    started = []
+
+    async def request():
+        delay = delays[len(started)]
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert asyncio.run(hedged_call(request, hedge_after=0.05)) == 0.01
+    assert len(started) == 2
+
+
+def test_hedged_call_without_delay_is_single_request():
+    calls = []
+
+    async def request():
+        calls.append(1)
+        return "ok"
+
+    assert asyncio.run(hedged_call(request, hedge_after=None)) == "ok"
+    assert len(calls) == 1
@@ -0,0 +1,124 @@
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from api.db.database import get_db
+from api.utils.transaction_id import parse_transaction_id
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.services import hedera
+
+client = TestClient(app)
+TRACE_BATCH_ENDPOINT = "/api/v1/trace/batch"
+
+SETTLED = "0.0.1001-1700000000-000000001"
+CACHED = "0.0.1002-1700000000-000000002"
+UNKNOWN = "0.0.1003-1700000000-000000003"
+
+
+def _verification(mirror_id: str) -> dict:
+    return {
+        "valid": True,
+        "amount": 5.0,
+        "from_account": "0.0.1001",
+        "to_account": "0.0.2002",
+        "timestamp": "1700000001.000000000",
+        "transaction_id": mirror_id
+    }
+
+
+@pytest.fixture
+def trace_backend():
+    """Stub session, Redis cache and mirror node behind the batch trace route."""
+    state = {"session_open": False, "cache": {}, "mirror_lookups": []}
+    donation = Donation(
+        id=uuid.uuid4(),
+        donor_id=uuid.uuid4(),
+        project_id=uuid.uuid4(),
+        status=DonationStatus.completed
+    )
+    state["donation"] = donation
+
+    def override_get_db():
+        state["session_open"] = True
+        try:
+            yield object()
+        finally:
+            state["session_open"] = False
+
+    def find_donations(db, transaction_ids):
+        assert state["session_open"], "donations looked up after the session was closed"
+        return {parsed: donation for parsed in transaction_ids if parsed.mirror_id == SETTLED}
+
+    async def get_many_json(keys):
+        return [state["cache"].get(key) for key in keys]
+
+    async def lookup(mirror_id, max_retries=3):
+        state["mirror_lookups"].append(mirror_id)
+        if mirror_id == UNKNOWN:
+            return hedera._unverified_result(mirror_id, "Transaction not found")
+        return _verification(mirror_id)
+
+    app.dependency_overrides[get_db] = override_get_db
+    with patch("api.v1.services.donation.find_donations_by_transaction_ids", side_effect=find_donations), \
+            patch.object(hedera.redis_client, "get_many_json", side_effect=get_many_json), \
+            patch.object(hedera, "_lookup_mirror_transaction", side_effect=lookup):
+        yield state
+    app.dependency_overrides = {}
+
+
+def _post(transaction_ids):
+    response = client.post(TRACE_BATCH_ENDPOINT, json={"transaction_ids": transaction_ids})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return response.text
+
+
+def test_results_are_newline_delimited_json(trace_backend):
+    body = _post([SETTLED, "0.0.1001@1700000000.000000001", "not-a-transaction"])
+
+    assert body.endswith("\n")
+    lines = body.split("\n")[:-1]
+    results = [json.loads(line) for line in lines]
+    # two spellings of the same transaction are traced once
+    assert len(results) == 2
+    invalid, settled = results
+    assert invalid["transaction_id"] == "not-a-transaction"
+    assert invalid["valid"] is False
+    assert settled["transaction_id"] == SETTLED
+    assert settled["valid"] is True
+    assert settled["donation_id"] == str(trace_backend["donation"].id)
+    assert settled["status"] == "completed"
+
+
+def test_cached_verifications_skip_the_mirror_node(trace_backend):
+    trace_backend["cache"][hedera._verification_cache_key(CACHED)] = _verification(CACHED)
+
+    results = [json.loads(line) for line in _post([CACHED, SETTLED]).splitlines()]
+
+    assert [result["transaction_id"] for result in results] == [CACHED, SETTLED]
+    assert results[0]["valid"] is True
+    assert "donation_id" not in results[0]
+    assert trace_backend["mirror_lookups"] == [SETTLED]
+
+
+def test_unknown_transactions_are_reported_invalid(trace_backend):
+    results = [json.loads(line) for line in _post([UNKNOWN]).splitlines()]
+
+    assert results == [{
+        "transaction_id": parse_transaction_id(UNKNOWN).mirror_id,
+        "valid": False,
+        "amount": 0,
+        "from_account": None,
+        "to_account": None,
+        "timestamp": None
+    }]
+
+
+def test_empty_batch_is_rejected(trace_backend):
+    response = client.post(TRACE_BATCH_ENDPOINT, json={"transaction_ids": []})
+
+    assert response.status_code == 400
@@ -0,0 +1,32 @@
+import pytest
+
+from api.utils.transaction_id import parse_transaction_id
+
+
+@pytest.mark.parametrize("value", [
+    "0.0.1234@1700000000.5",
+    "0.0.1234@1700000000.000000005",
+    "0.0.1234-1700000000-000000005",
+    "0.0.1234-1700000000.5",
+    " 0.0.1234-1700000000-5 ",
+])
+def test_accepted_formats_parse_to_same_parts(value):
+    parsed = parse_transaction_id(value)
+
+    assert parsed.payer_account == "0.0.1234"
+    assert parsed.valid_start_seconds == 1700000000
+    assert parsed.valid_start_nanos == 5
+
+
+def test_mirror_and_sdk_formats():
+    parsed = parse_transaction_id("0.0.98@1700000000.123456789")
+
+    assert parsed.mirror_id == "0.0.98-1700000000-123456789"
+    assert parsed.sdk_id == "0.0.98@1700000000.123456789"
+    assert parse_transaction_id(parsed.mirror_id) == parsed
+
+
+@pytest.mark.parametrize("value", ["", "abc", "0.0.1234", "0.0.1234@1700000000", "0.0.1234@1700000000.1234567890"])
+def test_invalid_transaction_ids_raise(value):
+    with pytest.raises(ValueError):
+        parse_transaction_id(value)